@@ -1,8 +1,165 @@
 # Importing required packages
-from flask import Flask, request
+import os
+from datetime import datetime
+from flask import Flask, request, jsonify
 
+from housing.constant import *
+from housing.util import read_yaml_file
+from housing.entity.housing_predictor import HousingPredictor, ModelNotPublishedError
+from housing.entity.micro_batcher import MicroBatcher, get_feature_rows
+from housing.entity.prediction_cache import PredictionCache
+from housing.logger import APP_LOG_DIR
+from housing.logger.log_reader import LogReader, get_log_files
+from housing.entity.experiment_store import ExperimentStore
+
+# Read configuration
+config_info = read_yaml_file(CONFIG_FILE_PATH)
+model_pusher_info = config_info[MODEL_PUSHER_CONFIG_KEY]
+prediction_info = config_info.get(PREDICTION_CONFIG_KEY) or {}
+
+# Read dataset schema, prediction requests are validated against it
+data_validation_info = config_info[DATA_VALIDATION_CONFIG_KEY]
+dataset_schema = read_yaml_file(os.path.join(
+    ROOT_DIR,
+    data_validation_info[DATA_VALIDATION_SCHEMA_DIR_KEY],
+    data_validation_info[DATA_VALIDATION_SCHEMA_FILE_NAME_KEY]
+))
+
+# Define experiment store file of training pipeline runs
+EXPERIMENT_FILE_PATH = os.path.join(
+    ROOT_DIR,
+    config_info[TRAINING_PIPELINE_CONFIG_KEY][TRAINING_PIPELINE_NAME_KEY],
+    config_info[TRAINING_PIPELINE_CONFIG_KEY][TRAINING_PIPELINE_ARTIFACT_DIR_KEY],
+    EXPERIMENT_DIR_NAME,
+    EXPERIMENT_FILE_NAME
+)
+
+# Open experiment store once, requests only read from it
+experiment_store = ExperimentStore(
+    db_file_path=EXPERIMENT_FILE_PATH,
+    legacy_csv_file_path=os.path.join(os.path.dirname(EXPERIMENT_FILE_PATH), EXPERIMENT_LEGACY_FILE_NAME)
+)
+
+# Define directory of published models
+MODEL_DIR = os.path.join(ROOT_DIR, model_pusher_info[MODEL_PUSHER_MODEL_EXPORT_DIR_KEY])
+
+# Create predictor serving latest published model version
+housing_predictor = HousingPredictor(
+    model_dir=MODEL_DIR,
+    reload_interval=model_pusher_info.get(MODEL_PUSHER_MODEL_RELOAD_INTERVAL_KEY, 5)
+)
+
+# Load model at import, preloading servers (gunicorn --preload) load it once in master
+housing_predictor.preload()
+
+# Create prediction cache, disabled when cache size is not set
+prediction_cache = None
+if prediction_info.get(PREDICTION_CACHE_MAX_SIZE_KEY):
+    prediction_cache = PredictionCache(
+        max_size=prediction_info[PREDICTION_CACHE_MAX_SIZE_KEY],
+        ttl_seconds=prediction_info.get(PREDICTION_CACHE_TTL_SECONDS_KEY, 300),
+        float_decimals=prediction_info.get(PREDICTION_CACHE_FLOAT_DECIMALS_KEY)
+    )
+
+# Create micro batcher merging concurrent prediction requests
+micro_batcher = MicroBatcher(
+    housing_predictor=housing_predictor,
+    columns=dataset_schema[NUMERICAL_COLUMN_KEY] + dataset_schema[CATEGORICAL_COLUMN_KEY],
+    max_batch_size=prediction_info.get(PREDICTION_MAX_BATCH_SIZE_KEY, 256),
+    max_batch_wait_ms=prediction_info.get(PREDICTION_MAX_BATCH_WAIT_MS_KEY, 5),
+    prediction_cache=prediction_cache
+)
 
 # Create flask application
 app = Flask(__name__)
 
 
+@app.route('/model', methods=['GET'])
+def model_status():
+    status = housing_predictor.get_status()
+    if prediction_cache is not None:
+        status["prediction_cache"] = prediction_cache.get_stats()
+    return jsonify(status)
+
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    """
+    Predict median house value of one feature record, a list of records
+    or {"instances": [records]}
+    """
+    try:
+        rows = get_feature_rows(request.get_json(force=True), dataset_schema)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # No model to serve until model pusher publishes first version
+    if housing_predictor.get_model_version() is None:
+        return jsonify({"error": "no model has been published yet, run training pipeline first"}), 503
+    try:
+        model_version, predictions = micro_batcher.predict(rows)
+    except ModelNotPublishedError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({MODEL_VERSION_KEY: model_version, "predictions": predictions.tolist()})
+
+
+@app.route('/logs', methods=['GET'])
+def logs():
+    """
+    Records of a log file (newest by default): last "tail" records, page
+    "offset"/"limit" or records at or above "level" between "start_time"
+    and "end_time" (ISO format)
+    """
+    log_files = get_log_files(APP_LOG_DIR)
+    file_name = request.args.get("file")
+    if file_name is not None:
+        log_files = [log_file for log_file in log_files if os.path.basename(log_file) == file_name]
+    if len(log_files) == 0:
+        return jsonify({"error": "log file not found"}), 404
+
+    log_reader = LogReader(log_files[0])
+    try:
+        offset = request.args.get("offset", 0, type=int)
+        limit = request.args.get("limit", 100, type=int)
+        start_time, end_time = request.args.get("start_time"), request.args.get("end_time")
+        if "tail" in request.args:
+            records = log_reader.tail(request.args.get("tail", 100, type=int))
+        elif "level" in request.args or start_time or end_time:
+            records = log_reader.search(
+                level=request.args.get("level"),
+                start_time=datetime.fromisoformat(start_time) if start_time else None,
+                end_time=datetime.fromisoformat(end_time) if end_time else None,
+                offset=offset,
+                limit=limit
+            )
+        else:
+            records = log_reader.get_page(offset=offset, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "file": os.path.basename(log_files[0]),
+        "log_files": [os.path.basename(log_file) for log_file in get_log_files(APP_LOG_DIR)],
+        "record_count": len(log_reader.entries),
+        "records": records
+    })
+
+
+@app.route('/experiments', methods=['GET'])
+def experiments():
+    """
+    Page "offset"/"limit" of training pipeline runs, latest first,
+    optionally only accepted (accepted=true) or rejected (accepted=false) runs
+    """
+    accepted = request.args.get("accepted")
+    is_model_accepted = None if accepted is None else accepted.lower() in ("1", "true", "yes")
+    return jsonify({
+        "experiment_count": experiment_store.get_experiment_count(is_model_accepted=is_model_accepted),
+        "experiments": experiment_store.get_experiments(
+            offset=request.args.get("offset", 0, type=int),
+            limit=request.args.get("limit", 50, type=int),
+            is_model_accepted=is_model_accepted
+        )
+    })
+
+
+if __name__ == "__main__":
+    app.run(threaded=True)
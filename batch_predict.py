@@ -0,0 +1,46 @@
+# Importing required packages
+import os
+import argparse
+from housing.logger import logging
+from housing.configuration import Configuration
+from housing.component.batch_prediction import BatchPrediction
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Score a csv, ndjson or parquet file with the published model")
+    parser.add_argument("input_file_path", help="file to score (.csv, .ndjson/.jsonl/.json, .parquet)")
+    parser.add_argument("output_file_path", help="scored file, format taken from its extension")
+    parser.add_argument("--model-file-path", help="model to score with, current published version by default")
+    parser.add_argument("--chunk-size", type=int, help="rows read and predicted at a time")
+    parser.add_argument("--max-workers", type=int, help="worker processes, number of cores by default")
+    args = parser.parse_args()
+
+    try:
+        # Get configuration file path
+        config_path = os.path.join("config", "config.yaml")
+        batch_prediction_config = Configuration(config_file_path=config_path).get_batch_prediction_configuration()
+
+        # Override configuration with command line arguments
+        overrides = {
+            "model_file_path": args.model_file_path,
+            "chunk_size": args.chunk_size,
+            "max_workers": args.max_workers
+        }
+        batch_prediction_config = batch_prediction_config._replace(
+            **{name: value for name, value in overrides.items() if value is not None}
+        )
+
+        batch_prediction = BatchPrediction(batch_prediction_config=batch_prediction_config)
+        batch_prediction_artifact = batch_prediction.initiate_batch_prediction(
+            input_file_path=args.input_file_path,
+            output_file_path=args.output_file_path
+        )
+        print(f"scored {batch_prediction_artifact.row_count} rows into [{batch_prediction_artifact.output_file_path}]")
+    except Exception as e:
+        logging.error(f"{e}")
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
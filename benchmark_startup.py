@@ -0,0 +1,122 @@
+# Importing required packages
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+import urllib.request
+
+from housing.constant import *
+from housing.util import read_yaml_file
+
+# Directory of app.py and gunicorn.conf.py
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_sample_record() -> dict:
+    """
+    Feature record valid against dataset schema, used as prediction request
+    """
+    config_info = read_yaml_file(CONFIG_FILE_PATH)
+    data_validation_info = config_info[DATA_VALIDATION_CONFIG_KEY]
+    dataset_schema = read_yaml_file(os.path.join(
+        ROOT_DIR,
+        data_validation_info[DATA_VALIDATION_SCHEMA_DIR_KEY],
+        data_validation_info[DATA_VALIDATION_SCHEMA_FILE_NAME_KEY]
+    ))
+    domain_value = dataset_schema.get(DATASET_SCHEMA_DOMAIN_VALUE_KEY) or {}
+    record = {column: 1.0 for column in dataset_schema[NUMERICAL_COLUMN_KEY]}
+    for column in dataset_schema[CATEGORICAL_COLUMN_KEY]:
+        record[column] = domain_value[column][0] if column in domain_value else ""
+    return record
+
+
+def post_prediction(url: str, record: dict) -> bool:
+    request = urllib.request.Request(url, data=json.dumps(record).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def get_memory_usage(pid: int) -> dict:
+    """
+    Resident memory of a process in MiB; "pss" charges shared pages
+    proportionally, so it shows what copy-on-write sharing saves
+    """
+    memory_usage = {}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps_file:
+        for line in smaps_file:
+            fields = line.split()
+            if fields[0] in ("Rss:", "Pss:", "Shared_Clean:", "Shared_Dirty:"):
+                memory_usage[fields[0][:-1].lower()] = int(fields[1]) / 1024
+    return memory_usage
+
+
+def get_child_pids(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as children_file:
+        return [int(child_pid) for child_pid in children_file.read().split()]
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Measure gunicorn time to first prediction and worker memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--requests", type=int, default=200, help="requests sent before measuring memory")
+    parser.add_argument("--no-preload", action="store_true", help="let every worker import app and load model")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}/predict"
+    record = get_sample_record()
+    environment = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_BIND=f"127.0.0.1:{args.port}",
+        GUNICORN_PRELOAD="0" if args.no_preload else "1"
+    )
+
+    # Start server and wait for its first successful prediction
+    start_time = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(APP_DIR, "gunicorn.conf.py"),
+         "--chdir", ROOT_DIR, "--pythonpath", APP_DIR, "app:app"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while not post_prediction(url, record):
+            if server.poll() is not None or time.perf_counter() - start_time > args.timeout:
+                raise Exception("server did not answer a prediction request")
+            time.sleep(0.05)
+        time_to_first_prediction = time.perf_counter() - start_time
+
+        # Wait for all workers, then let requests spread over them
+        while len(get_child_pids(server.pid)) < args.workers:
+            time.sleep(0.05)
+        for _ in range(args.requests):
+            post_prediction(url, record)
+
+        print(f"preload: {not args.no_preload}, workers: {args.workers}")
+        print(f"time to first prediction: {time_to_first_prediction:.2f}s")
+        print(f"{'process':>16} {'rss MiB':>10} {'pss MiB':>10} {'shared MiB':>12}")
+        total_pss = 0.0
+        for name, pid in [("master", server.pid)] + [(f"worker {pid}", pid) for pid in get_child_pids(server.pid)]:
+            memory_usage = get_memory_usage(pid)
+            total_pss += memory_usage["pss"]
+            shared = memory_usage["shared_clean"] + memory_usage["shared_dirty"]
+            print(f"{name:>16} {memory_usage['rss']:>10.1f} {memory_usage['pss']:>10.1f} {shared:>12.1f}")
+        print(f"{'total pss':>16} {'':>10} {total_pss:>10.1f}")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
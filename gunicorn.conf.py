@@ -0,0 +1,18 @@
+# Importing required packages
+import gc
+import os
+
+# Serve flask application "app:app", e.g. gunicorn -c gunicorn.conf.py app:app
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import application and load model once in master, workers are forked from it
+# and share model, preprocessor and schema pages copy-on-write
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+
+def when_ready(server):
+    # Move objects loaded so far out of garbage collector generations, so that
+    # collections in workers do not write to (and copy) shared pages
+    gc.freeze()
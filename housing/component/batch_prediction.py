@@ -0,0 +1,209 @@
+# Importing required packages
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, compile_schema, load_model_object, DataFrameWriter
+from housing.entity.config_entity import BatchPredictionConfig
+from housing.entity.artifact_entity import BatchPredictionArtifact
+
+# Model of batch prediction worker process, loaded once by worker initializer
+BATCH_MODEL = None
+
+
+def init_batch_worker(model_file_path: str, limit_threads: bool = True) -> None:
+    """
+    Load model once per worker process; workers already use every core
+    between them, so native thread pools are capped to one thread each
+    """
+    global BATCH_MODEL
+    if limit_threads:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=1)
+    BATCH_MODEL = load_model_object(model_file_path)
+
+
+def predict_chunk(dataframe: pd.DataFrame):
+    return BATCH_MODEL.predict(dataframe)
+
+
+def get_batch_file_format(file_path: str) -> str:
+    """
+    Detect batch file format from file extension
+    file_path: str
+    return: str one of csv, ndjson, parquet
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in BATCH_FILE_FORMAT_EXTENSIONS:
+        raise Exception(f"file: [{file_path}] extension is not one of {list(BATCH_FILE_FORMAT_EXTENSIONS)}")
+    return BATCH_FILE_FORMAT_EXTENSIONS[extension]
+
+
+def read_data_frame_chunks(file_path: str, chunk_size: int, dtype: dict = None):
+    """
+    Stream csv, ndjson or parquet file as dataframes of at most chunk_size rows,
+    only one chunk is read into memory at a time
+    file_path: str
+    chunk_size: int
+    dtype: dict column dtypes, columns missing from file are ignored
+    """
+    file_format = get_batch_file_format(file_path)
+    if file_format == BATCH_FILE_FORMAT_CSV:
+        chunks = pd.read_csv(file_path, chunksize=chunk_size, dtype=dtype)
+    elif file_format == BATCH_FILE_FORMAT_NDJSON:
+        chunks = pd.read_json(file_path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        import pyarrow.parquet as pq
+        chunks = (record_batch.to_pandas()
+                  for record_batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size))
+    for chunk in chunks:
+        for column in chunk.columns:
+            if dtype is not None and column in dtype and chunk[column].dtype != dtype[column]:
+                chunk[column] = chunk[column].astype(dtype[column])
+        yield chunk
+
+
+class BatchPredictionWriter:
+    """
+    Write scored chunks one after another into a single csv, ndjson or parquet file.
+    Output is written to a temporary file and renamed into place on close, readers
+    never see a partially scored file
+    """
+
+    def __init__(self, file_path: str) -> None:
+        try:
+            self.file_path = file_path
+            self.file_format = get_batch_file_format(file_path)
+            self.temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            if self.file_format == BATCH_FILE_FORMAT_NDJSON:
+                self.writer = open(self.temp_file_path, "w")
+            else:
+                self.writer = DataFrameWriter(file_path=self.temp_file_path, artifact_format=self.file_format)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        if self.file_format == BATCH_FILE_FORMAT_NDJSON:
+            dataframe.to_json(self.writer, orient="records", lines=True)
+        else:
+            self.writer.write(dataframe)
+
+    def close(self, is_completed: bool = True) -> None:
+        try:
+            self.writer.close()
+            if is_completed:
+                os.replace(self.temp_file_path, self.file_path)
+            elif os.path.exists(self.temp_file_path):
+                os.remove(self.temp_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+
+class BatchPrediction:
+
+    def __init__(self, batch_prediction_config: BatchPredictionConfig):
+        try:
+            # Logging information to log file
+            logging.info("%s batch prediction process started %s", '>>' * 20, '<<' * 20)
+            self.batch_prediction_config = batch_prediction_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_max_workers(self) -> int:
+        max_workers = self.batch_prediction_config.max_workers
+        if max_workers is None or max_workers <= 0:
+            max_workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+        return max(1, max_workers or 1)
+
+    def initiate_batch_prediction(self, input_file_path: str, output_file_path: str) -> BatchPredictionArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will stream input file chunk by chunk, typed according to schema
+        - then we will fan chunks out to worker processes that loaded model once,
+          keeping at most two chunks per worker in flight so memory stays bounded
+        - and finally we will write scored chunks in input order as their predictions
+          complete, input columns followed by prediction column
+        :return:
+        """
+        try:
+            model_file_path = self.batch_prediction_config.model_file_path
+            if model_file_path is None or not os.path.exists(model_file_path):
+                raise Exception(f"model file: [{model_file_path}] does not exist")
+
+            dataset_schema = read_yaml_file(self.batch_prediction_config.schema_file_path)
+            feature_columns = dataset_schema[NUMERICAL_COLUMN_KEY] + dataset_schema[CATEGORICAL_COLUMN_KEY]
+            dtype = compile_schema(self.batch_prediction_config.schema_file_path)
+            prediction_column = self.batch_prediction_config.prediction_column
+            max_workers = self.get_max_workers()
+
+            # Logging information to log file
+            logging.info("scoring [%s] into [%s] with model [%s] using %s worker(s)", input_file_path, output_file_path,
+                         model_file_path, max_workers)
+
+            executor = None
+            if max_workers > 1:
+                executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_batch_worker,
+                                               initargs=(model_file_path,))
+            else:
+                init_batch_worker(model_file_path, limit_threads=False)
+
+            writer = BatchPredictionWriter(output_file_path)
+            row_count, chunk_count = 0, 0
+            is_completed = False
+            try:
+                # Chunks waiting for predictions, written strictly in input order
+                pending_chunks = deque()
+
+                def write_next_chunk():
+                    chunk, prediction = pending_chunks.popleft()
+                    chunk[prediction_column] = prediction.result() if executor is not None else prediction
+                    writer.write(chunk)
+
+                for chunk in read_data_frame_chunks(input_file_path, self.batch_prediction_config.chunk_size,
+                                                    dtype=dtype):
+                    missing_columns = [column for column in feature_columns if column not in chunk.columns]
+                    if len(missing_columns) > 0:
+                        raise Exception(f"input file: [{input_file_path}] is missing columns: {missing_columns}")
+                    if executor is not None:
+                        pending_chunks.append((chunk, executor.submit(predict_chunk, chunk[feature_columns])))
+                    else:
+                        pending_chunks.append((chunk, predict_chunk(chunk[feature_columns])))
+                    row_count += len(chunk)
+                    chunk_count += 1
+                    while len(pending_chunks) >= 2 * max_workers:
+                        write_next_chunk()
+                while len(pending_chunks) > 0:
+                    write_next_chunk()
+                is_completed = True
+            finally:
+                writer.close(is_completed=is_completed)
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+
+            # Update batch prediction artifact
+            batch_prediction_artifact = BatchPredictionArtifact(
+                input_file_path=input_file_path,
+                output_file_path=output_file_path,
+                model_file_path=model_file_path,
+                row_count=row_count,
+                chunk_count=chunk_count,
+                message="Batch prediction completed successfully"
+            )
+
+            # Logging information to log file
+            logging.info("batch prediction artifact: [%s]", batch_prediction_artifact)
+
+            # Returning updated batch prediction artifact
+            return batch_prediction_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __del__(self):
+        # Logging
+        logging.info("%s batch prediction process completed %s", '>>' * 20, '<<' * 20)
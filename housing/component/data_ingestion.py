@@ -1,45 +1,271 @@
 # Importing required packages
 import os
 import sys
+import shutil
 import tarfile
+import tempfile
 import numpy as np
 import pandas as pd
 from six.moves import urllib
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.model_selection import StratifiedShuffleSplit
 
+from housing.constant import *
 from housing.logger import logging
 from housing.exception import HousingException
+from housing.util import DataFrameWriter, save_data_frame, get_artifact_file_name, read_yaml_file, write_yaml_file, \
+    save_numpy_array_data, get_csv_parts_file_path, read_csv_parts, write_csv_parts
+from housing.util.download_cache import DownloadCache, get_local_source_path, link_file
 from housing.entity.config_entity import DataIngestionConfig
 from housing.entity.artifact_entity import DataIngestionArtifact
 
 
+def get_income_category(median_income: pd.Series) -> pd.Series:
+    """
+    Bucket "median_income" into the "income_cat" strata used for splitting
+    median_income: pd.Series
+    """
+    return pd.cut(
+        median_income,
+        bins=[0.0, 1.5, 3.0, 4.5, 6.0, np.inf],
+        labels=[1, 2, 3, 4, 5]
+    )
+
+
+def get_income_strata(median_income: pd.Series) -> np.ndarray:
+    """
+    Return "income_cat" stratum code of every row, -1 for missing income
+    median_income: pd.Series
+    """
+    return get_income_category(median_income).cat.codes.to_numpy(dtype=np.int8)
+
+
+def get_stratified_test_mask(strata: np.ndarray, test_size: float, random_state: int) -> np.ndarray:
+    """
+    Return a boolean mask selecting test rows so that every stratum keeps
+    its share of the data, the way StratifiedShuffleSplit allocates them.
+    Streamed and sharded splits draw their test rows with this function, so
+    they only depend on the rows and random_state, not on chunk size or shards
+    (in-memory split keeps StratifiedShuffleSplit, so default runs reproduce
+    earlier experiments)
+    strata: np.ndarray stratum code of every row
+    test_size: float fraction of rows to put in the test set
+    random_state: int seed for reproducible selection
+    """
+    random_state = np.random.RandomState(random_state)
+    classes, class_counts = np.unique(strata, return_counts=True)
+
+    # Allocate test rows to each stratum proportionally, handing the
+    # rounding remainder to the strata with the largest fractional part
+    n_test = int(np.ceil(test_size * len(strata)))
+    expected_counts = class_counts * n_test / len(strata)
+    test_counts = np.floor(expected_counts).astype(int)
+    remainder = n_test - test_counts.sum()
+    tie_breaker = random_state.permutation(len(classes))
+    order = np.lexsort((tie_breaker, test_counts - expected_counts))
+    test_counts[order[:remainder]] += 1
+
+    # Randomly pick test rows inside every stratum
+    test_mask = np.zeros(len(strata), dtype=bool)
+    for class_code, test_count in zip(classes, test_counts):
+        class_index = np.flatnonzero(strata == class_code)
+        test_mask[random_state.choice(class_index, size=test_count, replace=False)] = True
+    return test_mask
+
+
+def iter_archive_member_names(tgz_file_path: str):
+    """
+    Yield names of regular file members of archive in archive order,
+    reading the archive only as far as the caller consumes
+    tgz_file_path: str
+    """
+    with tarfile.open(tgz_file_path) as housing_tgz_file_obj:
+        for member in housing_tgz_file_obj:
+            if member.isfile():
+                yield member.name
+
+
+def extract_archive_members(tgz_file_path: str, member_names: list, extract_dir: str) -> list:
+    """
+    Write given members of archive into extract_dir in one sequential pass over
+    the archive, so that several readers do not each decompress the archive up
+    to their member
+    tgz_file_path: str
+    member_names: list
+    extract_dir: str
+    return: list file paths of members in order of member_names
+    """
+    file_paths = {member_name: os.path.join(extract_dir, f"{member_number}.csv")
+                  for member_number, member_name in enumerate(member_names)}
+    with tarfile.open(tgz_file_path, "r|*") as housing_tgz_file_obj:
+        for member in housing_tgz_file_obj:
+            if member.isfile() and member.name in file_paths:
+                with housing_tgz_file_obj.extractfile(member) as member_file_obj, \
+                        open(file_paths[member.name], "wb") as file_obj:
+                    shutil.copyfileobj(member_file_obj, file_obj)
+    missing_member_names = [member_name for member_name, file_path in file_paths.items()
+                            if not os.path.exists(file_path)]
+    if missing_member_names:
+        raise Exception(f"members: {missing_member_names} not found in archive: [{tgz_file_path}]")
+    return [file_paths[member_name] for member_name in member_names]
+
+
+@contextmanager
+def open_housing_file(housing_file_path: str, tgz_file_path: str = None):
+    """
+    Open housing csv file as binary stream, either from disk or, when
+    archive path is given, straight out of the archive member without
+    writing it to disk
+    housing_file_path: str file path, or member name when reading from archive
+    tgz_file_path: str
+    """
+    if tgz_file_path is None:
+        with open(housing_file_path, "rb") as housing_file_obj:
+            yield housing_file_obj
+    else:
+        with tarfile.open(tgz_file_path) as housing_tgz_file_obj:
+            with housing_tgz_file_obj.extractfile(housing_file_path) as housing_file_obj:
+                yield housing_file_obj
+
+
+def iter_csv_chunks(housing_file_obj, chunk_size: int = None, **kwargs):
+    """
+    Yield csv file in chunks of chunk_size rows, or as a single frame when chunk size is not set
+    """
+    if chunk_size:
+        yield from pd.read_csv(housing_file_obj, chunksize=chunk_size, **kwargs)
+    else:
+        yield pd.read_csv(housing_file_obj, **kwargs)
+
+
+def read_income_strata(housing_file_path: str, tgz_file_path: str = None, chunk_size: int = None) -> np.ndarray:
+    """
+    Read only "median_income" and return "income_cat" stratum code of every row, -1 for missing income
+    housing_file_path: str file path, or member name when reading from archive
+    tgz_file_path: str
+    chunk_size: int
+    """
+    with open_housing_file(housing_file_path, tgz_file_path) as housing_file_obj:
+        return np.concatenate([
+            get_income_strata(chunk["median_income"])
+            for chunk in iter_csv_chunks(housing_file_obj, chunk_size, usecols=["median_income"])
+        ])
+
+
+def write_split_data(housing_file_path: str, test_mask: np.ndarray, train_file_path: str, test_file_path: str,
+                     tgz_file_path: str = None, chunk_size: int = None,
+                     artifact_format: str = ARTIFACT_FORMAT_CSV) -> int:
+    """
+    Route rows of csv file to train and test files according to test mask
+    return: int number of rows read
+    """
+    row_offset = 0
+    with open_housing_file(housing_file_path, tgz_file_path) as housing_file_obj, \
+            DataFrameWriter(train_file_path, artifact_format) as train_writer, \
+            DataFrameWriter(test_file_path, artifact_format) as test_writer:
+        for chunk in iter_csv_chunks(housing_file_obj, chunk_size):
+            chunk_test_mask = test_mask[row_offset:row_offset + len(chunk)]
+            row_offset += len(chunk)
+
+            train_writer.write(chunk[~chunk_test_mask])
+            test_writer.write(chunk[chunk_test_mask])
+    return row_offset
+
+
+def concat_csv_parts(part_file_paths: list, file_path: str, chunk_size: int = None,
+                     artifact_format: str = ARTIFACT_FORMAT_CSV) -> None:
+    """
+    Join csv part files in given order into a single artifact
+    csv parts are joined byte for byte, other formats are rewritten chunk by chunk
+    """
+    part_file_paths = [part_file_path for part_file_path in part_file_paths if os.path.exists(part_file_path)]
+    if artifact_format == ARTIFACT_FORMAT_CSV:
+        with open(file_path, "wb") as file_obj:
+            for part_number, part_file_path in enumerate(part_file_paths):
+                with open(part_file_path, "rb") as part_file_obj:
+                    # Keep header line of first part only
+                    if part_number > 0:
+                        part_file_obj.readline()
+                    shutil.copyfileobj(part_file_obj, file_obj)
+    else:
+        with DataFrameWriter(file_path, artifact_format) as data_frame_writer:
+            for part_file_path in part_file_paths:
+                with open(part_file_path, "rb") as part_file_obj:
+                    for chunk in iter_csv_chunks(part_file_obj, chunk_size):
+                        data_frame_writer.write(chunk)
+
+
+def get_row_key_hashes(dataframe: pd.DataFrame, row_key_columns: list = None) -> np.ndarray:
+    """
+    Return stable 64 bit hash of row key columns (all columns when not set) for every row
+    dataframe: pd.DataFrame
+    row_key_columns: list
+    """
+    key_frame = dataframe[row_key_columns] if row_key_columns else dataframe
+    return pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+
+
+def get_incremental_test_mask(strata: np.ndarray, row_hashes: np.ndarray, split_state: dict,
+                              test_size: float) -> np.ndarray:
+    """
+    Assign new rows to test so that every stratum keeps test_size share of
+    all rows ingested so far; inside a stratum rows with smallest key hash
+    go to test first, so assignment depends only on the rows, not their order
+    strata: np.ndarray stratum code of every new row
+    row_hashes: np.ndarray key hash of every new row
+    split_state: dict stratum code -> {"rows": int, "test_rows": int}, updated in place
+    test_size: float
+    """
+    test_mask = np.zeros(len(strata), dtype=bool)
+    for class_code in np.unique(strata):
+        class_index = np.flatnonzero(strata == class_code)
+        class_state = split_state.setdefault(int(class_code), {"rows": 0, "test_rows": 0})
+
+        # Top up stratum test rows to its share of all rows seen so far
+        class_rows = class_state["rows"] + len(class_index)
+        test_count = int(np.clip(round(test_size * class_rows) - class_state["test_rows"], 0, len(class_index)))
+        test_index = class_index[np.argsort(row_hashes[class_index], kind="stable")[:test_count]]
+        test_mask[test_index] = True
+
+        class_state["rows"] = class_rows
+        class_state["test_rows"] += test_count
+    return test_mask
+
+
 class DataIngestion:
 
-    def __int__(self, data_ingestion_config: DataIngestionConfig):
+    def __init__(self, data_ingestion_config: DataIngestionConfig):
         try:
             # Logging information to log file
-            logging.info(f"{'>>' * 20} data ingestion process started {'<<' * 20}")
+            logging.info("%s data ingestion process started %s", '>>' * 20, '<<' * 20)
             self.data_ingestion_config = data_ingestion_config
         except Exception as e:
             raise HousingException(e, sys) from e
 
-    def initiate_data_ingestion(self) -> DataIngestionArtifact:
+    def initiate_data_ingestion(self, tgz_file_path: str = None) -> DataIngestionArtifact:
         """
         We will basically do three tasks as mentioned below,
-        - firstly we will download dataset
-        - then we will extract downloaded dataset
+        - firstly we will download dataset (unless already downloaded to tgz_file_path)
+        - then we will extract downloaded dataset (only if "extract_raw_data" is set,
+          otherwise dataset is read straight out of the archive)
         - and finally we will split dataset as train and test datasets
         :return:
         """
         try:
             # Get downloaded dataset directory path
-            tgz_file_path = self.download_housing_data()
+            if tgz_file_path is None:
+                tgz_file_path = self.download_housing_data()
+
+            if self.data_ingestion_config.extract_raw_data:
+                # Extract downloaded dataset
+                self.extract_tgz_file(tgz_file_path=tgz_file_path)
 
-            # Extract downloaded dataset
-            self.extract_tgz_file(tgz_file_path=tgz_file_path)
+                # Return updated data ingestion artifact
+                return self.split_data_as_train_test()
 
-            # Return updated data ingestion artifact
-            return self.split_data_as_train_test()
+            # Return updated data ingestion artifact, reading dataset from archive
+            return self.split_data_as_train_test(tgz_file_path=tgz_file_path)
         except Exception as e:
             raise HousingException(e, sys) from e
 
@@ -54,8 +280,8 @@ class DataIngestion:
             # Create directory to store downloaded dataset
             os.makedirs(tgz_download_dir, exist_ok=True)
 
-            # Extract file name from download url
-            housing_file_name = os.path.basename(download_url)
+            # Extract file name from download url (or local source path)
+            housing_file_name = os.path.basename(get_local_source_path(download_url) or download_url)
 
             # Define directory path to store downloaded data
             tgz_file_path = os.path.join(
@@ -64,13 +290,18 @@ class DataIngestion:
             )
 
             # Logging information to log file
-            logging.info(f"downloading file from: [{download_url}] into: [{tgz_file_path}]")
+            logging.info("downloading file from: [%s] into: [%s]", download_url, tgz_file_path)
 
-            # Downloading dataset
-            urllib.request.urlretrieve(download_url, tgz_file_path)
+            if self.data_ingestion_config.download_cache_dir:
+                # Downloading dataset through shared cache, reusing unchanged archive
+                download_cache = DownloadCache(cache_dir=self.data_ingestion_config.download_cache_dir)
+                download_cache.fetch(url=download_url, destination_path=tgz_file_path)
+            else:
+                # Downloading dataset
+                urllib.request.urlretrieve(download_url, tgz_file_path)
 
             # Logging information to log file
-            logging.info(f"file: [{tgz_file_path}] has been downloaded successfully")
+            logging.info("file: [%s] has been downloaded successfully", tgz_file_path)
 
             # Returning downloaded data directory path
             return tgz_file_path
@@ -84,49 +315,169 @@ class DataIngestion:
 
             # Check and remove raw data directory path if exists
             if os.path.exists(raw_data_dir):
-                os.remove(raw_data_dir)
+                shutil.rmtree(raw_data_dir)
 
             # Create raw data directory
             os.makedirs(raw_data_dir, exist_ok=True)
 
             # Logging information to log file
-            logging.info(f"extracting tgz file: [{tgz_file_path}] into directory: [{raw_data_dir}]")
+            logging.info("extracting tgz file: [%s] into directory: [%s]", tgz_file_path, raw_data_dir)
 
             # Extracting raw data
             with tarfile.open(tgz_file_path) as housing_tgz_file_obj:
                 housing_tgz_file_obj.extractall(path=raw_data_dir)
 
             # Logging information to log file
-            logging.info(f"downloaded dataset data extraction completed")
+            logging.info("downloaded dataset data extraction completed")
         except Exception as e:
             raise HousingException(e, sys) from e
 
-    def split_data_as_train_test(self) -> DataIngestionArtifact:
+    def split_data_as_train_test(self, tgz_file_path: str = None) -> DataIngestionArtifact:
         try:
-            # Get raw data directory path
-            raw_data_dir = self.data_ingestion_config.raw_data_dir
+            if tgz_file_path is None:
+                # Get raw data directory path
+                raw_data_dir = self.data_ingestion_config.raw_data_dir
+
+                # Get data files present in directory and its subdirectories, sorted by
+                # relative path the same way as archive member names
+                housing_file_paths = [
+                    os.path.join(raw_data_dir, relative_path)
+                    for relative_path in sorted(
+                        os.path.relpath(os.path.join(dir_path, file_name), raw_data_dir)
+                        for dir_path, _, file_names in os.walk(raw_data_dir) for file_name in file_names
+                    )
+                    if relative_path.endswith(DATA_INGESTION_DATA_FILE_EXTENSION)
+                ]
+            else:
+                # Get data file members of archive, sorted by name
+                housing_file_paths = sorted(
+                    member_name for member_name in iter_archive_member_names(tgz_file_path)
+                    if member_name.endswith(DATA_INGESTION_DATA_FILE_EXTENSION)
+                )
+
+            if len(housing_file_paths) == 0:
+                raise Exception(f"no [{DATA_INGESTION_DATA_FILE_EXTENSION}] data file found to ingest")
+
+            # Ingested datasets are named after the first data file
+            housing_file_path = housing_file_paths[0]
+            file_name = os.path.basename(housing_file_path)
+
+            # Get ingested file name according to artifact format
+            artifact_file_name = get_artifact_file_name(file_name, self.data_ingestion_config.artifact_format)
+
+            # Define directory path to store train dataset file
+            train_file_path = os.path.join(
+                self.data_ingestion_config.ingested_train_dir,
+                artifact_file_name
+            )
+
+            # Define directory path to store train dataset file
+            test_file_path = os.path.join(
+                self.data_ingestion_config.ingested_test_dir,
+                artifact_file_name
+            )
 
-            # Get first file name in list of files present in directory
-            file_name = os.listdir(raw_data_dir)[0]
+            # Create directories to store train and test datasets if not exits
+            os.makedirs(self.data_ingestion_config.ingested_train_dir, exist_ok=True)
+            os.makedirs(self.data_ingestion_config.ingested_test_dir, exist_ok=True)
+
+            # With index layout single base table holds train rows followed by test rows,
+            # and train and test sets are row index arrays into it
+            base_file_path = None
+            if self.data_ingestion_config.split_layout == SPLIT_LAYOUT_INDEX:
+                if self.data_ingestion_config.incremental:
+                    raise Exception(f"incremental ingestion does not support [{SPLIT_LAYOUT_INDEX}] split layout")
+                base_file_path = os.path.join(
+                    os.path.dirname(self.data_ingestion_config.ingested_train_dir),
+                    artifact_file_name
+                )
+
+            if self.data_ingestion_config.incremental:
+                # Add only rows not ingested by previous run, ingested datasets are csv part lists
+                train_row_count, test_row_count = self.incremental_split_data(
+                    housing_file_paths=housing_file_paths,
+                    train_file_path=train_file_path,
+                    test_file_path=test_file_path,
+                    tgz_file_path=tgz_file_path
+                )
+                train_file_path = get_csv_parts_file_path(train_file_path)
+                test_file_path = get_csv_parts_file_path(test_file_path)
+            elif len(housing_file_paths) > 1:
+                # Split all data files together, one process per file
+                train_row_count, test_row_count = self.split_shards(
+                    housing_file_paths=housing_file_paths,
+                    train_file_path=train_file_path,
+                    test_file_path=test_file_path,
+                    tgz_file_path=tgz_file_path,
+                    base_file_path=base_file_path
+                )
+            elif self.data_ingestion_config.chunk_size:
+                # Split chunk by chunk so memory is bounded by the chunk size
+                train_row_count, test_row_count = self.stream_split_data(
+                    housing_file_path=housing_file_path,
+                    train_file_path=train_file_path,
+                    test_file_path=test_file_path,
+                    tgz_file_path=tgz_file_path,
+                    base_file_path=base_file_path
+                )
+            else:
+                # Split whole dataset in memory
+                train_row_count, test_row_count = self.split_data(
+                    housing_file_path=housing_file_path,
+                    train_file_path=train_file_path,
+                    test_file_path=test_file_path,
+                    tgz_file_path=tgz_file_path,
+                    base_file_path=base_file_path
+                )
+
+            train_index_file_path = None
+            test_index_file_path = None
+            if base_file_path is not None:
+                # Save train and test row positions in base table
+                train_index_file_path = os.path.join(
+                    self.data_ingestion_config.ingested_train_dir,
+                    DATA_INGESTION_INDEX_FILE_NAME
+                )
+                test_index_file_path = os.path.join(
+                    self.data_ingestion_config.ingested_test_dir,
+                    DATA_INGESTION_INDEX_FILE_NAME
+                )
+                save_numpy_array_data(train_index_file_path, np.arange(train_row_count, dtype=np.int64))
+                save_numpy_array_data(
+                    test_index_file_path,
+                    np.arange(train_row_count, train_row_count + test_row_count, dtype=np.int64)
+                )
+                train_file_path = None
+                test_file_path = None
 
-            # Define housing file path
-            housing_file_path = os.path.join(
-                raw_data_dir,
-                file_name
+            # Update data ingestion artifact
+            data_ingestion_artifact = DataIngestionArtifact(
+                train_file_path=train_file_path,
+                test_file_path=test_file_path,
+                is_ingested=True,
+                message='data ingestion completed successfully',
+                base_file_path=base_file_path,
+                train_index_file_path=train_index_file_path,
+                test_index_file_path=test_index_file_path
             )
 
             # Logging information to log file
-            logging.info(f"reading csv file: [{housing_file_path}]")
+            logging.info("data ingestion artifact: [%s]", data_ingestion_artifact)
 
-            # Reading housing data file into a pandas dataframe
-            housing_data_frame = pd.read_csv(housing_file_path)
+            # Returning updated data ingestion artifact
+            return data_ingestion_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
 
-            # Create new feature "income_cat" from "median_income" feature
-            housing_data_frame["income_cat"] = pd.cut(
-                housing_data_frame["median_income"],
-                bins=[0.0, 1.5, 3.0, 4.5, 6.0, np.inf],
-                labels=[1, 2, 3, 4, 5]
-            )
+    def split_data(self, housing_file_path: str, train_file_path: str, test_file_path: str,
+                   tgz_file_path: str = None, base_file_path: str = None) -> tuple:
+        try:
+            # Logging information to log file
+            logging.info("reading csv file: [%s] (archive: [%s])", housing_file_path, tgz_file_path)
+
+            # Reading housing data file into a pandas dataframe
+            with open_housing_file(housing_file_path, tgz_file_path) as housing_file_obj:
+                housing_data_frame = pd.read_csv(housing_file_obj)
 
             # Logging information to log file
             logging.info("splitting extracted data into train and test sets")
@@ -135,59 +486,377 @@ class DataIngestion:
             stratified_train_set = None
             stratified_test_set = None
 
-            # Instantiate StratifiedShuffleSplit
-            stratified_split = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+            # Instantiate StratifiedShuffleSplit on "income_cat" strata
+            stratified_split = StratifiedShuffleSplit(
+                n_splits=1,
+                test_size=DATA_INGESTION_TEST_SIZE,
+                random_state=DATA_INGESTION_RANDOM_STATE
+            )
 
-            for train_index, test_index in stratified_split.split(housing_data_frame, housing_data_frame["income_cat"]):
-                stratified_train_set = housing_data_frame.loc[train_index].drop(["income_cat"], axis=1)
-                stratified_test_set = housing_data_frame.loc[test_index].drop(["income_cat"], axis=1)
+            strata = get_income_strata(housing_data_frame["median_income"])
+            for train_index, test_index in stratified_split.split(housing_data_frame, strata):
+                stratified_train_set = housing_data_frame.iloc[train_index]
+                stratified_test_set = housing_data_frame.iloc[test_index]
 
-            # Define directory path to store train dataset file
-            train_file_path = os.path.join(
-                self.data_ingestion_config.ingested_train_dir,
-                file_name
-            )
+            if base_file_path is not None:
+                # Logging information to log file
+                logging.info("exporting train and test rows to base table: [%s]", base_file_path)
 
-            # Define directory path to store train dataset file
-            test_file_path = os.path.join(
-                self.data_ingestion_config.ingested_test_dir,
-                file_name
-            )
+                # Save train rows followed by test rows as single base table
+                with DataFrameWriter(base_file_path, self.data_ingestion_config.artifact_format) as base_writer:
+                    base_writer.write(stratified_train_set)
+                    base_writer.write(stratified_test_set)
+                return len(stratified_train_set), len(stratified_test_set)
 
             # Save train dataset
             if stratified_train_set is not None:
-                # Create directory to store train dataset if not exits
-                os.makedirs(self.data_ingestion_config.ingested_train_dir, exist_ok=True)
-
                 # Logging information to log file
-                logging.info(f"exporting training dataset to file: [{train_file_path}]")
-                stratified_train_set.to_csv(train_file_path, index=False)
+                logging.info("exporting training dataset to file: [%s]", train_file_path)
+                save_data_frame(train_file_path, stratified_train_set, self.data_ingestion_config.artifact_format)
 
             # Save test dataset
             if stratified_test_set is not None:
-                # Create directory to store train dataset if not exits
-                os.makedirs(self.data_ingestion_config.ingested_test_dir, exist_ok=True)
-
                 # Logging information to log file
-                logging.info(f"exporting test dataset to file: [{test_file_path}]")
-                stratified_test_set.to_csv(test_file_path, index=False)
+                logging.info("exporting test dataset to file: [%s]", test_file_path)
+                save_data_frame(test_file_path, stratified_test_set, self.data_ingestion_config.artifact_format)
+            return len(stratified_train_set), len(stratified_test_set)
+        except Exception as e:
+            raise HousingException(e, sys) from e
 
-            # Update data ingestion artifact
-            data_ingestion_artifact = DataIngestionArtifact(
-                train_file_path=train_file_path,
-                test_file_path=test_file_path,
-                is_ingested=True,
-                message='data ingestion completed successfully'
+    def stream_split_data(self, housing_file_path: str, train_file_path: str, test_file_path: str,
+                          tgz_file_path: str = None, base_file_path: str = None) -> tuple:
+        """
+        Stratified split in two passes over the csv file,
+        - first pass reads only "median_income" to find the stratum of every row
+        - then a test mask is drawn per stratum (one byte per row)
+        - second pass reads full chunks and appends them to train or test file
+        :return:
+        """
+        try:
+            chunk_size = self.data_ingestion_config.chunk_size
+
+            # Logging information to log file
+            logging.info("reading income strata from csv file: [%s] (archive: [%s]) in chunks of [%s] rows",
+                         housing_file_path, tgz_file_path, chunk_size)
+
+            # First pass: stratum code of every row, -1 for missing income
+            strata = read_income_strata(housing_file_path, tgz_file_path, chunk_size)
+
+            # Draw test rows per stratum
+            test_mask = get_stratified_test_mask(
+                strata=strata,
+                test_size=DATA_INGESTION_TEST_SIZE,
+                random_state=DATA_INGESTION_RANDOM_STATE
             )
+            del strata
 
             # Logging information to log file
-            logging.info(f"data ingestion artifact: [{data_ingestion_artifact}]")
+            logging.info("streaming train and test sets into: [%s] and [%s]", train_file_path, test_file_path)
+
+            if base_file_path is not None:
+                # Second pass: route every chunk to train and test csv parts,
+                # then join them as train rows followed by test rows into base table
+                with tempfile.TemporaryDirectory(dir=os.path.dirname(base_file_path)) as parts_dir:
+                    train_part_file_path = os.path.join(parts_dir, "train.csv")
+                    test_part_file_path = os.path.join(parts_dir, "test.csv")
+                    row_count = write_split_data(
+                        housing_file_path=housing_file_path,
+                        test_mask=test_mask,
+                        train_file_path=train_part_file_path,
+                        test_file_path=test_part_file_path,
+                        tgz_file_path=tgz_file_path,
+                        chunk_size=chunk_size
+                    )
+                    concat_csv_parts([train_part_file_path, test_part_file_path], base_file_path,
+                                     chunk_size, self.data_ingestion_config.artifact_format)
+            else:
+                # Second pass: route every chunk to train and test files
+                row_count = write_split_data(
+                    housing_file_path=housing_file_path,
+                    test_mask=test_mask,
+                    train_file_path=train_file_path,
+                    test_file_path=test_file_path,
+                    tgz_file_path=tgz_file_path,
+                    chunk_size=chunk_size,
+                    artifact_format=self.data_ingestion_config.artifact_format
+                )
 
-            # Returning updated data ingestion artifact
-            return data_ingestion_artifact
+            # Logging information to log file
+            logging.info("streamed [%s] rows, [%s] into test set", row_count, int(test_mask.sum()))
+            return int((~test_mask).sum()), int(test_mask.sum())
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def split_shards(self, housing_file_paths: list, train_file_path: str, test_file_path: str,
+                     tgz_file_path: str = None, base_file_path: str = None) -> tuple:
+        """
+        Globally stratified split of several data files (shards) in a process pool,
+        - shards read from archive are first extracted in one pass over the archive
+        - strata of every shard are read in parallel
+        - one test mask is drawn over all shards taken in sorted order, so the
+          split is the same as streaming split of the concatenated shards
+        - every shard writes its train and test rows into csv part files in parallel
+        - part files are joined in shard order
+        :return:
+        """
+        try:
+            chunk_size = self.data_ingestion_config.chunk_size
+            max_workers = min(self.data_ingestion_config.ingestion_workers or os.cpu_count(), len(housing_file_paths))
+
+            # Logging information to log file
+            logging.info("splitting [%s] data files with [%s] processes", len(housing_file_paths), max_workers)
+
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(train_file_path)) as parts_dir, \
+                    ProcessPoolExecutor(max_workers=max_workers) as executor:
+                if tgz_file_path is not None:
+                    # Logging information to log file
+                    logging.info("extracting [%s] data files of archive: [%s]", len(housing_file_paths), tgz_file_path)
+
+                    # Decompress archive once, shard processes read plain files
+                    housing_file_paths = extract_archive_members(tgz_file_path, housing_file_paths, parts_dir)
+
+                # First pass: stratum codes of every shard
+                shard_strata = list(executor.map(
+                    read_income_strata,
+                    housing_file_paths,
+                    [None] * len(housing_file_paths),
+                    [chunk_size] * len(housing_file_paths)
+                ))
+
+                # Draw test rows per stratum over all shards and cut mask back into shards
+                test_mask = get_stratified_test_mask(
+                    strata=np.concatenate(shard_strata),
+                    test_size=DATA_INGESTION_TEST_SIZE,
+                    random_state=DATA_INGESTION_RANDOM_STATE
+                )
+                shard_test_masks = np.split(test_mask, np.cumsum([len(strata) for strata in shard_strata])[:-1])
+                del shard_strata
+
+                # Logging information to log file
+                logging.info("drawn [%s] test rows out of [%s] rows", int(test_mask.sum()), len(test_mask))
+
+                # Second pass: every shard writes its own part files
+                train_part_file_paths = [os.path.join(parts_dir, f"train_{shard_number}.csv")
+                                         for shard_number in range(len(housing_file_paths))]
+                test_part_file_paths = [os.path.join(parts_dir, f"test_{shard_number}.csv")
+                                        for shard_number in range(len(housing_file_paths))]
+                list(executor.map(
+                    write_split_data,
+                    housing_file_paths,
+                    shard_test_masks,
+                    train_part_file_paths,
+                    test_part_file_paths,
+                    [None] * len(housing_file_paths),
+                    [chunk_size] * len(housing_file_paths)
+                ))
+
+                # Logging information to log file
+                logging.info("joining shard parts into: [%s] and [%s]", train_file_path, test_file_path)
+
+                # Join parts in shard order
+                artifact_format = self.data_ingestion_config.artifact_format
+                if base_file_path is not None:
+                    concat_csv_parts(train_part_file_paths + test_part_file_paths, base_file_path,
+                                     chunk_size, artifact_format)
+                else:
+                    concat_csv_parts(train_part_file_paths, train_file_path, chunk_size, artifact_format)
+                    concat_csv_parts(test_part_file_paths, test_file_path, chunk_size, artifact_format)
+            return int((~test_mask).sum()), int(test_mask.sum())
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_previous_ingested_dir(self, train_file_path: str, test_file_path: str):
+        """
+        Return ingested data directory of latest earlier run that finished an
+        incremental split into files of the same name, None when there is no such run
+        """
+        try:
+            ingested_train_dir = self.data_ingestion_config.ingested_train_dir
+            ingested_test_dir = self.data_ingestion_config.ingested_test_dir
+            ingested_dir = os.path.dirname(ingested_train_dir)
+            run_dir = os.path.dirname(ingested_dir)
+            data_ingestion_dir = os.path.dirname(run_dir)
+            current_timestamp = os.path.basename(run_dir)
+
+            for timestamp in sorted(os.listdir(data_ingestion_dir), reverse=True):
+                if timestamp >= current_timestamp:
+                    continue
+                previous_ingested_dir = os.path.join(data_ingestion_dir, timestamp, os.path.basename(ingested_dir))
+                required_file_paths = [
+                    os.path.join(previous_ingested_dir, DATA_INGESTION_SPLIT_STATE_FILE_NAME),
+                    os.path.join(previous_ingested_dir, DATA_INGESTION_ROW_KEYS_FILE_NAME),
+                    os.path.join(previous_ingested_dir, os.path.basename(ingested_train_dir),
+                                 os.path.basename(train_file_path)),
+                    os.path.join(previous_ingested_dir, os.path.basename(ingested_test_dir),
+                                 os.path.basename(test_file_path))
+                ]
+                if all(os.path.exists(file_path) for file_path in required_file_paths):
+                    return previous_ingested_dir
+            return None
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    @staticmethod
+    def get_previous_part_file_paths(previous_ingested_dir: str, ingested_dir: str, file_path: str) -> list:
+        """
+        Part files of previous run's ingested dataset corresponding to file_path,
+        the dataset file itself when previous run wrote a single file
+        """
+        previous_file_path = os.path.join(previous_ingested_dir, os.path.relpath(file_path, ingested_dir))
+        previous_parts_file_path = get_csv_parts_file_path(previous_file_path)
+        if os.path.exists(previous_parts_file_path):
+            return read_csv_parts(previous_parts_file_path)
+        return [previous_file_path]
+
+    @staticmethod
+    def link_previous_parts(part_file_paths: list, parts_dir: str) -> list:
+        """
+        Hard link part files of earlier runs into parts_dir (copy where linking is not
+        possible), so that pruning an earlier run does not break this run's datasets
+        return: list linked part file paths, in order of part_file_paths
+        """
+        os.makedirs(parts_dir, exist_ok=True)
+        linked_part_file_paths = []
+        for position, part_file_path in enumerate(part_file_paths):
+            linked_part_file_path = os.path.join(parts_dir, f"{position:05d}{os.path.splitext(part_file_path)[1]}")
+            link_file(part_file_path, linked_part_file_path)
+            linked_part_file_paths.append(linked_part_file_path)
+        return linked_part_file_paths
+
+    def incremental_split_data(self, housing_file_paths: list, train_file_path: str, test_file_path: str,
+                               tgz_file_path: str = None) -> tuple:
+        """
+        Incremental split on top of previous run's ingested datasets,
+        - new train and test rows of this run are written as its own csv part files,
+          ingested datasets are part lists of all runs so far; previous parts are hard
+          linked into this run's directory, never copied or rewritten, so a run costs
+          reading the source plus writing the delta and does not depend on earlier runs
+        - rows whose key hash was ingested before are skipped, so old rows never move
+        - new rows go to test per "income_cat" stratum by key hash (see get_incremental_test_mask)
+        - key hashes of new rows and per stratum counts are saved next to ingested data for the next run
+        Rows are passed through as text, so appended rows are byte for byte as in the source.
+        :return:
+        """
+        try:
+            chunk_size = self.data_ingestion_config.chunk_size
+            row_key_columns = self.data_ingestion_config.row_key_columns
+            ingested_dir = os.path.dirname(self.data_ingestion_config.ingested_train_dir)
+            row_keys_file_path = os.path.join(ingested_dir, DATA_INGESTION_ROW_KEYS_FILE_NAME)
+
+            if self.data_ingestion_config.artifact_format != ARTIFACT_FORMAT_CSV:
+                raise Exception(f"incremental ingestion is only supported for [{ARTIFACT_FORMAT_CSV}] artifacts")
+
+            # Continue part lists and keys of previous run's ingested datasets when available
+            previous_ingested_dir = self.get_previous_ingested_dir(train_file_path, test_file_path)
+            if previous_ingested_dir is not None:
+                # Logging information to log file
+                logging.info("continuing ingested data of previous run: [%s]", previous_ingested_dir)
+
+                split_state_info = read_yaml_file(os.path.join(previous_ingested_dir,
+                                                               DATA_INGESTION_SPLIT_STATE_FILE_NAME))
+                split_state = split_state_info["strata"]
+                row_key_file_paths = self.link_previous_parts([
+                    os.path.normpath(os.path.join(previous_ingested_dir, row_key_file_path))
+                    for row_key_file_path in split_state_info.get("row_key_parts", [DATA_INGESTION_ROW_KEYS_FILE_NAME])
+                ], os.path.join(ingested_dir, DATA_INGESTION_LINKED_PARTS_DIR_NAME))
+                known_row_hashes = np.sort(np.concatenate([np.load(row_key_file_path)
+                                                           for row_key_file_path in row_key_file_paths]))
+                train_part_file_paths = self.link_previous_parts(
+                    self.get_previous_part_file_paths(previous_ingested_dir, ingested_dir, train_file_path),
+                    os.path.join(os.path.dirname(train_file_path), DATA_INGESTION_LINKED_PARTS_DIR_NAME)
+                )
+                test_part_file_paths = self.link_previous_parts(
+                    self.get_previous_part_file_paths(previous_ingested_dir, ingested_dir, test_file_path),
+                    os.path.join(os.path.dirname(test_file_path), DATA_INGESTION_LINKED_PARTS_DIR_NAME)
+                )
+            else:
+                # Logging information to log file
+                logging.info("no previous incremental ingestion found, ingesting all rows")
+
+                split_state = {}
+                row_key_file_paths = []
+                known_row_hashes = np.array([], dtype=np.uint64)
+                train_part_file_paths = []
+                test_part_file_paths = []
+
+            with tempfile.TemporaryDirectory(dir=ingested_dir) as extract_dir:
+                if tgz_file_path is not None and len(housing_file_paths) > 1:
+                    # Decompress archive once instead of once per data file and pass
+                    housing_file_paths = extract_archive_members(tgz_file_path, housing_file_paths, extract_dir)
+                    tgz_file_path = None
+
+                # First pass: key hash and stratum of every source row
+                row_hashes, strata = [], []
+                for housing_file_path in housing_file_paths:
+                    with open_housing_file(housing_file_path, tgz_file_path) as housing_file_obj:
+                        for chunk in iter_csv_chunks(housing_file_obj, chunk_size, dtype=str, keep_default_na=False):
+                            row_hashes.append(get_row_key_hashes(chunk, row_key_columns))
+                            strata.append(get_income_strata(pd.to_numeric(chunk["median_income"], errors="coerce")))
+                row_hashes = np.concatenate(row_hashes)
+                strata = np.concatenate(strata)
+
+                # Keep rows not ingested before, first occurrence only for repeated keys
+                known_position = np.minimum(np.searchsorted(known_row_hashes, row_hashes),
+                                            len(known_row_hashes) - 1)
+                is_new = np.ones(len(row_hashes), dtype=bool)
+                if len(known_row_hashes) > 0:
+                    is_new = known_row_hashes[known_position] != row_hashes
+                is_first = np.zeros(len(row_hashes), dtype=bool)
+                is_first[np.unique(row_hashes, return_index=True)[1]] = True
+                new_index = np.flatnonzero(is_new & is_first)
+
+                # Assign new rows: 0 skip, 1 train, 2 test
+                new_test_mask = get_incremental_test_mask(
+                    strata=strata[new_index],
+                    row_hashes=row_hashes[new_index],
+                    split_state=split_state,
+                    test_size=DATA_INGESTION_TEST_SIZE
+                )
+                row_route = np.zeros(len(row_hashes), dtype=np.int8)
+                row_route[new_index] = np.where(new_test_mask, 2, 1)
+                del strata
+
+                # Logging information to log file
+                logging.info("writing [%s] new rows out of [%s] source rows, [%s] into test set", len(new_index),
+                             len(row_hashes), int(new_test_mask.sum()))
+
+                # Second pass: write new rows into this run's train and test part files
+                row_offset = 0
+                with DataFrameWriter(train_file_path, ARTIFACT_FORMAT_CSV) as train_writer, \
+                        DataFrameWriter(test_file_path, ARTIFACT_FORMAT_CSV) as test_writer:
+                    for housing_file_path in housing_file_paths:
+                        with open_housing_file(housing_file_path, tgz_file_path) as housing_file_obj:
+                            for chunk in iter_csv_chunks(housing_file_obj, chunk_size, dtype=str,
+                                                         keep_default_na=False):
+                                chunk_route = row_route[row_offset:row_offset + len(chunk)]
+                                row_offset += len(chunk)
+
+                                train_writer.write(chunk[chunk_route == 1])
+                                test_writer.write(chunk[chunk_route == 2])
+
+            # Ingested datasets are previous parts followed by this run's part, when it has rows
+            new_test_row_count = int(new_test_mask.sum())
+            if len(new_index) - new_test_row_count > 0 or len(train_part_file_paths) == 0:
+                train_part_file_paths.append(train_file_path)
+            if new_test_row_count > 0 or len(test_part_file_paths) == 0:
+                test_part_file_paths.append(test_file_path)
+            write_csv_parts(get_csv_parts_file_path(train_file_path), train_part_file_paths)
+            write_csv_parts(get_csv_parts_file_path(test_file_path), test_part_file_paths)
+
+            # Save state last, so only completed runs are continued from
+            np.save(row_keys_file_path, np.sort(row_hashes[new_index]))
+            write_yaml_file(os.path.join(ingested_dir, DATA_INGESTION_SPLIT_STATE_FILE_NAME), {
+                "strata": split_state,
+                "row_key_parts": [os.path.relpath(row_key_file_path, ingested_dir)
+                                  for row_key_file_path in row_key_file_paths + [row_keys_file_path]]
+            })
+
+            # Return train and test row counts of all rows ingested so far
+            test_row_count = sum(class_state["test_rows"] for class_state in split_state.values())
+            return sum(class_state["rows"] for class_state in split_state.values()) - test_row_count, test_row_count
         except Exception as e:
             raise HousingException(e, sys) from e
 
     def __del__(self):
         # Logging
-        logging.info(f"{'>>' * 20} data ingestion process completed {'<<' * 20}")
+        logging.info("%s data ingestion process completed %s", '>>' * 20, '<<' * 20)
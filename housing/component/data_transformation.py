@@ -0,0 +1,208 @@
+# Importing required packages
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, load_ingested_data, save_numpy_array_data, save_object
+from housing.entity.config_entity import DataTransformationConfig
+from housing.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact, \
+    DataTransformationArtifact
+
+
+class HousingPreprocessor(BaseEstimator, TransformerMixin):
+    """
+    Turn housing dataframe into float32 feature matrix in one pass,
+    - numerical columns plus derived ratios "rooms_per_household",
+      "population_per_household" and optionally "bedrooms_per_room"
+    - missing (and infinite) numerical values replaced by train median
+    - numerical features standardized with train mean and standard deviation
+    - categorical columns one-hot encoded over their schema domain values
+    """
+
+    def __init__(self, numerical_columns: list, categorical_columns: list, domain_value: dict,
+                 add_bedroom_per_room: bool = True):
+        self.numerical_columns = numerical_columns
+        self.categorical_columns = categorical_columns
+        self.domain_value = domain_value
+        self.add_bedroom_per_room = add_bedroom_per_room
+
+    def get_numerical_features(self, X: pd.DataFrame) -> np.ndarray:
+        try:
+            # Numerical columns followed by derived ratio columns, float32 throughout
+            column_position = {column: position for position, column in enumerate(self.numerical_columns)}
+            values = X[self.numerical_columns].to_numpy(dtype=np.float32)
+            total_rooms = values[:, column_position[COLUMN_TOTAL_ROOMS]]
+            households = values[:, column_position[COLUMN_HOUSEHOLDS]]
+            ratio_columns = [
+                (total_rooms, households),
+                (values[:, column_position[COLUMN_POPULATION]], households)
+            ]
+            if self.add_bedroom_per_room:
+                ratio_columns.append((values[:, column_position[COLUMN_TOTAL_BEDROOM]], total_rooms))
+
+            features = np.empty((len(values), values.shape[1] + len(ratio_columns)), dtype=np.float32)
+            features[:, :values.shape[1]] = values
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for position, (numerator, denominator) in enumerate(ratio_columns, start=values.shape[1]):
+                    np.divide(numerator, denominator, out=features[:, position])
+
+            # Division by zero is treated as missing value
+            features[~np.isfinite(features)] = np.nan
+            return features
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def fit(self, X: pd.DataFrame, y=None):
+        try:
+            features = self.get_numerical_features(X)
+            self.medians_ = np.nanmedian(features, axis=0).astype(np.float32)
+            features = np.where(np.isnan(features), self.medians_, features)
+            self.means_ = features.mean(axis=0, dtype=np.float64).astype(np.float32)
+            scales = features.std(axis=0, dtype=np.float64).astype(np.float32)
+            self.scales_ = np.where(scales == 0, np.float32(1), scales)
+            self.categories_ = {column: list(self.domain_value[column]) if column in self.domain_value
+                                else sorted(X[column].dropna().unique().tolist())
+                                for column in self.categorical_columns}
+            return self
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        try:
+            numerical_features = self.get_numerical_features(X)
+            category_count = sum(len(categories) for categories in self.categories_.values())
+
+            # Fill preallocated output block by block
+            output = np.zeros((len(X), numerical_features.shape[1] + category_count), dtype=np.float32)
+            numerical_output = output[:, :numerical_features.shape[1]]
+            np.copyto(numerical_output, numerical_features)
+            missing_row, missing_column = np.nonzero(np.isnan(numerical_output))
+            numerical_output[missing_row, missing_column] = self.medians_[missing_column]
+            numerical_output -= self.means_
+            numerical_output /= self.scales_
+
+            column_offset = numerical_features.shape[1]
+            for column, categories in self.categories_.items():
+                category_codes = pd.Categorical(X[column], categories=categories).codes
+                known_rows = np.flatnonzero(category_codes >= 0)
+                output[known_rows, column_offset + category_codes[known_rows]] = 1
+                column_offset += len(categories)
+            return output
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        feature_names = list(self.numerical_columns) + ["rooms_per_household", "population_per_household"]
+        if self.add_bedroom_per_room:
+            feature_names.append("bedrooms_per_room")
+        for column, categories in self.categories_.items():
+            feature_names.extend(f"{column}_{category}" for category in categories)
+        return np.array(feature_names, dtype=object)
+
+
+class DataTransformation:
+
+    def __init__(self, data_transformation_config: DataTransformationConfig,
+                 data_ingestion_artifact: DataIngestionArtifact,
+                 data_validation_artifact: DataValidationArtifact):
+        try:
+            # Logging information to log file
+            logging.info(f"{'>>' * 20} data transformation process started {'<<' * 20}")
+            self.data_transformation_config = data_transformation_config
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.data_validation_artifact = data_validation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_preprocessor(self) -> HousingPreprocessor:
+        try:
+            # Read dataset schema
+            dataset_schema = read_yaml_file(self.data_validation_artifact.schema_file_path)
+
+            return HousingPreprocessor(
+                numerical_columns=dataset_schema[NUMERICAL_COLUMN_KEY],
+                categorical_columns=dataset_schema[CATEGORICAL_COLUMN_KEY],
+                domain_value=dataset_schema.get(DATASET_SCHEMA_DOMAIN_VALUE_KEY) or {},
+                add_bedroom_per_room=self.data_transformation_config.add_bedroom_per_room
+            )
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_data_transformation(self) -> DataTransformationArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will load train and test datasets typed according to schema
+        - then we will fit preprocessor on train dataset and transform both datasets into float32
+        - and finally we will save feature matrices (target as last column) as ".npy"
+          files, which consumers can memory-map, and the fitted preprocessor
+        :return:
+        """
+        try:
+            schema_file_path = self.data_validation_artifact.schema_file_path
+            target_column = read_yaml_file(schema_file_path)[TARGET_COLUMN_KEY]
+
+            # Load train and test datasets
+            logging.info("loading train and test datasets")
+            train_data_frame = load_ingested_data(self.data_ingestion_artifact, schema_file_path, is_train=True)
+            test_data_frame = load_ingested_data(self.data_ingestion_artifact, schema_file_path, is_train=False)
+
+            # Fit preprocessor on train dataset
+            logging.info("fitting preprocessor on train dataset")
+            preprocessor = self.get_preprocessor().fit(train_data_frame)
+
+            transformed_file_name = f"{os.path.splitext(os.path.basename(self.get_ingested_file_name()))[0]}.npy"
+            transformed_file_paths = {}
+            for is_train, data_frame in ((True, train_data_frame), (False, test_data_frame)):
+                transformed_dir = self.data_transformation_config.transformed_train_dir if is_train \
+                    else self.data_transformation_config.transformed_test_dir
+                transformed_file_path = os.path.join(transformed_dir, transformed_file_name)
+
+                # Feature columns followed by target column
+                features = preprocessor.transform(data_frame)
+                transformed_array = np.empty((features.shape[0], features.shape[1] + 1), dtype=np.float32)
+                transformed_array[:, :-1] = features
+                transformed_array[:, -1] = data_frame[target_column].to_numpy(dtype=np.float32)
+                del features
+
+                # Logging information to log file
+                logging.info(f"saving transformed array of shape {transformed_array.shape} "
+                             f"to file: [{transformed_file_path}]")
+                save_numpy_array_data(file_path=transformed_file_path, array=transformed_array)
+                transformed_file_paths[is_train] = transformed_file_path
+
+            # Save fitted preprocessor
+            preprocessed_object_file_path = self.data_transformation_config.preprocessed_object_file_path
+            logging.info(f"saving preprocessor to file: [{preprocessed_object_file_path}]")
+            save_object(file_path=preprocessed_object_file_path, obj=preprocessor)
+
+            # Update data transformation artifact
+            data_transformation_artifact = DataTransformationArtifact(
+                is_transformed=True,
+                message='data transformation completed successfully',
+                transformed_train_file_path=transformed_file_paths[True],
+                transformed_test_file_path=transformed_file_paths[False],
+                preprocessed_object_file_path=preprocessed_object_file_path
+            )
+
+            # Logging information to log file
+            logging.info(f"data transformation artifact: [{data_transformation_artifact}]")
+
+            # Returning updated data transformation artifact
+            return data_transformation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_ingested_file_name(self) -> str:
+        data_ingestion_artifact = self.data_ingestion_artifact
+        if data_ingestion_artifact.base_file_path is not None:
+            return data_ingestion_artifact.base_file_path
+        return data_ingestion_artifact.train_file_path
+
+    def __del__(self):
+        # Logging
+        logging.info(f"{'>>' * 20} data transformation process completed {'<<' * 20}")
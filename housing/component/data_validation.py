@@ -0,0 +1,271 @@
+# Importing required packages
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, load_data_frame, load_numpy_array_data, take_rows
+from housing.entity.config_entity import DataValidationConfig
+from housing.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+
+
+def get_population_stability_index(expected_counts: np.ndarray, actual_counts: np.ndarray) -> float:
+    """
+    Population stability index between two histograms over the same bins
+    (< 0.1 no shift, 0.1 - 0.2 moderate shift, > 0.2 significant shift)
+    """
+    expected_share = np.clip(expected_counts / max(expected_counts.sum(), 1), 1e-6, None)
+    actual_share = np.clip(actual_counts / max(actual_counts.sum(), 1), 1e-6, None)
+    return float(np.sum((actual_share - expected_share) * np.log(actual_share / expected_share)))
+
+
+def get_numerical_histograms(train_values: np.ndarray, test_values: np.ndarray, bins: int) -> tuple:
+    """
+    Histograms of train and test values over train quantile bins, missing values ignored
+    return: tuple train counts, test counts
+    """
+    train_values = train_values[~np.isnan(train_values)]
+    test_values = test_values[~np.isnan(test_values)]
+    if len(train_values) == 0:
+        return np.array([0]), np.array([len(test_values)])
+
+    # Inner bin edges, outer bins are open ended so no value falls outside
+    bin_edges = np.unique(np.quantile(train_values, np.linspace(0, 1, bins + 1)[1:-1]))
+    train_counts = np.bincount(np.searchsorted(bin_edges, train_values, side="right"), minlength=len(bin_edges) + 1)
+    test_counts = np.bincount(np.searchsorted(bin_edges, test_values, side="right"), minlength=len(bin_edges) + 1)
+    return train_counts, test_counts
+
+
+def get_categorical_histograms(train_values: pd.Series, test_values: pd.Series) -> tuple:
+    """
+    Frequencies of every category seen in train or test
+    return: tuple train counts, test counts
+    """
+    train_counts = train_values.value_counts(dropna=False)
+    test_counts = test_values.value_counts(dropna=False)
+    categories = train_counts.index.union(test_counts.index)
+    return (train_counts.reindex(categories, fill_value=0).to_numpy(),
+            test_counts.reindex(categories, fill_value=0).to_numpy())
+
+
+def import_evidently_report() -> tuple:
+    """
+    evidently Report and DataDriftPreset, only needed for the full report
+    (evidently 0.7 API, the former Dashboard/DataDriftTab API is removed)
+    return: tuple Report, DataDriftPreset
+    """
+    try:
+        from evidently import Report
+        from evidently.presets import DataDriftPreset
+    except ImportError:
+        raise ImportError('"full_report" of data_validation_config needs evidently>=0.7,<0.8, install it with: '
+                          'pip install "evidently>=0.7,<0.8", or disable "full_report"') from None
+    return Report, DataDriftPreset
+
+
+class DataValidation:
+
+    def __init__(self, data_validation_config: DataValidationConfig, data_ingestion_artifact: DataIngestionArtifact):
+        # Fail before loading any data when full report cannot be built
+        if data_validation_config.full_report:
+            import_evidently_report()
+        try:
+            # Logging information to log file
+            logging.info(f"{'>>' * 20} data validation process started {'<<' * 20}")
+            self.data_validation_config = data_validation_config
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.dataset_schema = read_yaml_file(data_validation_config.schema_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_data_validation(self) -> DataValidationArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will load train and test datasets as stored (no schema dtypes applied)
+        - then we will check columns, dtypes and domain values against schema
+        - and finally we will check drift between train and test on a sample
+          (full evidently report only when "full_report" is enabled)
+        :return:
+        """
+        try:
+            # Load train and test datasets
+            train_data_frame = self.load_dataset(is_train=True)
+            test_data_frame = self.load_dataset(is_train=False)
+
+            # Check datasets against schema
+            schema_report = {
+                "train": self.validate_dataset_schema(train_data_frame),
+                "test": self.validate_dataset_schema(test_data_frame)
+            }
+            is_validated = all(len(dataset_report["errors"]) == 0 for dataset_report in schema_report.values())
+
+            # Check drift between train and test
+            drift_report = self.get_drift_report(train_data_frame, test_data_frame)
+
+            # Save report
+            report = {"schema": schema_report, "drift": drift_report}
+            os.makedirs(os.path.dirname(self.data_validation_config.report_file_path), exist_ok=True)
+            with open(self.data_validation_config.report_file_path, "w") as report_file:
+                json.dump(report, report_file, indent=4)
+
+            # Logging information to log file
+            logging.info(f"data validation report saved to: [{self.data_validation_config.report_file_path}]")
+
+            # Save full report page on demand
+            report_page_file_path = None
+            if self.data_validation_config.full_report:
+                report_page_file_path = self.save_full_report(train_data_frame, test_data_frame)
+
+            if not is_validated:
+                raise Exception(f"data validation failed: {schema_report}")
+
+            # Update data validation artifact
+            data_validation_artifact = DataValidationArtifact(
+                schema_file_path=self.data_validation_config.schema_file_path,
+                report_file_path=self.data_validation_config.report_file_path,
+                report_page_file_path=report_page_file_path,
+                is_validated=is_validated,
+                is_drift_detected=drift_report["is_drift_detected"],
+                message='data validation completed successfully'
+            )
+
+            # Logging information to log file
+            logging.info(f"data validation artifact: [{data_validation_artifact}]")
+
+            # Returning updated data validation artifact
+            return data_validation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def load_dataset(self, is_train: bool) -> pd.DataFrame:
+        try:
+            data_ingestion_artifact = self.data_ingestion_artifact
+
+            # Index split layout: rows of base table
+            if data_ingestion_artifact.base_file_path is not None:
+                index_file_path = data_ingestion_artifact.train_index_file_path if is_train \
+                    else data_ingestion_artifact.test_index_file_path
+                return take_rows(
+                    load_data_frame(data_ingestion_artifact.base_file_path),
+                    load_numpy_array_data(index_file_path)
+                )
+
+            # Files split layout
+            file_path = data_ingestion_artifact.train_file_path if is_train else data_ingestion_artifact.test_file_path
+            return load_data_frame(file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def validate_dataset_schema(self, data_frame: pd.DataFrame) -> dict:
+        """
+        Check column presence, dtypes and domain values in one pass over the columns
+        return: dict with list of errors and number of out of domain values per column
+        """
+        try:
+            schema_columns = self.dataset_schema[DATASET_SCHEMA_COLUMNS_KEY]
+            domain_value = self.dataset_schema.get(DATASET_SCHEMA_DOMAIN_VALUE_KEY) or {}
+            errors = []
+
+            # Column presence
+            missing_columns = [column for column in schema_columns if column not in data_frame.columns]
+            extra_columns = [column for column in data_frame.columns if column not in schema_columns]
+            if len(missing_columns) > 0:
+                errors.append(f"missing columns: {missing_columns}")
+            if len(extra_columns) > 0:
+                errors.append(f"columns not in schema: {extra_columns}")
+
+            # Dtypes and domain values
+            out_of_domain_counts = {}
+            for column, column_type in schema_columns.items():
+                if column not in data_frame.columns:
+                    continue
+                column_values = data_frame[column]
+                if column_type == "float" and not pd.api.types.is_numeric_dtype(column_values):
+                    errors.append(f"column: [{column}] is not numeric, found dtype: [{column_values.dtype}]")
+                if column in domain_value:
+                    out_of_domain = column_values.notna() & ~column_values.isin(domain_value[column])
+                    out_of_domain_count = int(out_of_domain.sum())
+                    out_of_domain_counts[column] = out_of_domain_count
+                    if out_of_domain_count > 0:
+                        unknown_values = column_values[out_of_domain].unique()[:10].tolist()
+                        errors.append(f"column: [{column}] has [{out_of_domain_count}] values outside domain, "
+                                      f"for example: {unknown_values}")
+
+            return {"rows": len(data_frame), "errors": errors, "out_of_domain_counts": out_of_domain_counts}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_drift_report(self, train_data_frame: pd.DataFrame, test_data_frame: pd.DataFrame) -> dict:
+        """
+        Histogram based drift check on a random sample of at most "drift_sample_size"
+        rows per dataset, population stability index per column
+        """
+        try:
+            sample_size = self.data_validation_config.drift_sample_size
+            drift_threshold = self.data_validation_config.drift_threshold
+
+            # Sample rows
+            if sample_size and len(train_data_frame) > sample_size:
+                train_data_frame = train_data_frame.sample(n=sample_size, random_state=DATA_VALIDATION_RANDOM_STATE)
+            if sample_size and len(test_data_frame) > sample_size:
+                test_data_frame = test_data_frame.sample(n=sample_size, random_state=DATA_VALIDATION_RANDOM_STATE)
+
+            # Population stability index of every column present in both datasets
+            column_drift = {}
+            for column in train_data_frame.columns.intersection(test_data_frame.columns):
+                train_values, test_values = train_data_frame[column], test_data_frame[column]
+                if pd.api.types.is_numeric_dtype(train_values) and pd.api.types.is_numeric_dtype(test_values):
+                    train_counts, test_counts = get_numerical_histograms(
+                        train_values.to_numpy(dtype=np.float64),
+                        test_values.to_numpy(dtype=np.float64),
+                        bins=self.data_validation_config.drift_bins
+                    )
+                else:
+                    train_counts, test_counts = get_categorical_histograms(train_values, test_values)
+                population_stability_index = get_population_stability_index(train_counts, test_counts)
+                column_drift[column] = {
+                    "population_stability_index": round(population_stability_index, 6),
+                    "is_drift_detected": population_stability_index > drift_threshold
+                }
+
+            drift_report = {
+                "train_sample_rows": len(train_data_frame),
+                "test_sample_rows": len(test_data_frame),
+                "threshold": drift_threshold,
+                "is_drift_detected": any(drift["is_drift_detected"] for drift in column_drift.values()),
+                "columns": column_drift
+            }
+
+            # Logging information to log file
+            logging.info(f"drift detected: [{drift_report['is_drift_detected']}]")
+            return drift_report
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def save_full_report(self, train_data_frame: pd.DataFrame, test_data_frame: pd.DataFrame) -> str:
+        """
+        Full evidently data drift report page over complete datasets
+        """
+        try:
+            Report, DataDriftPreset = import_evidently_report()
+
+            # Logging information to log file
+            logging.info("building full evidently data drift report")
+
+            # Train dataset is reference, test dataset is compared against it
+            snapshot = Report([DataDriftPreset()]).run(current_data=test_data_frame, reference_data=train_data_frame)
+
+            report_page_file_path = self.data_validation_config.report_page_file_path
+            os.makedirs(os.path.dirname(report_page_file_path), exist_ok=True)
+            snapshot.save_html(report_page_file_path)
+            return report_page_file_path
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __del__(self):
+        # Logging
+        logging.info(f"{'>>' * 20} data validation process completed {'<<' * 20}")
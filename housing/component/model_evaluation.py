@@ -0,0 +1,203 @@
+# Importing required packages
+import os
+import sys
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, write_yaml_file, iter_ingested_data, load_model_object, \
+    get_latest_model_path
+from housing.entity.config_entity import ModelEvaluationConfig
+from housing.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact, ModelTrainerArtifact, \
+    ModelEvaluationArtifact
+
+
+class RegressionMetricAccumulator:
+    """
+    Running sums of a regression evaluation, so that r2 score and rmse
+    are computed batch by batch without keeping predictions
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.target_sum = 0.0
+        self.target_square_sum = 0.0
+        self.squared_error_sum = 0.0
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        y_true = np.asarray(y_true, dtype=np.float64)
+        error = y_true - np.asarray(y_pred, dtype=np.float64)
+        self.count += len(y_true)
+        self.target_sum += float(y_true.sum())
+        self.target_square_sum += float(np.dot(y_true, y_true))
+        self.squared_error_sum += float(np.dot(error, error))
+
+    def get_metrics(self) -> dict:
+        total_sum_of_squares = self.target_square_sum - self.target_sum ** 2 / self.count
+        return {
+            "r2_score": 1.0 - self.squared_error_sum / total_sum_of_squares,
+            "rmse": float(np.sqrt(self.squared_error_sum / self.count)),
+            "rows": self.count
+        }
+
+
+class ModelEvaluation:
+
+    def __init__(self, model_evaluation_config: ModelEvaluationConfig,
+                 data_ingestion_artifact: DataIngestionArtifact,
+                 data_validation_artifact: DataValidationArtifact,
+                 model_trainer_artifact: ModelTrainerArtifact):
+        try:
+            # Logging information to log file
+            logging.info(f"{'>>' * 20} model evaluation process started {'<<' * 20}")
+            self.model_evaluation_config = model_evaluation_config
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.data_validation_artifact = data_validation_artifact
+            self.model_trainer_artifact = model_trainer_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_production_model_path(self):
+        """
+        Latest model exported to saved models directory, None before first export
+        """
+        try:
+            return get_latest_model_path(
+                model_export_dir=self.model_evaluation_config.model_export_dir,
+                model_file_name=os.path.basename(self.model_trainer_artifact.trained_model_file_path)
+            )
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def evaluate_models(self, models: dict) -> dict:
+        """
+        Score all models on test dataset in one pass, batch by batch, models
+        predicting every batch concurrently; test dataset is streamed, only one
+        batch is held in memory
+        models: dict name -> model with "predict" on raw housing dataframe
+        return: dict name -> metrics
+        """
+        try:
+            schema_file_path = self.data_validation_artifact.schema_file_path
+            dataset_schema = read_yaml_file(schema_file_path)
+            target_column = dataset_schema[TARGET_COLUMN_KEY]
+            columns = dataset_schema[NUMERICAL_COLUMN_KEY] + dataset_schema[CATEGORICAL_COLUMN_KEY] + [target_column]
+
+            batch_size = self.model_evaluation_config.batch_size or MODEL_EVALUATION_DEFAULT_BATCH_SIZE
+
+            accumulators = {name: RegressionMetricAccumulator() for name in models}
+            with ThreadPoolExecutor(max_workers=len(models)) as executor:
+                # Stream test dataset, only columns models need
+                for batch in iter_ingested_data(self.data_ingestion_artifact, schema_file_path, is_train=False,
+                                                columns=columns, chunk_size=batch_size):
+                    predictions = {name: executor.submit(model.predict, batch) for name, model in models.items()}
+                    for name, prediction in predictions.items():
+                        accumulators[name].update(batch[target_column].to_numpy(), prediction.result())
+
+            return {name: accumulator.get_metrics() for name, accumulator in accumulators.items()}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def update_evaluation_report(self, trained_model_metrics: dict, production_model_metrics: dict,
+                                 production_model_path: str, is_model_accepted: bool) -> None:
+        """
+        model_evaluation.yaml
+        - best_model ----- path and metrics of best model so far
+        - history
+            - <timestamp> ----- metrics of trained and production model and decision
+        """
+        try:
+            model_evaluation_file_path = self.model_evaluation_config.model_evaluation_file_path
+            report = read_yaml_file(model_evaluation_file_path) if os.path.exists(model_evaluation_file_path) else {}
+            report = report or {}
+
+            if is_model_accepted:
+                report[BEST_MODEL_KEY] = {
+                    MODEL_PATH_KEY: self.model_trainer_artifact.trained_model_file_path,
+                    **trained_model_metrics
+                }
+            history = report.get(HISTORY_KEY) or {}
+            history[self.model_evaluation_config.time_stamp] = {
+                "trained_model": {
+                    MODEL_PATH_KEY: self.model_trainer_artifact.trained_model_file_path,
+                    **trained_model_metrics
+                },
+                "production_model": None if production_model_path is None else {
+                    MODEL_PATH_KEY: production_model_path,
+                    **production_model_metrics
+                },
+                "is_model_accepted": is_model_accepted
+            }
+            report[HISTORY_KEY] = history
+
+            # Write to temporary file and swap it in atomically
+            temp_model_evaluation_file_path = f"{model_evaluation_file_path}.{os.getpid()}.tmp"
+            write_yaml_file(file_path=temp_model_evaluation_file_path, data=report)
+            os.replace(temp_model_evaluation_file_path, model_evaluation_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_model_evaluation(self) -> ModelEvaluationArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will load trained model and current production model (if any)
+        - then we will score both models on test dataset in a single batched pass
+        - and finally we will accept trained model when there is no production model
+          or it has higher r2 score, and record result in "model_evaluation.yaml"
+        :return:
+        """
+        try:
+            # Load trained and production models
+            trained_model_file_path = self.model_trainer_artifact.trained_model_file_path
+            models = {"trained_model": load_model_object(trained_model_file_path)}
+            production_model_path = self.get_production_model_path()
+            if production_model_path is not None:
+                models["production_model"] = load_model_object(production_model_path)
+
+            # Logging information to log file
+            logging.info(f"evaluating trained model: [{trained_model_file_path}] against production model: "
+                         f"[{production_model_path}]")
+
+            # Score models on test dataset
+            metrics = self.evaluate_models(models)
+            trained_model_metrics = metrics["trained_model"]
+            production_model_metrics = metrics.get("production_model")
+            logging.info(f"model evaluation metrics: {metrics}")
+
+            # Accept trained model only when it beats production model
+            is_model_accepted = production_model_metrics is None or \
+                trained_model_metrics["r2_score"] > production_model_metrics["r2_score"]
+
+            # Record evaluation result
+            self.update_evaluation_report(
+                trained_model_metrics=trained_model_metrics,
+                production_model_metrics=production_model_metrics,
+                production_model_path=production_model_path,
+                is_model_accepted=is_model_accepted
+            )
+
+            # Update model evaluation artifact
+            model_evaluation_artifact = ModelEvaluationArtifact(
+                is_model_accepted=is_model_accepted,
+                evaluated_model_path=trained_model_file_path,
+                accuracy=trained_model_metrics["r2_score"],
+                production_model_path=production_model_path,
+                production_model_accuracy=None if production_model_metrics is None
+                else production_model_metrics["r2_score"],
+                message='trained model accepted' if is_model_accepted
+                else 'trained model is not better than production model'
+            )
+
+            # Logging information to log file
+            logging.info(f"model evaluation artifact: [{model_evaluation_artifact}]")
+
+            # Returning updated model evaluation artifact
+            return model_evaluation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __del__(self):
+        # Logging
+        logging.info(f"{'>>' * 20} model evaluation process completed {'<<' * 20}")
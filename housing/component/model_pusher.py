@@ -0,0 +1,78 @@
+# Importing required packages
+import os
+import sys
+import shutil
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import set_current_model_version
+from housing.util.download_cache import link_file
+from housing.entity.config_entity import ModelPusherConfig
+from housing.entity.artifact_entity import ModelEvaluationArtifact, ModelPusherArtifact
+
+
+class ModelPusher:
+
+    def __init__(self, model_pusher_config: ModelPusherConfig, model_evaluation_artifact: ModelEvaluationArtifact):
+        try:
+            # Logging information to log file
+            logging.info("%s model pusher process started %s", '>>' * 20, '<<' * 20)
+            self.model_pusher_config = model_pusher_config
+            self.model_evaluation_artifact = model_evaluation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_model_pusher(self) -> ModelPusherArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will place evaluated model into a temporary version directory
+          (hard link when possible, model files are never modified in place)
+        - then we will publish version directory by renaming it atomically
+        - and finally we will switch current version pointer atomically, serving
+          processes pick new version up without restart
+        :return:
+        """
+        try:
+            evaluated_model_path = self.model_evaluation_artifact.evaluated_model_path
+            export_dir_path = self.model_pusher_config.export_dir_path
+            model_version = os.path.basename(export_dir_path)
+            export_model_file_path = os.path.join(export_dir_path, os.path.basename(evaluated_model_path))
+
+            # Place model into temporary version directory
+            temp_export_dir_path = f"{export_dir_path}.{os.getpid()}.tmp"
+            shutil.rmtree(temp_export_dir_path, ignore_errors=True)
+            os.makedirs(temp_export_dir_path)
+            link_method = link_file(evaluated_model_path,
+                                    os.path.join(temp_export_dir_path, os.path.basename(evaluated_model_path)))
+
+            # Publish version directory, readers see either nothing or complete version
+            os.rename(temp_export_dir_path, export_dir_path)
+
+            # Logging information to log file
+            logging.info("model [%s] published as version [%s] by %s", evaluated_model_path, model_version, link_method)
+
+            # Switch current version pointer
+            set_current_model_version(
+                model_export_dir=self.model_pusher_config.model_export_dir,
+                model_version=model_version,
+                model_file_name=os.path.basename(export_model_file_path)
+            )
+
+            # Update model pusher artifact
+            model_pusher_artifact = ModelPusherArtifact(
+                is_model_pusher=True,
+                export_model_file_path=export_model_file_path,
+                model_version=model_version
+            )
+
+            # Logging information to log file
+            logging.info("model pusher artifact: [%s]", model_pusher_artifact)
+
+            # Returning updated model pusher artifact
+            return model_pusher_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __del__(self):
+        # Logging
+        logging.info("%s model pusher process completed %s", '>>' * 20, '<<' * 20)
@@ -0,0 +1,135 @@
+# Importing required packages
+import sys
+import pandas as pd
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import load_numpy_array_data, load_object, save_model_object
+from housing.entity.config_entity import ModelTrainerConfig
+from housing.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact
+from housing.entity.model_factory import ModelFactory, evaluate_regression_model
+
+
+class HousingEstimatorModel:
+
+    def __init__(self, preprocessing_object, trained_model_object):
+        """
+        Trained model together with preprocessor fitted on its training data
+        preprocessing_object: fitted HousingPreprocessor
+        trained_model_object: fitted estimator
+        """
+        self.preprocessing_object = preprocessing_object
+        self.trained_model_object = trained_model_object
+
+    def predict(self, X: pd.DataFrame):
+        """
+        Transform raw housing dataframe with preprocessor and predict with trained model
+        """
+        transformed_feature = self.preprocessing_object.transform(X)
+        return self.trained_model_object.predict(transformed_feature)
+
+    def __repr__(self):
+        return f"{type(self.trained_model_object).__name__}()"
+
+    def __str__(self):
+        return f"{type(self.trained_model_object).__name__}()"
+
+
+class ModelTrainer:
+
+    def __init__(self, model_trainer_config: ModelTrainerConfig,
+                 data_transformation_artifact: DataTransformationArtifact):
+        try:
+            # Logging information to log file
+            logging.info(f"{'>>' * 20} model trainer process started {'<<' * 20}")
+            self.model_trainer_config = model_trainer_config
+            self.data_transformation_artifact = data_transformation_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        """
+        We will basically do three tasks as mentioned below,
+        - firstly we will run searches of all models from model config concurrently,
+          sharing one cpu budget between them
+        - then we will evaluate searched models on test dataset and pick the best one
+          reaching base accuracy
+        - and finally we will save best model together with preprocessor
+        :return:
+        """
+        try:
+            base_accuracy = self.model_trainer_config.base_accuracy
+
+            # Search best parameters of every model
+            logging.info(f"initializing model factory with config: [{self.model_trainer_config.model_config_file_path}]")
+            model_factory = ModelFactory(
+                model_config_path=self.model_trainer_config.model_config_file_path,
+                cpu_budget=self.model_trainer_config.cpu_budget,
+                cache_cv_folds=self.model_trainer_config.cache_cv_folds,
+                search_cache_dir=self.model_trainer_config.search_cache_dir,
+                search_cache_models=self.model_trainer_config.search_cache_models,
+                fold_cache_dir=self.model_trainer_config.fold_cache_dir
+            )
+            grid_searched_best_model_list = model_factory.get_best_model(
+                train_file_path=self.data_transformation_artifact.transformed_train_file_path,
+                base_accuracy=base_accuracy
+            )
+
+            # Load transformed train and test arrays, target is last column
+            train_array = load_numpy_array_data(self.data_transformation_artifact.transformed_train_file_path,
+                                                mmap_mode="r")
+            test_array = load_numpy_array_data(self.data_transformation_artifact.transformed_test_file_path,
+                                               mmap_mode="r")
+            x_train, y_train = train_array[:, :-1], train_array[:, -1]
+            x_test, y_test = test_array[:, :-1], test_array[:, -1]
+
+            # Evaluate models on train and test datasets
+            logging.info("evaluating searched models on train and test datasets")
+            metric_info = evaluate_regression_model(
+                model_list=[grid_searched_best_model.best_model
+                            for grid_searched_best_model in grid_searched_best_model_list],
+                X_train=x_train,
+                y_train=y_train,
+                X_test=x_test,
+                y_test=y_test,
+                base_accuracy=base_accuracy
+            )
+            if metric_info is None:
+                raise Exception(f"none of the models has test accuracy higher than base accuracy: [{base_accuracy}]")
+
+            # Logging information to log file
+            logging.info(f"best model found: [{metric_info.model_name}] test accuracy: [{metric_info.test_accuracy}]")
+
+            # Save best model together with preprocessor
+            preprocessing_object = load_object(file_path=self.data_transformation_artifact.preprocessed_object_file_path)
+            housing_model = HousingEstimatorModel(
+                preprocessing_object=preprocessing_object,
+                trained_model_object=metric_info.model_object
+            )
+            trained_model_file_path = self.model_trainer_config.trained_model_file_path
+            logging.info(f"saving model to file: [{trained_model_file_path}]")
+            save_model_object(file_path=trained_model_file_path, obj=housing_model)
+
+            # Update model trainer artifact
+            model_trainer_artifact = ModelTrainerArtifact(
+                is_trained=True,
+                message='model trained successfully',
+                trained_model_file_path=trained_model_file_path,
+                train_rmse=metric_info.train_rmse,
+                test_rmse=metric_info.test_rmse,
+                train_accuracy=metric_info.train_accuracy,
+                test_accuracy=metric_info.test_accuracy,
+                model_accuracy=metric_info.model_accuracy
+            )
+
+            # Logging information to log file
+            logging.info(f"model trainer artifact: [{model_trainer_artifact}]")
+
+            # Returning updated model trainer artifact
+            return model_trainer_artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __del__(self):
+        # Logging
+        logging.info(f"{'>>' * 20} model trainer process completed {'<<' * 20}")
@@ -3,15 +3,16 @@ import sys
 
 from housing.constant import *
 from housing.logger import logging
-from housing.util import read_yaml_file
+from housing.util import read_yaml_file, get_latest_model_path
 from housing.exception import HousingException
 
-from housing.entity.config_entity import TrainingPipelineConfig, DataIngestionConfig
+from housing.entity.config_entity import TrainingPipelineConfig, DataIngestionConfig, DataValidationConfig, \
+    DataTransformationConfig, ModelTrainerConfig, ModelEvaluationConfig, ModelPusherConfig, BatchPredictionConfig
 
 
 class Configuration:
 
-    def __int__(self,
+    def __init__(self,
                 config_file_path: str = CONFIG_FILE_PATH,
                 current_timestamp: str = CURRENT_TIMESTAMP
                 ) -> None:
@@ -41,6 +42,9 @@ class Configuration:
                     - <directory content>
                 - tgz_data ----- (3)
                     - <directory content>
+            - download_cache ----- (shared by all runs)
+                - objects
+                - manifest.yaml
         :return:
         """
         try:
@@ -92,13 +96,53 @@ class Configuration:
                 data_ingestion_info[DATA_INGESTION_TEST_DIR_KEY]
             )
 
+            # Get number of rows per chunk for streaming split (disabled when not set)
+            chunk_size = data_ingestion_info.get(DATA_INGESTION_CHUNK_SIZE_KEY)
+
+            # Create shared download cache directory path
+            # It sits outside timestamped directories so that every run can reuse it
+            download_cache_dir = data_ingestion_info.get(DATA_INGESTION_DOWNLOAD_CACHE_DIR_KEY)
+            if download_cache_dir is not None:
+                download_cache_dir = os.path.join(
+                    artifact_dir,
+                    DATA_INGESTION_ARTIFACT_DIR,
+                    download_cache_dir
+                )
+
+            # Check whether to write extracted dataset to raw data directory
+            # When disabled dataset is read straight out of the downloaded archive
+            extract_raw_data = data_ingestion_info.get(DATA_INGESTION_EXTRACT_RAW_DATA_KEY, True)
+
+            # Get file format of ingested train and test datasets
+            artifact_format = data_ingestion_info.get(DATA_INGESTION_ARTIFACT_FORMAT_KEY, ARTIFACT_FORMAT_CSV)
+
+            # Get number of processes used to split several data files (all cores when not set)
+            ingestion_workers = data_ingestion_info.get(DATA_INGESTION_WORKERS_KEY)
+
+            # Check whether to only append rows not ingested by previous run
+            incremental = data_ingestion_info.get(DATA_INGESTION_INCREMENTAL_KEY, False)
+
+            # Get columns identifying a row for incremental ingestion (all columns when not set)
+            row_key_columns = data_ingestion_info.get(DATA_INGESTION_ROW_KEY_COLUMNS_KEY)
+
+            # Get ingested split layout, separate train and test files or base table with row indexes
+            split_layout = data_ingestion_info.get(DATA_INGESTION_SPLIT_LAYOUT_KEY, SPLIT_LAYOUT_FILES)
+
             # Update data ingestion configuration with above created paths
             data_ingestion_config = DataIngestionConfig(
                 dataset_download_url=dataset_download_url,
                 tgz_download_dir=tgz_download_dir,
                 raw_data_dir=raw_data_dir,
                 ingested_train_dir=ingested_train_dir,
-                ingested_test_dir=ingested_test_dir
+                ingested_test_dir=ingested_test_dir,
+                chunk_size=chunk_size,
+                download_cache_dir=download_cache_dir,
+                extract_raw_data=extract_raw_data,
+                artifact_format=artifact_format,
+                ingestion_workers=ingestion_workers,
+                incremental=incremental,
+                row_key_columns=row_key_columns,
+                split_layout=split_layout
             )
 
             # logging updated data ingestion configuration
@@ -109,6 +153,324 @@ class Configuration:
         except Exception as e:
             raise HousingException(e, sys) from e
 
+    def get_data_validation_configuration(self) -> DataValidationConfig:
+        """
+        artifact
+        - data_validation
+            - <current timestamp>
+                - report.json
+                - report.html (only when full report is enabled)
+        :return:
+        """
+        try:
+            # Get artifact directory path
+            artifact_dir = self.training_pipeline_config.artifact_dir
+
+            # Create data validation artifact directory
+            data_validation_artifact_dir = os.path.join(
+                artifact_dir,
+                DATA_VALIDATION_ARTIFACT_DIR_NAME,
+                self.timestamp
+            )
+
+            # Get data validation config section from configuration
+            data_validation_info = self.config_info[DATA_VALIDATION_CONFIG_KEY]
+
+            # Get schema file path
+            schema_file_path = os.path.join(
+                ROOT_DIR,
+                data_validation_info[DATA_VALIDATION_SCHEMA_DIR_KEY],
+                data_validation_info[DATA_VALIDATION_SCHEMA_FILE_NAME_KEY]
+            )
+
+            # Create validation report file path
+            report_file_path = os.path.join(
+                data_validation_artifact_dir,
+                data_validation_info[DATA_VALIDATION_REPORT_FILE_NAME_KEY]
+            )
+
+            # Create validation report page file path
+            report_page_file_path = os.path.join(
+                data_validation_artifact_dir,
+                data_validation_info[DATA_VALIDATION_REPORT_PAGE_FILE_NAME_KEY]
+            )
+
+            # Update data validation configuration
+            data_validation_config = DataValidationConfig(
+                schema_file_path=schema_file_path,
+                report_file_path=report_file_path,
+                report_page_file_path=report_page_file_path,
+                drift_sample_size=data_validation_info.get(DATA_VALIDATION_DRIFT_SAMPLE_SIZE_KEY),
+                drift_bins=data_validation_info.get(DATA_VALIDATION_DRIFT_BINS_KEY, 10),
+                drift_threshold=data_validation_info.get(DATA_VALIDATION_DRIFT_THRESHOLD_KEY, 0.2),
+                full_report=data_validation_info.get(DATA_VALIDATION_FULL_REPORT_KEY, False)
+            )
+
+            # Logging updated data validation configuration
+            logging.info(f"data validation configuration: [{data_validation_config}]")
+
+            # Returning updated data validation configuration
+            return data_validation_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_data_transformation_configuration(self) -> DataTransformationConfig:
+        """
+        artifact
+        - data_transformation
+            - <current timestamp>
+                - preprocessed
+                    - preprocessed.pkl
+                - transformed_data
+                    - test
+                        - <directory content>
+                    - train
+                        - <directory content>
+        :return:
+        """
+        try:
+            # Get artifact directory path
+            artifact_dir = self.training_pipeline_config.artifact_dir
+
+            # Create data transformation artifact directory
+            data_transformation_artifact_dir = os.path.join(
+                artifact_dir,
+                DATA_TRANSFORMATION_ARTIFACT_DIR,
+                self.timestamp
+            )
+
+            # Get data transformation config section from configuration
+            data_transformation_info = self.config_info[DATA_TRANSFORMATION_CONFIG_KEY]
+
+            # Create preprocessed object file path
+            preprocessed_object_file_path = os.path.join(
+                data_transformation_artifact_dir,
+                data_transformation_info[DATA_TRANSFORMATION_PREPROCESSING_DIR_KEY],
+                data_transformation_info[DATA_TRANSFORMATION_PREPROCESSED_FILE_NAME_KEY]
+            )
+
+            # Create transformed data directory path
+            transformed_dir = os.path.join(
+                data_transformation_artifact_dir,
+                data_transformation_info[DATA_TRANSFORMATION_DIR_NAME_KEY]
+            )
+
+            # Create directory paths to store transformed train and test datasets
+            transformed_train_dir = os.path.join(
+                transformed_dir,
+                data_transformation_info[DATA_TRANSFORMATION_TRAIN_DIR_NAME_KEY]
+            )
+            transformed_test_dir = os.path.join(
+                transformed_dir,
+                data_transformation_info[DATA_TRANSFORMATION_TEST_DIR_NAME_KEY]
+            )
+
+            # Update data transformation configuration
+            data_transformation_config = DataTransformationConfig(
+                add_bedroom_per_room=data_transformation_info[DATA_TRANSFORMATION_ADD_BEDROOM_PER_ROOM_KEY],
+                transformed_train_dir=transformed_train_dir,
+                transformed_test_dir=transformed_test_dir,
+                preprocessed_object_file_path=preprocessed_object_file_path
+            )
+
+            # Logging updated data transformation configuration
+            logging.info(f"data transformation configuration: [{data_transformation_config}]")
+
+            # Returning updated data transformation configuration
+            return data_transformation_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_model_trainer_configuration(self) -> ModelTrainerConfig:
+        """
+        artifact
+        - model_trainer
+            - <current timestamp>
+                - trained_model
+                    - model.pkl
+                - cv_folds ----- (cross validation fold matrices of this run)
+            - search_cache ----- (shared by all runs)
+        :return:
+        """
+        try:
+            # Get artifact directory path
+            artifact_dir = self.training_pipeline_config.artifact_dir
+
+            # Create model trainer artifact directory
+            model_trainer_artifact_dir = os.path.join(
+                artifact_dir,
+                MODEL_TRAINER_ARTIFACT_DIR,
+                self.timestamp
+            )
+
+            # Get model trainer config section from configuration
+            model_trainer_info = self.config_info[MODEL_TRAINER_CONFIG_KEY]
+
+            # Create trained model file path
+            trained_model_file_path = os.path.join(
+                model_trainer_artifact_dir,
+                model_trainer_info[MODEL_TRAINER_TRAINED_MODEL_DIR_KEY],
+                model_trainer_info[MODEL_TRAINER_TRAINED_MODEL_FILE_NAME_KEY]
+            )
+
+            # Create shared search cache directory path
+            # It sits outside timestamped directories so that every run can reuse it
+            search_cache_dir = model_trainer_info.get(MODEL_TRAINER_SEARCH_CACHE_DIR_KEY)
+            if search_cache_dir is not None:
+                search_cache_dir = os.path.join(
+                    artifact_dir,
+                    MODEL_TRAINER_ARTIFACT_DIR,
+                    search_cache_dir
+                )
+
+            # Get model config file path
+            model_config_file_path = os.path.join(
+                ROOT_DIR,
+                model_trainer_info[MODEL_TRAINER_MODEL_CONFIG_DIR_KEY],
+                model_trainer_info[MODEL_TRAINER_MODEL_CONFIG_FILE_NAME_KEY]
+            )
+
+            # Update model trainer configuration
+            model_trainer_config = ModelTrainerConfig(
+                trained_model_file_path=trained_model_file_path,
+                base_accuracy=model_trainer_info[MODEL_TRAINER_BASE_ACCURACY_KEY],
+                model_config_file_path=model_config_file_path,
+                cpu_budget=model_trainer_info.get(MODEL_TRAINER_CPU_BUDGET_KEY),
+                cache_cv_folds=model_trainer_info.get(MODEL_TRAINER_CACHE_CV_FOLDS_KEY, False),
+                search_cache_dir=search_cache_dir,
+                search_cache_models=model_trainer_info.get(MODEL_TRAINER_SEARCH_CACHE_MODELS_KEY, False),
+                fold_cache_dir=os.path.join(model_trainer_artifact_dir, MODEL_TRAINER_FOLD_CACHE_DIR_NAME)
+            )
+
+            # Logging updated model trainer configuration
+            logging.info(f"model trainer configuration: [{model_trainer_config}]")
+
+            # Returning updated model trainer configuration
+            return model_trainer_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_model_evaluation_configuration(self) -> ModelEvaluationConfig:
+        """
+        artifact
+        - model_evaluation
+            - model_evaluation.yaml ----- (shared by all runs)
+        :return:
+        """
+        try:
+            # Get artifact directory path
+            artifact_dir = self.training_pipeline_config.artifact_dir
+
+            # Get model evaluation config section from configuration
+            model_evaluation_info = self.config_info[MODEL_EVALUATION_CONFIG_KEY]
+
+            # Create model evaluation file path
+            model_evaluation_file_path = os.path.join(
+                artifact_dir,
+                MODEL_EVALUATION_ARTIFACT_DIR,
+                model_evaluation_info[MODEL_EVALUATION_FILE_NAME_KEY]
+            )
+
+            # Get directory of exported (production) models
+            model_export_dir = os.path.join(
+                ROOT_DIR,
+                self.config_info[MODEL_PUSHER_CONFIG_KEY][MODEL_PUSHER_MODEL_EXPORT_DIR_KEY]
+            )
+
+            # Update model evaluation configuration
+            model_evaluation_config = ModelEvaluationConfig(
+                model_evaluation_file_path=model_evaluation_file_path,
+                time_stamp=self.timestamp,
+                model_export_dir=model_export_dir,
+                batch_size=model_evaluation_info.get(MODEL_EVALUATION_BATCH_SIZE_KEY)
+            )
+
+            # Logging updated model evaluation configuration
+            logging.info(f"model evaluation configuration: [{model_evaluation_config}]")
+
+            # Returning updated model evaluation configuration
+            return model_evaluation_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_model_pusher_configuration(self) -> ModelPusherConfig:
+        """
+        saved_models
+        - <current timestamp> ----- published model version
+            - model.pkl
+        - current_version.yaml ----- pointer to served model version
+        :return:
+        """
+        try:
+            # Get directory of exported models
+            model_export_dir = os.path.join(
+                ROOT_DIR,
+                self.config_info[MODEL_PUSHER_CONFIG_KEY][MODEL_PUSHER_MODEL_EXPORT_DIR_KEY]
+            )
+
+            # Create export directory path of this model version
+            time_stamp = f"{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            export_dir_path = os.path.join(model_export_dir, time_stamp)
+
+            # Update model pusher configuration
+            model_pusher_config = ModelPusherConfig(
+                model_export_dir=model_export_dir,
+                export_dir_path=export_dir_path
+            )
+
+            # Logging updated model pusher configuration
+            logging.info(f"model pusher configuration: [{model_pusher_config}]")
+
+            # Returning updated model pusher configuration
+            return model_pusher_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_batch_prediction_configuration(self) -> BatchPredictionConfig:
+        """
+        saved_models
+        - <model version>
+            - model.pkl ----- model of current version scores input files
+        :return:
+        """
+        try:
+            # Get batch prediction config section from configuration
+            batch_prediction_info = self.config_info.get(BATCH_PREDICTION_CONFIG_KEY) or {}
+
+            # Get model file of current model version
+            model_file_path = get_latest_model_path(
+                model_export_dir=os.path.join(
+                    ROOT_DIR,
+                    self.config_info[MODEL_PUSHER_CONFIG_KEY][MODEL_PUSHER_MODEL_EXPORT_DIR_KEY]
+                ),
+                model_file_name=self.config_info[MODEL_TRAINER_CONFIG_KEY][MODEL_TRAINER_TRAINED_MODEL_FILE_NAME_KEY]
+            )
+
+            # Get schema file path
+            data_validation_info = self.config_info[DATA_VALIDATION_CONFIG_KEY]
+            schema_file_path = os.path.join(
+                ROOT_DIR,
+                data_validation_info[DATA_VALIDATION_SCHEMA_DIR_KEY],
+                data_validation_info[DATA_VALIDATION_SCHEMA_FILE_NAME_KEY]
+            )
+
+            # Update batch prediction configuration
+            batch_prediction_config = BatchPredictionConfig(
+                model_file_path=model_file_path,
+                schema_file_path=schema_file_path,
+                chunk_size=batch_prediction_info.get(BATCH_PREDICTION_CHUNK_SIZE_KEY, 50000),
+                max_workers=batch_prediction_info.get(BATCH_PREDICTION_MAX_WORKERS_KEY),
+                prediction_column=batch_prediction_info.get(BATCH_PREDICTION_PREDICTION_COLUMN_KEY, "prediction")
+            )
+
+            # Logging updated batch prediction configuration
+            logging.info(f"batch prediction configuration: [{batch_prediction_config}]")
+
+            # Returning updated batch prediction configuration
+            return batch_prediction_config
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
     def get_training_pipeline_configuration(self) -> TrainingPipelineConfig:
         try:
             # Load training pipeline configuration
@@ -121,8 +483,16 @@ class Configuration:
                 training_pipeline_config[TRAINING_PIPELINE_ARTIFACT_DIR_KEY]
             )
 
-            # Update training pipeline configuration with artifact directory path
-            training_pipeline_config = TrainingPipelineConfig(artifact_dir=artifact_dir)
+            # Create stage cache directory path, stages are not memoized without it
+            stage_cache_dir = training_pipeline_config.get(TRAINING_PIPELINE_STAGE_CACHE_DIR_KEY)
+            if stage_cache_dir:
+                stage_cache_dir = os.path.join(artifact_dir, stage_cache_dir)
+
+            # Update training pipeline configuration with artifact and stage cache directory paths
+            training_pipeline_config = TrainingPipelineConfig(
+                artifact_dir=artifact_dir,
+                stage_cache_dir=stage_cache_dir or None
+            )
 
             # Logging updated training pipeline configuration
             logging.info(f"training pipeline configuration: {training_pipeline_config}")
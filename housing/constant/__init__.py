@@ -24,6 +24,7 @@ CURRENT_TIMESTAMP = get_current_timestamp()
 TRAINING_PIPELINE_CONFIG_KEY = "training_pipeline_config"
 TRAINING_PIPELINE_ARTIFACT_DIR_KEY = "artifact_dir"
 TRAINING_PIPELINE_NAME_KEY = "pipeline_name"
+TRAINING_PIPELINE_STAGE_CACHE_DIR_KEY = "stage_cache_dir"
 
 # Data Ingestion related variable
 DATA_INGESTION_CONFIG_KEY = "data_ingestion_config"
@@ -34,6 +35,42 @@ DATA_INGESTION_TGZ_DOWNLOAD_DIR_KEY = "tgz_download_dir"
 DATA_INGESTION_INGESTED_DIR_NAME_KEY = "ingested_dir"
 DATA_INGESTION_TRAIN_DIR_KEY = "ingested_train_dir"
 DATA_INGESTION_TEST_DIR_KEY = "ingested_test_dir"
+DATA_INGESTION_CHUNK_SIZE_KEY = "chunk_size"
+DATA_INGESTION_DOWNLOAD_CACHE_DIR_KEY = "download_cache_dir"
+DATA_INGESTION_EXTRACT_RAW_DATA_KEY = "extract_raw_data"
+DATA_INGESTION_ARTIFACT_FORMAT_KEY = "artifact_format"
+DATA_INGESTION_WORKERS_KEY = "ingestion_workers"
+DATA_INGESTION_DATA_FILE_EXTENSION = ".csv"
+DATA_INGESTION_INCREMENTAL_KEY = "incremental"
+DATA_INGESTION_ROW_KEY_COLUMNS_KEY = "row_key_columns"
+DATA_INGESTION_ROW_KEYS_FILE_NAME = "row_keys.npy"
+DATA_INGESTION_SPLIT_STATE_FILE_NAME = "split_state.yaml"
+# Hard links of earlier runs' part files, every incremental run is self-contained
+DATA_INGESTION_LINKED_PARTS_DIR_NAME = "linked_parts"
+DATA_INGESTION_SPLIT_LAYOUT_KEY = "split_layout"
+DATA_INGESTION_INDEX_FILE_NAME = "index.npy"
+
+# Ingested split layouts
+SPLIT_LAYOUT_FILES = "files"
+SPLIT_LAYOUT_INDEX = "index"
+
+# Ingested data artifact formats
+ARTIFACT_FORMAT_CSV = "csv"
+ARTIFACT_FORMAT_PARQUET = "parquet"
+ARTIFACT_FORMAT_FEATHER = "feather"
+ARTIFACT_FORMAT_NPY = "npy"
+ARTIFACT_FORMAT_EXTENSIONS = {
+    ARTIFACT_FORMAT_CSV: ".csv",
+    ARTIFACT_FORMAT_PARQUET: ".parquet",
+    ARTIFACT_FORMAT_FEATHER: ".feather",
+    ARTIFACT_FORMAT_NPY: ""
+}
+NPY_COLUMNS_FILE_NAME = "columns.yaml"
+NPY_PARTS_DIR_NAME = "parts"
+# Incremental csv artifacts are lists of csv part files, one part per ingestion run
+CSV_PARTS_FILE_EXTENSION = ".parts"
+DATA_INGESTION_TEST_SIZE = 0.2
+DATA_INGESTION_RANDOM_STATE = 42
 
 # Data Validation related variables
 DATA_VALIDATION_CONFIG_KEY = "data_validation_config"
@@ -42,6 +79,11 @@ DATA_VALIDATION_SCHEMA_DIR_KEY = "schema_dir"
 DATA_VALIDATION_ARTIFACT_DIR_NAME = "data_validation"
 DATA_VALIDATION_REPORT_FILE_NAME_KEY = "report_file_name"
 DATA_VALIDATION_REPORT_PAGE_FILE_NAME_KEY = "report_page_file_name"
+DATA_VALIDATION_DRIFT_SAMPLE_SIZE_KEY = "drift_sample_size"
+DATA_VALIDATION_DRIFT_BINS_KEY = "drift_bins"
+DATA_VALIDATION_DRIFT_THRESHOLD_KEY = "drift_threshold"
+DATA_VALIDATION_FULL_REPORT_KEY = "full_report"
+DATA_VALIDATION_RANDOM_STATE = 42
 
 # Data Transformation related variables
 DATA_TRANSFORMATION_ARTIFACT_DIR = "data_transformation"
@@ -58,6 +100,7 @@ COLUMN_POPULATION = "population"
 COLUMN_HOUSEHOLDS = "households"
 COLUMN_TOTAL_BEDROOM = "total_bedrooms"
 DATASET_SCHEMA_COLUMNS_KEY = "columns"
+DATASET_SCHEMA_DOMAIN_VALUE_KEY = "domain_value"
 
 NUMERICAL_COLUMN_KEY = "numerical_columns"
 CATEGORICAL_COLUMN_KEY = "categorical_columns"
@@ -72,19 +115,74 @@ MODEL_TRAINER_TRAINED_MODEL_FILE_NAME_KEY = "model_file_name"
 MODEL_TRAINER_BASE_ACCURACY_KEY = "base_accuracy"
 MODEL_TRAINER_MODEL_CONFIG_DIR_KEY = "model_config_dir"
 MODEL_TRAINER_MODEL_CONFIG_FILE_NAME_KEY = "model_config_file_name"
+MODEL_TRAINER_CPU_BUDGET_KEY = "cpu_budget"
+MODEL_TRAINER_CACHE_CV_FOLDS_KEY = "cache_cv_folds"
+MODEL_TRAINER_SEARCH_CACHE_DIR_KEY = "search_cache_dir"
+MODEL_TRAINER_SEARCH_CACHE_MODELS_KEY = "search_cache_models"
+MODEL_TRAINER_FOLD_CACHE_DIR_NAME = "cv_folds"
 
 # Model Evaluation related variables
 MODEL_EVALUATION_CONFIG_KEY = "model_evaluation_config"
 MODEL_EVALUATION_FILE_NAME_KEY = "model_evaluation_file_name"
 MODEL_EVALUATION_ARTIFACT_DIR = "model_evaluation"
+MODEL_EVALUATION_BATCH_SIZE_KEY = "batch_size"
+MODEL_EVALUATION_DEFAULT_BATCH_SIZE = 100000
 
 # Model Pusher configuration key
 MODEL_PUSHER_CONFIG_KEY = "model_pusher_config"
 MODEL_PUSHER_MODEL_EXPORT_DIR_KEY = "model_export_dir"
+MODEL_PUSHER_MODEL_RELOAD_INTERVAL_KEY = "model_reload_interval"
+MODEL_PUSHER_CURRENT_VERSION_FILE_NAME = "current_version.yaml"
+MODEL_VERSION_KEY = "model_version"
+
+# Model objects kept in memory by load_model_object, by size on disk
+MODEL_LOAD_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Prediction service related variables
+PREDICTION_CONFIG_KEY = "prediction_config"
+PREDICTION_MAX_BATCH_SIZE_KEY = "max_batch_size"
+PREDICTION_MAX_BATCH_WAIT_MS_KEY = "max_batch_wait_ms"
+PREDICTION_CACHE_MAX_SIZE_KEY = "cache_max_size"
+PREDICTION_CACHE_TTL_SECONDS_KEY = "cache_ttl_seconds"
+PREDICTION_CACHE_FLOAT_DECIMALS_KEY = "cache_float_decimals"
+
+# Batch prediction related variables
+BATCH_PREDICTION_CONFIG_KEY = "batch_prediction_config"
+BATCH_PREDICTION_CHUNK_SIZE_KEY = "chunk_size"
+BATCH_PREDICTION_MAX_WORKERS_KEY = "max_workers"
+BATCH_PREDICTION_PREDICTION_COLUMN_KEY = "prediction_column"
+BATCH_FILE_FORMAT_CSV = ARTIFACT_FORMAT_CSV
+BATCH_FILE_FORMAT_NDJSON = "ndjson"
+BATCH_FILE_FORMAT_PARQUET = ARTIFACT_FORMAT_PARQUET
+BATCH_FILE_FORMAT_EXTENSIONS = {
+    ".csv": BATCH_FILE_FORMAT_CSV,
+    ".ndjson": BATCH_FILE_FORMAT_NDJSON,
+    ".jsonl": BATCH_FILE_FORMAT_NDJSON,
+    ".json": BATCH_FILE_FORMAT_NDJSON,
+    ".parquet": BATCH_FILE_FORMAT_PARQUET
+}
 
 BEST_MODEL_KEY = "best_model"
 HISTORY_KEY = "history"
 MODEL_PATH_KEY = "model_path"
 
 EXPERIMENT_DIR_NAME = "experiment"
-EXPERIMENT_FILE_NAME = "experiment.csv"
+EXPERIMENT_FILE_NAME = "experiment.db"
+EXPERIMENT_LEGACY_FILE_NAME = "experiment.csv"
+
+# Memoized pipeline stages, names of their stage cache directories
+STAGE_DATA_INGESTION = "data_ingestion"
+STAGE_DATA_VALIDATION = "data_validation"
+STAGE_DATA_TRANSFORMATION = "data_transformation"
+STAGE_MODEL_TRAINER = "model_trainer"
+
+# Logging related variables
+LOGGING_CONFIG_KEY = "logging_config"
+LOGGING_ASYNC_KEY = "async_logging"
+LOGGING_QUEUE_SIZE_KEY = "queue_size"
+LOGGING_MAX_BYTES_KEY = "max_bytes"
+LOGGING_BACKUP_COUNT_KEY = "backup_count"
+LOGGING_ROTATE_WHEN_KEY = "rotate_when"
+LOGGING_RECORD_FORMAT_KEY = "record_format"
+LOG_RECORD_FORMAT_TEXT = "text"
+LOG_RECORD_FORMAT_JSON = "json"
@@ -2,7 +2,51 @@
 from collections import namedtuple
 
 # Define data ingestion artifact
+# With "index" split layout train and test file paths are None and the
+# datasets are rows of base table listed in train and test index files
 DataIngestionArtifact = namedtuple(
     'DataIngestionArtifact',
-    ['train_file_path', 'test_file_path', 'is_ingested', 'message']
+    ['train_file_path', 'test_file_path', 'is_ingested', 'message', 'base_file_path',
+     'train_index_file_path', 'test_index_file_path']
+)
+
+# Define data validation artifact
+DataValidationArtifact = namedtuple(
+    'DataValidationArtifact',
+    ['schema_file_path', 'report_file_path', 'report_page_file_path', 'is_validated', 'is_drift_detected',
+     'message']
+)
+
+# Define data transformation artifact
+DataTransformationArtifact = namedtuple(
+    'DataTransformationArtifact',
+    ['is_transformed', 'message', 'transformed_train_file_path', 'transformed_test_file_path',
+     'preprocessed_object_file_path']
+)
+
+# Define model trainer artifact
+ModelTrainerArtifact = namedtuple(
+    'ModelTrainerArtifact',
+    ['is_trained', 'message', 'trained_model_file_path', 'train_rmse', 'test_rmse', 'train_accuracy',
+     'test_accuracy', 'model_accuracy']
+)
+
+# Define model evaluation artifact
+ModelEvaluationArtifact = namedtuple(
+    'ModelEvaluationArtifact',
+    ['is_model_accepted', 'evaluated_model_path', 'accuracy', 'production_model_path',
+     'production_model_accuracy', 'message']
+)
+
+# Define model pusher artifact
+ModelPusherArtifact = namedtuple(
+    'ModelPusherArtifact',
+    ['is_model_pusher', 'export_model_file_path', 'model_version']
+)
+
+
+# Define batch prediction artifact
+BatchPredictionArtifact = namedtuple(
+    'BatchPredictionArtifact',
+    ['input_file_path', 'output_file_path', 'model_file_path', 'row_count', 'chunk_count', 'message']
 )
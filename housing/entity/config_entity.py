@@ -5,7 +5,7 @@ from collections import namedtuple
 # Define training pipline configuration
 TrainingPipelineConfig = namedtuple(
     'TrainingPipelineConfig',
-    ['artifact_dir']
+    ['artifact_dir', 'stage_cache_dir']
 )
 
 
@@ -13,5 +13,50 @@ TrainingPipelineConfig = namedtuple(
 DataIngestionConfig = namedtuple(
     'DataIngestionConfig',
     ['dataset_download_url', 'tgz_download_dir', 'raw_data_dir', 'ingested_train_dir',
-     'ingested_test_dir']
+     'ingested_test_dir', 'chunk_size', 'download_cache_dir', 'extract_raw_data', 'artifact_format',
+     'ingestion_workers', 'incremental', 'row_key_columns', 'split_layout']
+)
+
+
+# Define data validation configuration
+DataValidationConfig = namedtuple(
+    'DataValidationConfig',
+    ['schema_file_path', 'report_file_path', 'report_page_file_path', 'drift_sample_size', 'drift_bins',
+     'drift_threshold', 'full_report']
+)
+
+
+# Define data transformation configuration
+DataTransformationConfig = namedtuple(
+    'DataTransformationConfig',
+    ['add_bedroom_per_room', 'transformed_train_dir', 'transformed_test_dir', 'preprocessed_object_file_path']
+)
+
+
+# Define model trainer configuration
+ModelTrainerConfig = namedtuple(
+    'ModelTrainerConfig',
+    ['trained_model_file_path', 'base_accuracy', 'model_config_file_path', 'cpu_budget',
+     'cache_cv_folds', 'search_cache_dir', 'search_cache_models', 'fold_cache_dir']
+)
+
+
+# Define model evaluation configuration
+ModelEvaluationConfig = namedtuple(
+    'ModelEvaluationConfig',
+    ['model_evaluation_file_path', 'time_stamp', 'model_export_dir', 'batch_size']
+)
+
+
+# Define model pusher configuration
+ModelPusherConfig = namedtuple(
+    'ModelPusherConfig',
+    ['model_export_dir', 'export_dir_path']
+)
+
+
+# Define batch prediction configuration
+BatchPredictionConfig = namedtuple(
+    'BatchPredictionConfig',
+    ['model_file_path', 'schema_file_path', 'chunk_size', 'max_workers', 'prediction_column']
 )
@@ -0,0 +1,170 @@
+# Importing required packages
+import os
+import sys
+import csv
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from housing.exception import HousingException
+
+# Experiment columns with their SQLite types, experiment_id is the primary key
+EXPERIMENT_COLUMNS = {
+    "experiment_id": "TEXT PRIMARY KEY",
+    "initialization_timestamp": "TEXT",
+    "artifact_timestamp": "TEXT",
+    "running_status": "INTEGER",
+    "start_time": "TEXT",
+    "stop_time": "TEXT",
+    "execution_time": "REAL",
+    "message": "TEXT",
+    "experiment_file_path": "TEXT",
+    "accuracy": "REAL",
+    "is_model_accepted": "INTEGER",
+    "created_time_stamp": "TEXT"
+}
+# Indexes by name, filtered history pages are served in start_time order by the composite index
+EXPERIMENT_INDEXES = {
+    "experiment_start_time": "start_time",
+    "experiment_is_model_accepted": "is_model_accepted, start_time"
+}
+
+
+def to_sql_value(value):
+    """
+    datetime as sortable ISO text, timedelta as seconds, bool as 0/1
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+class ExperimentStore:
+    """
+    Experiments of pipeline runs in an embedded SQLite database (WAL mode, so
+    readers never block the writer). Start and end states of a run are upserts
+    of the same row, listing reads one page through the start_time index
+    """
+
+    def __init__(self, db_file_path: str, legacy_csv_file_path: str = None):
+        try:
+            self.db_file_path = db_file_path
+            os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+            with self.connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS experiment "
+                    f"({', '.join(f'{column} {column_type}' for column, column_type in EXPERIMENT_COLUMNS.items())})"
+                )
+                for index_name, index_columns in EXPERIMENT_INDEXES.items():
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON experiment ({index_columns})")
+            if legacy_csv_file_path is not None and os.path.exists(legacy_csv_file_path) \
+                    and self.get_experiment_count() == 0:
+                self.import_csv(legacy_csv_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    @contextmanager
+    def connect(self):
+        """
+        Short lived connection per operation (safe across threads and forked
+        processes), committed on success, rolled back on error, then closed
+        """
+        connection = sqlite3.connect(self.db_file_path, timeout=30)
+        try:
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def save_experiment(self, experiment: dict) -> None:
+        """
+        Insert experiment or update row of same experiment_id, atomically
+        experiment: dict column -> value, columns not given keep their value
+        """
+        try:
+            columns = [column for column in EXPERIMENT_COLUMNS if column in experiment]
+            updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "experiment_id")
+            with self.connect() as connection:
+                connection.execute(
+                    f"INSERT INTO experiment ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT(experiment_id) DO UPDATE SET {updates}",
+                    [to_sql_value(experiment[column]) for column in columns]
+                )
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_experiment(self, experiment_id: str):
+        """
+        return: dict experiment, None when there is none with this id
+        """
+        try:
+            with self.connect() as connection:
+                row = connection.execute("SELECT * FROM experiment WHERE experiment_id = ?",
+                                         (experiment_id,)).fetchone()
+            return None if row is None else dict(row)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_experiments(self, offset: int = 0, limit: int = 50, is_model_accepted: bool = None) -> list:
+        """
+        Page of experiments, latest started first
+        is_model_accepted: only accepted (True) or rejected (False) runs, all when None
+        """
+        try:
+            where, parameters = "", []
+            if is_model_accepted is not None:
+                where, parameters = "WHERE is_model_accepted = ?", [int(is_model_accepted)]
+            with self.connect() as connection:
+                rows = connection.execute(
+                    f"SELECT * FROM experiment {where} ORDER BY start_time DESC LIMIT ? OFFSET ?",
+                    parameters + [limit, offset]
+                ).fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_experiment_count(self, is_model_accepted: bool = None) -> int:
+        try:
+            where, parameters = "", []
+            if is_model_accepted is not None:
+                where, parameters = "WHERE is_model_accepted = ?", [int(is_model_accepted)]
+            with self.connect() as connection:
+                return connection.execute(f"SELECT COUNT(*) FROM experiment {where}", parameters).fetchone()[0]
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def import_csv(self, csv_file_path: str) -> None:
+        """
+        Import experiments of former append-only experiment.csv, later rows
+        (end state) of an experiment overwrite earlier ones (start state)
+        """
+        try:
+            with open(csv_file_path, newline="") as csv_file:
+                for row in csv.DictReader(csv_file):
+                    experiment = {column: (value if value != "" else None) for column, value in row.items()
+                                  if column in EXPERIMENT_COLUMNS}
+                    for column in ("running_status", "is_model_accepted"):
+                        if experiment.get(column) is not None:
+                            experiment[column] = experiment[column] == "True"
+                    if experiment.get("execution_time") is not None:
+                        experiment["execution_time"] = self.parse_duration(experiment["execution_time"])
+                    self.save_experiment(experiment)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    @staticmethod
+    def parse_duration(value: str):
+        # pandas writes timedelta as "0 days 00:00:04.163183"
+        try:
+            days, _, clock = value.partition(" days ")
+            hours, minutes, seconds = clock.split(":")
+            return int(days) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        except ValueError:
+            return None
@@ -0,0 +1,142 @@
+# Importing required packages
+import os
+import sys
+import hashlib
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.model_selection import check_cv
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, write_yaml_file, load_numpy_array_data
+
+# Define fold cache layout
+FOLD_CACHE_INDEX_FILE_NAME = "folds.yaml"
+
+# Rows copied at once while materializing fold matrices
+FOLD_COPY_CHUNK_ROWS = 65536
+
+
+def get_row_ids_key(row_ids: np.ndarray) -> str:
+    """
+    Order sensitive fingerprint of row ids
+    row_ids: np.ndarray
+    """
+    row_ids = np.ascontiguousarray(np.ravel(row_ids), dtype=np.int64)
+    return hashlib.blake2b(row_ids.tobytes(), digest_size=16).hexdigest()
+
+
+def save_rows(source: np.ndarray, row_ids: np.ndarray, file_path: str) -> None:
+    """
+    Write selected rows of source into a new ".npy" file chunk by chunk
+    """
+    output = np.lib.format.open_memmap(file_path, mode="w+", dtype=source.dtype,
+                                       shape=(len(row_ids), source.shape[1]))
+    for start in range(0, len(row_ids), FOLD_COPY_CHUNK_ROWS):
+        output[start:start + FOLD_COPY_CHUNK_ROWS] = source[row_ids[start:start + FOLD_COPY_CHUNK_ROWS]]
+    output.flush()
+    del output
+
+
+class CrossValidationFoldCache:
+    """
+    Train and validation feature matrices of every cross validation fold,
+    materialized once in model trainer's own artifact directory (transformed
+    data may be a memoized artifact of an earlier run and is never written to)
+    and memory-mapped by every fit of every model search
+    cache_dir
+        - <number of folds>
+            - folds.yaml ----- row ids fingerprint -> matrix file
+            - fold_<k>_train.npy
+            - fold_<k>_valid.npy
+    """
+
+    def __init__(self, train_file_path: str, cv: int, cache_dir: str):
+        try:
+            self.train_file_path = train_file_path
+            self.cv = cv
+            self.cache_dir = os.path.join(cache_dir, str(cv))
+            self.index_file_path = os.path.join(self.cache_dir, FOLD_CACHE_INDEX_FILE_NAME)
+            self.splits = []
+            self.matrix_file_names = {}
+            self._matrices = {}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def build(self) -> "CrossValidationFoldCache":
+        """
+        Split rows with the same splitter search would use for integer "cv"
+        and write fold matrices unless cached ones are already in place
+        """
+        try:
+            train_array = load_numpy_array_data(self.train_file_path, mmap_mode="r")
+            row_ids = np.arange(len(train_array))
+            self.splits = list(check_cv(self.cv).split(row_ids.reshape(-1, 1)))
+
+            if os.path.exists(self.index_file_path):
+                self.matrix_file_names = read_yaml_file(self.index_file_path)
+                logging.info(f"reusing cross validation folds from: [{self.cache_dir}]")
+                return self
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            features = train_array[:, :-1]
+            matrix_file_names = {get_row_ids_key(row_ids): None}
+            for fold_number, (train_ids, valid_ids) in enumerate(self.splits):
+                for subset, subset_ids in (("train", train_ids), ("valid", valid_ids)):
+                    file_name = f"fold_{fold_number}_{subset}.npy"
+                    save_rows(features, subset_ids, os.path.join(self.cache_dir, file_name))
+                    matrix_file_names[get_row_ids_key(subset_ids)] = file_name
+
+            # Index is written last, a partially written cache is rebuilt next time
+            write_yaml_file(file_path=self.index_file_path, data=matrix_file_names)
+            self.matrix_file_names = matrix_file_names
+
+            # Logging information to log file
+            logging.info(f"[{self.cv}] cross validation folds saved to: [{self.cache_dir}]")
+            return self
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_matrix(self, row_ids: np.ndarray) -> np.ndarray:
+        """
+        Feature matrix of given rows, memory-mapped when rows are a cached fold
+        (or whole train data), gathered from train data otherwise
+        """
+        key = get_row_ids_key(row_ids)
+        if key not in self._matrices:
+            if key not in self.matrix_file_names:
+                train_array = load_numpy_array_data(self.train_file_path, mmap_mode="r")
+                return train_array[np.ravel(row_ids), :-1]
+            file_name = self.matrix_file_names[key]
+            if file_name is None:
+                self._matrices[key] = load_numpy_array_data(self.train_file_path, mmap_mode="r")[:, :-1]
+            else:
+                self._matrices[key] = load_numpy_array_data(os.path.join(self.cache_dir, file_name),
+                                                            mmap_mode="r")
+        return self._matrices[key]
+
+    def __getstate__(self):
+        # Memory maps are reopened in every worker process
+        state = self.__dict__.copy()
+        state["_matrices"] = {}
+        return state
+
+
+class CachedFoldEstimator(RegressorMixin, BaseEstimator):
+    """
+    Estimator fitted on row ids instead of features, features of the rows
+    are read from fold cache, so search fits share fold matrices instead of
+    copying train data for every candidate and fold.
+    Parameters of wrapped estimator are set as "estimator__<parameter>"
+    """
+
+    def __init__(self, estimator=None, fold_cache: CrossValidationFoldCache = None):
+        self.estimator = estimator
+        self.fold_cache = fold_cache
+
+    def fit(self, X, y, **fit_params):
+        self.estimator_ = clone(self.estimator).fit(self.fold_cache.get_matrix(X), y, **fit_params)
+        return self
+
+    def predict(self, X):
+        return self.estimator_.predict(self.fold_cache.get_matrix(X))
@@ -0,0 +1,167 @@
+# Importing required packages
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import load_model_object, get_current_model_version
+
+
+class ModelNotPublishedError(Exception):
+    """
+    Raised while no model version has been published yet
+    """
+
+
+class ServedModel:
+    """
+    Loaded model version with number of requests currently using it
+    """
+
+    def __init__(self, model_version: str, model_path: str, model):
+        self.model_version = model_version
+        self.model_path = model_path
+        self.model = model
+        self.in_flight = 0
+
+
+class HousingPredictor:
+    """
+    Serve latest published model version, picking up new versions without restart.
+    Background watcher polls the version pointer of model export directory, loads
+    a new version off the request path and swaps it in; requests hold on to the
+    version they started with, retired version is released once they drain
+    """
+
+    def __init__(self, model_dir: str, reload_interval: float = 5):
+        try:
+            self.model_dir = model_dir
+            self.reload_interval = reload_interval
+            self.served_model = None
+            self.retired_models = []
+            self.lock = threading.Lock()
+            self.watcher_pid = None
+            self.pointer_mtime_ns = None
+            self.stop_event = threading.Event()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def ensure_watcher(self) -> None:
+        """
+        Start watcher thread once per process (threads do not survive fork of
+        preloading servers, every worker starts its own)
+        """
+        if self.watcher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.watcher_pid == os.getpid():
+                return
+            self.watcher_pid = os.getpid()
+        self.reload()
+        threading.Thread(target=self.watch, name="model-watcher", daemon=True).start()
+
+    def watch(self) -> None:
+        while not self.stop_event.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep serving current version, try again on next poll
+                logging.error("model reload failed: %s", e)
+
+    def reload(self) -> bool:
+        """
+        Load and swap in current model version when version pointer changed
+        return: bool whether a new version was swapped in
+        """
+        try:
+            pointer_file_path = os.path.join(self.model_dir, MODEL_PUSHER_CURRENT_VERSION_FILE_NAME)
+            if not os.path.exists(pointer_file_path):
+                return False
+            pointer_mtime_ns = os.stat(pointer_file_path).st_mtime_ns
+            if pointer_mtime_ns == self.pointer_mtime_ns:
+                return False
+            self.pointer_mtime_ns = pointer_mtime_ns
+
+            model_version, model_path = get_current_model_version(self.model_dir)
+            served_model = self.served_model
+            if served_model is not None and served_model.model_version == model_version:
+                return False
+
+            # Load outside of lock, requests keep using current version meanwhile
+            logging.info("loading model version [%s] from: [%s]", model_version, model_path)
+            new_served_model = ServedModel(
+                model_version=model_version,
+                model_path=model_path,
+                model=load_model_object(model_path, use_cache=False)
+            )
+
+            with self.lock:
+                retired_model, self.served_model = self.served_model, new_served_model
+                if retired_model is not None:
+                    self.retired_models.append(retired_model)
+                self.release_drained_models()
+
+            # Logging information to log file
+            logging.info("serving model version [%s]", model_version)
+            return True
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def preload(self) -> bool:
+        """
+        Load current model version without starting watcher thread. Preloading
+        servers call it in master before fork, workers then share loaded model
+        pages copy-on-write and their watchers only reload on a new version
+        return: bool whether a model was loaded
+        """
+        return self.reload()
+
+    def release_drained_models(self) -> None:
+        # Called with lock held
+        for retired_model in [model for model in self.retired_models if model.in_flight == 0]:
+            self.retired_models.remove(retired_model)
+            logging.info("released model version [%s]", retired_model.model_version)
+
+    @contextmanager
+    def acquire(self):
+        """
+        Model version to serve one request with, kept alive until request completes
+        """
+        self.ensure_watcher()
+        with self.lock:
+            served_model = self.served_model
+            if served_model is None:
+                raise ModelNotPublishedError(f"no model published in: [{self.model_dir}]")
+            served_model.in_flight += 1
+        try:
+            yield served_model
+        finally:
+            with self.lock:
+                served_model.in_flight -= 1
+                if served_model is not self.served_model:
+                    self.release_drained_models()
+
+    def get_model_version(self):
+        """
+        Version currently served, None before first model is published
+        """
+        self.ensure_watcher()
+        served_model = self.served_model
+        return None if served_model is None else served_model.model_version
+
+    def predict(self, dataframe):
+        with self.acquire() as served_model:
+            return served_model.model.predict(dataframe)
+
+    def get_status(self) -> dict:
+        self.ensure_watcher()
+        with self.lock:
+            served_model = self.served_model
+            return {
+                MODEL_VERSION_KEY: None if served_model is None else served_model.model_version,
+                "in_flight": 0 if served_model is None else served_model.in_flight,
+                "draining_versions": {model.model_version: model.in_flight for model in self.retired_models}
+            }
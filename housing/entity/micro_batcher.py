@@ -0,0 +1,189 @@
+# Importing required packages
+import os
+import sys
+import time
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future
+
+from housing.constant import *
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.entity.housing_predictor import HousingPredictor
+from housing.entity.prediction_cache import PredictionCache
+
+# Payload key of native batch requests
+INSTANCES_KEY = "instances"
+
+
+def get_feature_rows(payload, dataset_schema: dict) -> list:
+    """
+    Validate prediction payload against dataset schema
+    payload: one feature record, list of records or {"instances": [records]}
+    dataset_schema: dict content of schema.yaml
+    return: list of feature tuples, numerical columns followed by categorical columns
+    """
+    if isinstance(payload, dict) and INSTANCES_KEY in payload:
+        payload = payload[INSTANCES_KEY]
+    records = [payload] if isinstance(payload, dict) else payload
+    if not isinstance(records, list) or len(records) == 0:
+        raise ValueError("payload must be a feature record, a list of records or {\"instances\": [records]}")
+
+    numerical_columns = dataset_schema[NUMERICAL_COLUMN_KEY]
+    categorical_columns = dataset_schema[CATEGORICAL_COLUMN_KEY]
+    domain_value = dataset_schema.get(DATASET_SCHEMA_DOMAIN_VALUE_KEY) or {}
+
+    rows = []
+    for position, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"record [{position}] is not an object")
+        missing_columns = [column for column in numerical_columns + categorical_columns if column not in record]
+        if len(missing_columns) > 0:
+            raise ValueError(f"record [{position}] is missing columns: {missing_columns}")
+        row = []
+        for column in numerical_columns:
+            value = record[column]
+            try:
+                row.append(np.nan if value is None else float(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"record [{position}] column: [{column}] is not numeric: [{value}]")
+        for column in categorical_columns:
+            value = record[column]
+            if column in domain_value and value not in domain_value[column]:
+                raise ValueError(f"record [{position}] column: [{column}] value: [{value}] outside domain "
+                                 f"{domain_value[column]}")
+            row.append(value)
+        rows.append(tuple(row))
+    return rows
+
+
+class MicroBatcher:
+    """
+    Merge rows of concurrent prediction requests into one vectorized predict call.
+    Rows wait at most "max_batch_wait_ms" for others to join, a batch is predicted
+    as soon as it reaches "max_batch_size" rows, a request that would overflow it
+    waits for next batch. Requests carrying at least "max_batch_size" rows are
+    already batches and are predicted directly.
+    With prediction cache, only rows missing from cache are predicted
+    """
+
+    def __init__(self, housing_predictor: HousingPredictor, columns: list, max_batch_size: int = 256,
+                 max_batch_wait_ms: float = 5, prediction_cache: PredictionCache = None):
+        try:
+            self.housing_predictor = housing_predictor
+            self.columns = columns
+            self.max_batch_size = max_batch_size
+            self.max_batch_wait = max_batch_wait_ms / 1000
+            self.prediction_cache = prediction_cache
+            self.request_queue = queue.Queue()
+            # Request held over to next batch, it did not fit in current one
+            self.pending_request = None
+            self.batcher_pid = None
+            self.lock = threading.Lock()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def ensure_batcher(self) -> None:
+        """
+        Start batcher thread once per process (threads do not survive fork)
+        """
+        if self.batcher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.batcher_pid == os.getpid():
+                return
+            self.request_queue = queue.Queue()
+            self.pending_request = None
+            threading.Thread(target=self.run, name="micro-batcher", daemon=True).start()
+            self.batcher_pid = os.getpid()
+
+    def predict_rows(self, rows: list) -> tuple:
+        """
+        return: tuple model version, predictions
+        """
+        dataframe = pd.DataFrame.from_records(rows, columns=self.columns)
+        with self.housing_predictor.acquire() as served_model:
+            return served_model.model_version, served_model.model.predict(dataframe)
+
+    def predict(self, rows: list) -> tuple:
+        """
+        Predict validated feature rows, cached predictions of current model
+        version are returned without transforming features or running model
+        return: tuple model version, predictions
+        """
+        if self.prediction_cache is None:
+            return self.predict_batched(rows)
+
+        model_version = self.housing_predictor.get_model_version()
+        keys = [self.prediction_cache.get_key(row) for row in rows]
+        cached_predictions = self.prediction_cache.get_many(keys, model_version)
+        missing = [position for position, prediction in enumerate(cached_predictions) if prediction is None]
+        if len(missing) == 0:
+            return model_version, np.array(cached_predictions)
+
+        predicted_version, predictions = self.predict_batched([rows[position] for position in missing])
+        self.prediction_cache.put_many([keys[position] for position in missing], predictions.tolist(),
+                                       predicted_version)
+        if predicted_version != model_version and len(missing) < len(rows):
+            # Model swapped meanwhile, do not mix predictions of two versions
+            return self.predict_batched(rows)
+
+        for position, prediction in zip(missing, predictions.tolist()):
+            cached_predictions[position] = prediction
+        return predicted_version, np.array(cached_predictions)
+
+    def predict_batched(self, rows: list) -> tuple:
+        """
+        Predict validated feature rows, blocking until their batch is predicted
+        return: tuple model version, predictions
+        """
+        if len(rows) >= self.max_batch_size:
+            return self.predict_rows(rows)
+        self.ensure_batcher()
+        future = Future()
+        self.request_queue.put((rows, future))
+        return future.result()
+
+    def collect_batch(self) -> list:
+        """
+        Wait for first request, then collect more until batch is full or wait time is over,
+        batch never exceeds "max_batch_size" rows
+        """
+        if self.pending_request is not None:
+            batch, self.pending_request = [self.pending_request], None
+        else:
+            batch = [self.request_queue.get()]
+        row_count = len(batch[0][0])
+        deadline = time.monotonic() + self.max_batch_wait
+        while row_count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.request_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if row_count + len(request[0]) > self.max_batch_size:
+                self.pending_request = request
+                break
+            batch.append(request)
+            row_count += len(request[0])
+        return batch
+
+    def run(self) -> None:
+        while True:
+            batch = self.collect_batch()
+            try:
+                rows = [row for request_rows, _ in batch for row in request_rows]
+                model_version, predictions = self.predict_rows(rows)
+                offset = 0
+                for request_rows, future in batch:
+                    future.set_result((model_version, predictions[offset:offset + len(request_rows)]))
+                    offset += len(request_rows)
+            except Exception as e:
+                logging.error("batch prediction failed: %s", e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
@@ -0,0 +1,534 @@
+# Importing required packages
+import os
+import sys
+import inspect
+import importlib
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.metrics import r2_score, mean_squared_error
+from sklearn.model_selection import GridSearchCV, ParameterGrid, ParameterSampler
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, load_numpy_array_data
+from housing.entity.fold_cache import CrossValidationFoldCache, CachedFoldEstimator
+from housing.entity.search_cache import SearchResultCache, get_fingerprint, get_data_fingerprint, \
+    get_estimator_fingerprint
+
+# Define model.yaml keys
+GRID_SEARCH_KEY = 'grid_search'
+MODULE_KEY = 'module'
+CLASS_KEY = 'class'
+PARAM_KEY = 'params'
+MODEL_SELECTION_KEY = 'model_selection'
+SEARCH_PARAM_GRID_KEY = 'search_param_grid'
+
+# Search classes which have to be enabled explicitly before import
+EXPERIMENTAL_SEARCH_MODULES = {
+    'HalvingGridSearchCV': 'sklearn.experimental.enable_halving_search_cv',
+    'HalvingRandomSearchCV': 'sklearn.experimental.enable_halving_search_cv'
+}
+
+# Search parameters of successive halving
+RESOURCE_KEY = 'resource'
+MAX_RESOURCES_KEY = 'max_resources'
+MIN_RESOURCES_KEY = 'min_resources'
+N_CANDIDATES_KEY = 'n_candidates'
+DEFAULT_RESOURCE = 'n_samples'
+
+# Number of folds when "cv" is not set
+DEFAULT_CV_FOLDS = 5
+
+# Prefix of wrapped estimator parameters
+WRAPPED_ESTIMATOR_PREFIX = 'estimator__'
+
+# Define initialized model detail
+InitializedModelDetail = namedtuple(
+    'InitializedModelDetail',
+    ['model_serial_number', 'model', 'param_grid_search', 'model_name']
+)
+
+# Define grid searched best model
+GridSearchedBestModel = namedtuple(
+    'GridSearchedBestModel',
+    ['model_serial_number', 'model', 'best_model', 'best_parameters', 'best_score']
+)
+
+# Define CPU allocation of one model search
+CpuAllocation = namedtuple(
+    'CpuAllocation',
+    ['search_n_jobs', 'estimator_n_jobs']
+)
+
+# Define metric info artifact
+MetricInfoArtifact = namedtuple(
+    'MetricInfoArtifact',
+    ['model_name', 'model_object', 'train_rmse', 'test_rmse', 'train_accuracy', 'test_accuracy',
+     'model_accuracy', 'index_number']
+)
+
+
+def class_for_name(module_name: str, class_name: str):
+    """
+    Return class reference from module and class name
+    """
+    try:
+        module = importlib.import_module(module_name)
+        logging.info(f"executing command: from {module_name} import {class_name}")
+        return getattr(module, class_name)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_search_class(grid_search_config: dict):
+    """
+    Return search class of "grid_search" block, any scikit-learn style search
+    (GridSearchCV, RandomizedSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV, ...)
+    """
+    try:
+        experimental_module = EXPERIMENTAL_SEARCH_MODULES.get(grid_search_config[CLASS_KEY])
+        if experimental_module is not None:
+            importlib.import_module(experimental_module)
+        return class_for_name(grid_search_config[MODULE_KEY], grid_search_config[CLASS_KEY])
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_search_object(grid_search_config: dict, model, param_grid: dict, n_jobs: int,
+                      fold_cache: CrossValidationFoldCache = None):
+    """
+    Build search object for model, parameter grid is passed as "param_grid" or
+    "param_distributions" depending on search class.
+    For successive halving over a resource other than rows (e.g. "n_estimators"),
+    resource is taken out of parameter grid and its largest grid value (or
+    model's own value) becomes "max_resources"; models without such parameter
+    are halved over rows instead.
+    Randomized halving samples the whole (finite) grid unless "n_candidates" is
+    set, so that its last round is fitted on full resources.
+    With fold cache, model is wrapped to be fitted on row ids of cached folds
+    """
+    try:
+        search_class = get_search_class(grid_search_config)
+        search_arguments = inspect.signature(search_class).parameters
+        search_params = dict(grid_search_config.get(PARAM_KEY) or {})
+        param_grid = dict(param_grid)
+
+        resource = search_params.get(RESOURCE_KEY, DEFAULT_RESOURCE)
+        if resource != DEFAULT_RESOURCE:
+            if resource not in model.get_params():
+                logging.info(f"model: [{type(model).__name__}] has no parameter: [{resource}], "
+                             f"halving over [{DEFAULT_RESOURCE}] instead")
+                search_params[RESOURCE_KEY] = DEFAULT_RESOURCE
+                search_params.pop(MAX_RESOURCES_KEY, None)
+                search_params.pop(MIN_RESOURCES_KEY, None)
+            else:
+                resource_values = param_grid.pop(resource, [model.get_params()[resource]])
+                if not isinstance(search_params.get(MAX_RESOURCES_KEY), int):
+                    search_params[MAX_RESOURCES_KEY] = int(max(resource_values))
+
+        if N_CANDIDATES_KEY in search_arguments and not isinstance(search_params.get(N_CANDIDATES_KEY), int):
+            search_params[N_CANDIDATES_KEY] = get_grid_size(param_grid)
+            search_params.setdefault(MIN_RESOURCES_KEY, 'exhaust')
+
+        if fold_cache is not None:
+            model = CachedFoldEstimator(estimator=model, fold_cache=fold_cache)
+            param_grid = {f"{WRAPPED_ESTIMATOR_PREFIX}{name}": values for name, values in param_grid.items()}
+            if search_params.get(RESOURCE_KEY, DEFAULT_RESOURCE) != DEFAULT_RESOURCE:
+                search_params[RESOURCE_KEY] = f"{WRAPPED_ESTIMATOR_PREFIX}{search_params[RESOURCE_KEY]}"
+            search_params["cv"] = fold_cache.splits
+
+        param_argument = 'param_grid' if 'param_grid' in search_arguments else 'param_distributions'
+        return search_class(estimator=model, n_jobs=n_jobs, **{param_argument: param_grid}, **search_params)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_grid_size(param_grid: dict) -> int:
+    """
+    Number of parameter combinations in grid
+    """
+    return int(np.prod([len(values) for values in param_grid.values()])) if param_grid else 1
+
+
+def get_search_candidates(grid_search_config: dict, param_grid: dict):
+    """
+    Parameter combinations an exhaustive or randomized search would evaluate,
+    in its order, None for searches which can not be split into independent
+    combinations (successive halving scores depend on rounds)
+    """
+    try:
+        search_class = get_search_class(grid_search_config)
+        search_arguments = inspect.signature(search_class).parameters
+        search_params = grid_search_config.get(PARAM_KEY) or {}
+        if "factor" in search_arguments:
+            return None
+        if "param_grid" in search_arguments:
+            return list(ParameterGrid(param_grid))
+        return list(ParameterSampler(param_grid, n_iter=search_params.get("n_iter", 10),
+                                     random_state=search_params.get("random_state")))
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def run_memoized_search(initialized_model: InitializedModelDetail, grid_search_config: dict, candidates: list,
+                        train_array: np.ndarray, cpu_allocation: CpuAllocation, search_cache: SearchResultCache,
+                        data_fingerprint: str, fold_cache: CrossValidationFoldCache = None) -> GridSearchedBestModel:
+    """
+    Cross validate only parameter combinations missing from search cache,
+    then refit best combination on whole train data (or reuse cached refit)
+    """
+    try:
+        model = initialized_model.model
+        search_params = grid_search_config.get(PARAM_KEY) or {}
+        cv = search_params.get("cv", DEFAULT_CV_FOLDS)
+        estimator_fingerprint = get_estimator_fingerprint(model)
+        cv_fingerprint = get_fingerprint(cv, search_params.get("scoring"))
+        score_keys = [get_fingerprint(data_fingerprint, estimator_fingerprint, candidate, cv_fingerprint)
+                      for candidate in candidates]
+        scores = [search_cache.get_score(score_key) for score_key in score_keys]
+        missing = [position for position, score in enumerate(scores) if score is None]
+
+        # Logging information to log file
+        logging.info(f"model: [{initialized_model.model_serial_number}] [{len(candidates) - len(missing)}] "
+                     f"parameter combinations found in search cache, fitting [{len(missing)}]")
+
+        if len(missing) > 0:
+            search_model, input_feature, prefix = model, train_array[:, :-1], ""
+            if fold_cache is not None:
+                search_model = CachedFoldEstimator(estimator=model, fold_cache=fold_cache)
+                input_feature, prefix, cv = np.arange(len(train_array)).reshape(-1, 1), WRAPPED_ESTIMATOR_PREFIX, \
+                    fold_cache.splits
+            grid_search_cv = GridSearchCV(
+                estimator=search_model,
+                param_grid=[{f"{prefix}{name}": [value] for name, value in candidates[position].items()}
+                            for position in missing],
+                scoring=search_params.get("scoring"),
+                cv=cv,
+                n_jobs=cpu_allocation.search_n_jobs,
+                refit=False,
+                verbose=search_params.get("verbose", 0),
+                error_score=search_params.get("error_score", np.nan)
+            )
+            grid_search_cv.fit(input_feature, train_array[:, -1])
+
+            split_count = grid_search_cv.n_splits_
+            for result_position, position in enumerate(missing):
+                scores[position] = {
+                    "params": candidates[position],
+                    "mean_test_score": float(grid_search_cv.cv_results_["mean_test_score"][result_position]),
+                    "split_test_scores": [float(grid_search_cv.cv_results_[f"split{split}_test_score"][result_position])
+                                          for split in range(split_count)]
+                }
+                search_cache.save_score(score_keys[position], scores[position])
+
+        # Best combination, first one on ties as in scikit-learn searches
+        mean_test_scores = np.array([score["mean_test_score"] for score in scores], dtype=np.float64)
+        best_position = int(np.nanargmax(mean_test_scores))
+        best_parameters = candidates[best_position]
+
+        model_key = get_fingerprint(data_fingerprint, estimator_fingerprint, best_parameters)
+        best_model = search_cache.get_model(model_key)
+        if best_model is None:
+            best_model = clone(model).set_params(**best_parameters).fit(train_array[:, :-1], train_array[:, -1])
+            search_cache.save_model(model_key, best_model)
+        else:
+            logging.info(f"model: [{initialized_model.model_serial_number}] refitted model found in search cache")
+
+        return GridSearchedBestModel(
+            model_serial_number=initialized_model.model_serial_number,
+            model=initialized_model.model,
+            best_model=best_model,
+            best_parameters=best_parameters,
+            best_score=float(mean_test_scores[best_position])
+        )
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def run_grid_search(initialized_model: InitializedModelDetail, grid_search_config: dict, train_file_path: str,
+                    cpu_allocation: CpuAllocation, fold_cache: CrossValidationFoldCache = None,
+                    search_cache: SearchResultCache = None, data_fingerprint: str = None) -> GridSearchedBestModel:
+    """
+    Run search of one model in its own process, reading training array
+    memory-mapped so every search process shares the same pages.
+    With fold cache, search splits row ids and fits read cached fold matrices.
+    With search cache, exhaustive and randomized searches fit only parameter
+    combinations not evaluated before on the same data
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+
+        # Feature columns followed by target column
+        train_array = load_numpy_array_data(train_file_path, mmap_mode="r")
+        input_feature, target_feature = train_array[:, :-1], train_array[:, -1]
+
+        # Give estimator its share of cores, cap native thread pools to the same share
+        model = initialized_model.model
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=cpu_allocation.estimator_n_jobs)
+
+        candidates = None
+        if search_cache is not None:
+            candidates = get_search_candidates(grid_search_config, initialized_model.param_grid_search)
+        if candidates is not None:
+            logging.info(f"{'>>' * 15} training {type(model).__name__} started with {cpu_allocation} {'<<' * 15}")
+            with threadpool_limits(limits=cpu_allocation.estimator_n_jobs):
+                grid_searched_best_model = run_memoized_search(
+                    initialized_model=initialized_model,
+                    grid_search_config=grid_search_config,
+                    candidates=candidates,
+                    train_array=train_array,
+                    cpu_allocation=cpu_allocation,
+                    search_cache=search_cache,
+                    data_fingerprint=data_fingerprint,
+                    fold_cache=fold_cache
+                )
+            logging.info(f"{'>>' * 15} training {type(model).__name__} completed {'<<' * 15}")
+            return grid_searched_best_model
+
+        grid_search_cv = get_search_object(
+            grid_search_config=grid_search_config,
+            model=model,
+            param_grid=initialized_model.param_grid_search,
+            n_jobs=cpu_allocation.search_n_jobs,
+            fold_cache=fold_cache
+        )
+        if fold_cache is not None:
+            input_feature = np.arange(len(train_array)).reshape(-1, 1)
+
+        logging.info(f"{'>>' * 15} training {type(model).__name__} started with {cpu_allocation} {'<<' * 15}")
+        with threadpool_limits(limits=cpu_allocation.estimator_n_jobs):
+            grid_search_cv.fit(input_feature, target_feature)
+        logging.info(f"{'>>' * 15} training {type(model).__name__} completed {'<<' * 15}")
+
+        best_model, best_parameters = grid_search_cv.best_estimator_, grid_search_cv.best_params_
+        if fold_cache is not None:
+            best_model = best_model.estimator_
+            best_parameters = {name[len(WRAPPED_ESTIMATOR_PREFIX):]: value for name, value in best_parameters.items()}
+
+        return GridSearchedBestModel(
+            model_serial_number=initialized_model.model_serial_number,
+            model=initialized_model.model,
+            best_model=best_model,
+            best_parameters=best_parameters,
+            best_score=grid_search_cv.best_score_
+        )
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def evaluate_regression_model(model_list: list, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray,
+                              y_test: np.ndarray, base_accuracy: float = 0.6) -> MetricInfoArtifact:
+    """
+    Return metrics of first model (models are expected best first) whose test r2 score
+    reaches base accuracy, None when no model does
+    """
+    try:
+        for index_number, model in enumerate(model_list):
+            model_name = str(model)
+            logging.info(f"{'>>' * 15} started evaluating model: [{type(model).__name__}] {'<<' * 15}")
+
+            # Getting prediction for training and testing dataset
+            y_train_pred = model.predict(X_train)
+            y_test_pred = model.predict(X_test)
+
+            # Calculating r squared score on training and testing dataset
+            train_acc = r2_score(y_train, y_train_pred)
+            test_acc = r2_score(y_test, y_test_pred)
+
+            # Calculating mean squared error on training and testing dataset
+            train_rmse = np.sqrt(mean_squared_error(y_train, y_train_pred))
+            test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
+
+            # Calculating harmonic mean of train_accuracy and test_accuracy
+            model_accuracy = (2 * (train_acc * test_acc)) / (train_acc + test_acc)
+
+            # Logging information to log file
+            logging.info(f"model: [{model_name}] train r2: [{train_acc}] test r2: [{test_acc}] "
+                         f"train rmse: [{train_rmse}] test rmse: [{test_rmse}]")
+
+            if test_acc >= base_accuracy:
+                return MetricInfoArtifact(
+                    model_name=model_name,
+                    model_object=model,
+                    train_rmse=train_rmse,
+                    test_rmse=test_rmse,
+                    train_accuracy=train_acc,
+                    test_accuracy=test_acc,
+                    model_accuracy=model_accuracy,
+                    index_number=index_number
+                )
+        logging.info("no model found with test accuracy higher than base accuracy")
+        return None
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+class ModelFactory:
+
+    def __init__(self, model_config_path: str = None, cpu_budget: int = None, cache_cv_folds: bool = False,
+                 search_cache_dir: str = None, search_cache_models: bool = False, fold_cache_dir: str = None):
+        try:
+            self.config: dict = read_yaml_file(model_config_path)
+            self.grid_search_config: dict = self.config[GRID_SEARCH_KEY]
+            self.models_initialization_config: dict = dict(self.config[MODEL_SELECTION_KEY])
+            self.cpu_budget = cpu_budget or os.cpu_count()
+            self.cache_cv_folds = cache_cv_folds and fold_cache_dir is not None
+            self.fold_cache_dir = fold_cache_dir
+            self.search_cache = SearchResultCache(search_cache_dir, store_models=search_cache_models) \
+                if search_cache_dir else None
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_initialized_model_list(self) -> list:
+        """
+        Return list of model details, one per "model_selection" entry
+        """
+        try:
+            initialized_model_list = []
+            for model_serial_number, model_initialization_config in self.models_initialization_config.items():
+                model_obj_ref = class_for_name(
+                    module_name=model_initialization_config[MODULE_KEY],
+                    class_name=model_initialization_config[CLASS_KEY]
+                )
+                model = model_obj_ref(**(model_initialization_config.get(PARAM_KEY) or {}))
+                initialized_model_list.append(InitializedModelDetail(
+                    model_serial_number=model_serial_number,
+                    model=model,
+                    param_grid_search=model_initialization_config[SEARCH_PARAM_GRID_KEY],
+                    model_name=f"{model_initialization_config[MODULE_KEY]}.{model_initialization_config[CLASS_KEY]}"
+                ))
+            return initialized_model_list
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_cv_folds(self):
+        """
+        Number of folds of "cv" search parameter, None when "cv" is a splitter object
+        """
+        cv = (self.grid_search_config.get(PARAM_KEY) or {}).get("cv", DEFAULT_CV_FOLDS)
+        return cv if isinstance(cv, int) else None
+
+    def get_fit_count(self, initialized_model: InitializedModelDetail) -> int:
+        """
+        Number of fits of a model search (of its first round for successive halving):
+        number of sampled or grid candidates times number of folds
+        """
+        search_params = self.grid_search_config.get(PARAM_KEY) or {}
+        cv = self.get_cv_folds() or DEFAULT_CV_FOLDS
+        candidate_count = get_grid_size(initialized_model.param_grid_search)
+        for sample_size_key in ("n_iter", "n_candidates"):
+            if isinstance(search_params.get(sample_size_key), int):
+                candidate_count = min(candidate_count, search_params[sample_size_key])
+        return candidate_count * cv
+
+    def get_search_cost(self, initialized_model: InitializedModelDetail) -> float:
+        """
+        Rough relative cost of a model search: number of fits, times mean number
+        of estimators for ensembles
+        """
+        cost = self.get_fit_count(initialized_model)
+        model_params = initialized_model.model.get_params()
+        if "n_estimators" in model_params:
+            n_estimators = initialized_model.param_grid_search.get("n_estimators", [model_params["n_estimators"]])
+            cost *= float(np.mean(n_estimators))
+        return cost
+
+    def get_cpu_allocation(self, initialized_model_list: list) -> list:
+        """
+        Split CPU budget between model searches in proportion to their cost, then
+        split each search's share between its parallel fits (search n_jobs) and
+        estimator's own parallelism (estimator n_jobs), so that the sum over all
+        concurrent searches stays within budget
+        """
+        try:
+            costs = np.array([self.get_search_cost(initialized_model) for initialized_model in initialized_model_list])
+            budget = self.cpu_budget
+
+            # At least one core per search, more than budget searches simply queue for cores
+            shares = np.maximum(1, np.floor(budget * costs / costs.sum())).astype(int)
+            while shares.sum() > budget and shares.max() > 1:
+                shares[np.argmax(shares)] -= 1
+            while shares.sum() < budget:
+                shares[np.argmax(costs / shares)] += 1
+
+            cpu_allocations = []
+            for initialized_model, share in zip(initialized_model_list, shares):
+                # Fits first, they parallelize better than a single estimator, spare cores go to estimator
+                search_n_jobs = int(min(share, self.get_fit_count(initialized_model)))
+                estimator_n_jobs = int(share // search_n_jobs) if "n_jobs" in initialized_model.model.get_params() else 1
+                cpu_allocations.append(CpuAllocation(search_n_jobs=search_n_jobs, estimator_n_jobs=estimator_n_jobs))
+            return cpu_allocations
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def initiate_best_parameter_search_for_initialized_models(self, initialized_model_list: list,
+                                                              train_file_path: str,
+                                                              fold_cache: CrossValidationFoldCache = None,
+                                                              data_fingerprint: str = None) -> list:
+        """
+        Run searches of all models concurrently, each in its own process
+        """
+        try:
+            cpu_allocations = self.get_cpu_allocation(initialized_model_list)
+            max_workers = min(len(initialized_model_list), self.cpu_budget)
+
+            # Logging information to log file
+            logging.info(f"running [{len(initialized_model_list)}] model searches with cpu budget "
+                         f"[{self.cpu_budget}]: {cpu_allocations}")
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(run_grid_search, initialized_model, self.grid_search_config, train_file_path,
+                                    cpu_allocation, fold_cache, self.search_cache, data_fingerprint)
+                    for initialized_model, cpu_allocation in zip(initialized_model_list, cpu_allocations)
+                ]
+                return [future.result() for future in futures]
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_best_model(self, train_file_path: str, base_accuracy: float = 0.6) -> list:
+        """
+        Return grid searched models sorted by cross validation score, best first,
+        keeping only models reaching base accuracy
+        """
+        try:
+            initialized_model_list = self.get_initialized_model_list()
+
+            # Materialize cross validation folds once for all model searches
+            fold_cache = None
+            if self.cache_cv_folds and self.get_cv_folds() is not None:
+                fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=self.get_cv_folds(),
+                                                      cache_dir=self.fold_cache_dir).build()
+
+            # Search results are reused only for the same train data
+            data_fingerprint = None
+            if self.search_cache is not None:
+                data_fingerprint = get_data_fingerprint(train_file_path)
+
+            grid_searched_best_model_list = self.initiate_best_parameter_search_for_initialized_models(
+                initialized_model_list=initialized_model_list,
+                train_file_path=train_file_path,
+                fold_cache=fold_cache,
+                data_fingerprint=data_fingerprint
+            )
+            grid_searched_best_model_list = sorted(
+                grid_searched_best_model_list,
+                key=lambda grid_searched_best_model: grid_searched_best_model.best_score,
+                reverse=True
+            )
+            for grid_searched_best_model in grid_searched_best_model_list:
+                logging.info(f"model: [{grid_searched_best_model.model_serial_number}] "
+                             f"best parameters: [{grid_searched_best_model.best_parameters}] "
+                             f"cv score: [{grid_searched_best_model.best_score}]")
+
+            accepted_model_list = [grid_searched_best_model for grid_searched_best_model in grid_searched_best_model_list
+                                   if grid_searched_best_model.best_score >= base_accuracy]
+            if len(accepted_model_list) == 0:
+                raise Exception(f"none of the models has cross validation score higher than base accuracy: "
+                                f"[{base_accuracy}]")
+            return accepted_model_list
+        except Exception as e:
+            raise HousingException(e, sys) from e
@@ -0,0 +1,95 @@
+# Importing required packages
+import sys
+import math
+import time
+import threading
+from collections import OrderedDict
+
+from housing.exception import HousingException
+
+
+class PredictionCache:
+    """
+    In-process LRU cache of predictions keyed by validated feature row.
+    Numerical features are rounded to "float_decimals" decimals (None keeps
+    them exact), entries expire after "ttl_seconds" and the whole cache is
+    dropped when served model version changes
+    """
+
+    def __init__(self, max_size: int = 100000, ttl_seconds: float = 300, float_decimals: int = None):
+        try:
+            self.max_size = max_size
+            self.ttl_seconds = ttl_seconds
+            self.float_decimals = float_decimals
+            self.entries = OrderedDict()
+            self.model_version = None
+            self.lock = threading.Lock()
+            self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_key(self, row: tuple) -> tuple:
+        """
+        Normalized feature row, NaN as None so that missing values compare equal
+        """
+        key = []
+        for value in row:
+            if isinstance(value, float):
+                if math.isnan(value):
+                    value = None
+                elif self.float_decimals is not None:
+                    value = round(value, self.float_decimals)
+            key.append(value)
+        return tuple(key)
+
+    def check_model_version(self, model_version: str) -> None:
+        # Called with lock held
+        if model_version != self.model_version:
+            if len(self.entries) > 0:
+                self.counters["invalidations"] += 1
+            self.entries.clear()
+            self.model_version = model_version
+
+    def get_many(self, keys: list, model_version: str) -> list:
+        """
+        return: list cached prediction per key, None on miss
+        """
+        now = time.monotonic()
+        values = []
+        with self.lock:
+            self.check_model_version(model_version)
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is not None and entry[1] < now:
+                    del self.entries[key]
+                    self.counters["expirations"] += 1
+                    entry = None
+                if entry is None:
+                    self.counters["misses"] += 1
+                    values.append(None)
+                else:
+                    self.entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    values.append(entry[0])
+        return values
+
+    def put_many(self, keys: list, values, model_version: str) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self.lock:
+            self.check_model_version(model_version)
+            for key, value in zip(keys, values):
+                self.entries[key] = (value, expires_at)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "size": len(self.entries),
+                "hit_rate": self.counters["hits"] / lookups if lookups > 0 else 0.0,
+                "model_version": self.model_version
+            }
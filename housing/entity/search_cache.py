@@ -0,0 +1,132 @@
+# Importing required packages
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.util import read_yaml_file, write_yaml_file, load_numpy_array_data, save_model_object, \
+    load_model_object
+
+# Define search cache layout
+SEARCH_CACHE_SCORES_DIR_NAME = "scores"
+SEARCH_CACHE_MODELS_DIR_NAME = "models"
+
+# Estimator parameters which do not change fitted model
+IGNORED_ESTIMATOR_PARAMS = ("n_jobs", "verbose")
+
+# Rows hashed at once while fingerprinting data
+FINGERPRINT_CHUNK_ROWS = 65536
+
+
+def get_fingerprint(*values) -> str:
+    """
+    Stable fingerprint of json serializable values (other objects by their repr)
+    """
+    content = json.dumps(values, sort_keys=True, default=repr)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def get_data_fingerprint(file_path: str) -> str:
+    """
+    Fingerprint of ".npy" array content, shape and dtype
+    file_path: str
+    """
+    try:
+        array = load_numpy_array_data(file_path, mmap_mode="r")
+        data_hash = hashlib.blake2b(f"{array.shape}{array.dtype}".encode(), digest_size=16)
+        for start in range(0, len(array), FINGERPRINT_CHUNK_ROWS):
+            data_hash.update(np.ascontiguousarray(array[start:start + FINGERPRINT_CHUNK_ROWS]).tobytes())
+        return data_hash.hexdigest()
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_estimator_fingerprint(model) -> str:
+    """
+    Fingerprint of estimator class and its parameters, nested estimators (also
+    in lists such as pipeline steps) by their class only, their parameters are
+    part of deep parameters already
+    """
+    def get_value(value):
+        if hasattr(value, "get_params"):
+            return f"{type(value).__module__}.{type(value).__name__}"
+        if isinstance(value, (list, tuple)):
+            return [get_value(item) for item in value]
+        return value
+
+    model_params = {name: get_value(value) for name, value in model.get_params(deep=True).items()
+                    if name.split("__")[-1] not in IGNORED_ESTIMATOR_PARAMS}
+    return get_fingerprint(f"{type(model).__module__}.{type(model).__name__}", model_params)
+
+
+class SearchResultCache:
+    """
+    Persistent cache of cross validation scores of single parameter combinations,
+    and optionally of models refitted on whole train data, shared across runs
+    cache_dir
+        - scores
+            - <data, estimator, parameters and cv fingerprint>.yaml
+        - models
+            - <data, estimator and parameters fingerprint>.pkl
+    Every entry is its own file written atomically, so concurrent searches
+    never lock each other
+    """
+
+    def __init__(self, cache_dir: str, store_models: bool = False):
+        try:
+            self.cache_dir = cache_dir
+            self.store_models = store_models
+            self.scores_dir = os.path.join(cache_dir, SEARCH_CACHE_SCORES_DIR_NAME)
+            self.models_dir = os.path.join(cache_dir, SEARCH_CACHE_MODELS_DIR_NAME)
+            os.makedirs(self.scores_dir, exist_ok=True)
+            os.makedirs(self.models_dir, exist_ok=True)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_score(self, key: str):
+        """
+        Cached score entry ("mean_test_score" and "split_test_scores"), None on miss
+        """
+        try:
+            score_file_path = os.path.join(self.scores_dir, f"{key}.yaml")
+            if not os.path.exists(score_file_path):
+                return None
+            return read_yaml_file(score_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def save_score(self, key: str, entry: dict) -> None:
+        try:
+            score_file_path = os.path.join(self.scores_dir, f"{key}.yaml")
+            temp_score_file_path = f"{score_file_path}.{os.getpid()}.tmp"
+            write_yaml_file(file_path=temp_score_file_path, data=entry)
+            os.replace(temp_score_file_path, score_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_model(self, key: str):
+        """
+        Cached refitted model, None on miss or when models are not stored
+        """
+        try:
+            model_file_path = os.path.join(self.models_dir, f"{key}.pkl")
+            if not self.store_models or not os.path.exists(model_file_path):
+                return None
+            return load_model_object(model_file_path, mmap_mode=None, use_cache=False)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def save_model(self, key: str, model) -> None:
+        try:
+            if not self.store_models:
+                return
+            model_file_path = os.path.join(self.models_dir, f"{key}.pkl")
+            save_model_object(file_path=model_file_path, obj=model)
+
+            # Logging information to log file
+            logging.info(f"refitted model cached at: [{model_file_path}]")
+        except Exception as e:
+            raise HousingException(e, sys) from e
@@ -5,7 +5,7 @@ import sys
 # Define housing exception custom class
 class HousingException(Exception):
 
-    def __int__(self, error_message: Exception, error_detail: sys) -> None:
+    def __init__(self, error_message: Exception, error_detail: sys) -> None:
         super().__init__(error_message)
         self.error_message = HousingException.get_msg_details(error_message, error_detail)
 
@@ -28,4 +28,4 @@ class HousingException(Exception):
         return self.error_message
 
     def __repr__(self) -> str:
-        return HousingException.__name__.str()
\ No newline at end of file
+        return HousingException.__name__
\ No newline at end of file
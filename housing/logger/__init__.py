@@ -1,44 +1,267 @@
 # Importing required packages
 import os
+import json
+import yaml
+import queue
+import pickle
+import atexit
+import socket
 import logging
-import pandas as pd
+import threading
+import logging.handlers
+import multiprocessing.util
 
-from housing.constant import get_current_timestamp
+from housing.constant import get_current_timestamp, CONFIG_FILE_PATH, LOGGING_CONFIG_KEY, LOGGING_ASYNC_KEY, \
+    LOGGING_QUEUE_SIZE_KEY, LOGGING_MAX_BYTES_KEY, LOGGING_BACKUP_COUNT_KEY, LOGGING_ROTATE_WHEN_KEY, \
+    LOGGING_RECORD_FORMAT_KEY, LOG_RECORD_FORMAT_JSON
 
 # Define logging directory
 APP_LOG_DIR = 'app_logs'
 
+# Define text record format, fields separated by "^;"
+LOG_RECORD_FORMAT = '[%(asctime)s]^;%(levelname)s^;%(lineno)d^;%(filename)s^;%(funcName)s()^;%(message)s'
+
+# Largest record forwarded by forked processes, seconds a forwarding writer waits for parent
+LOG_DATAGRAM_MAX_SIZE = 256 * 1024
+LOG_FORWARD_TIMEOUT = 5
+
 
 # Function to return log file name
 def get_log_file_name():
     return f"log_{get_current_timestamp()}.log"
 
 
+# Function to return logging configuration
+def get_logging_config() -> dict:
+    """
+    logging_config section of config.yaml, empty (defaults) when there is none
+    """
+    try:
+        with open(CONFIG_FILE_PATH) as config_file:
+            return (yaml.safe_load(config_file) or {}).get(LOGGING_CONFIG_KEY) or {}
+    except OSError:
+        return {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record and line, exception traceback included as a field
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "line_number": record.lineno,
+            "file_name": record.filename,
+            "function_name": record.funcName,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_record["exception"] = record.exc_text
+        return json.dumps(log_record, default=str)
+
+
+# Function to return handler writing log file
+def get_file_handler(log_file_path: str, logging_config: dict) -> logging.Handler:
+    """
+    - rotate_when set (e.g. "midnight", "H"): rotated by time
+    - else max_bytes set: rotated by size
+    - else: single file
+    """
+    backup_count = logging_config.get(LOGGING_BACKUP_COUNT_KEY, 5)
+    if logging_config.get(LOGGING_ROTATE_WHEN_KEY):
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_file_path, when=logging_config[LOGGING_ROTATE_WHEN_KEY], backupCount=backup_count, delay=True
+        )
+    elif logging_config.get(LOGGING_MAX_BYTES_KEY):
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file_path, maxBytes=logging_config[LOGGING_MAX_BYTES_KEY], backupCount=backup_count, delay=True
+        )
+    else:
+        file_handler = logging.FileHandler(log_file_path, delay=True)
+    if logging_config.get(LOGGING_RECORD_FORMAT_KEY) == LOG_RECORD_FORMAT_JSON:
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(LOG_RECORD_FORMAT))
+    return file_handler
+
+
+class ParentForwardingHandler(logging.Handler):
+    """
+    Send records of a forked process to log writer of the process that opened
+    log file, one datagram per record, so that a run logs into a single file
+    """
+
+    def __init__(self, forward_socket: socket.socket, formatter: logging.Formatter):
+        super().__init__()
+        self.forward_socket = forward_socket
+        self.setFormatter(formatter)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record_dict = dict(record.__dict__)
+            record_dict["msg"] = record.getMessage()
+            record_dict["args"] = None
+            record_dict["exc_info"] = None
+            record_dict.pop("message", None)
+            self.forward_socket.send(pickle.dumps(record_dict))
+        except Exception:
+            self.handleError(record)
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hand records over to a background writer thread, logging threads never wait
+    for disk. Messages are formatted lazily by writer thread; records are dropped
+    (and counted) instead of blocking when queue is full. Once writer thread is
+    stopped (interpreter exit) records are written synchronously.
+    Forked processes (gunicorn workers, process pool workers) forward their
+    records to this writer over a datagram socket, so there is a single writer
+    of log file and it alone rotates it
+    """
+
+    def __init__(self, log_queue: queue.Queue, file_handler: logging.Handler):
+        super().__init__(log_queue)
+        self.file_handler = file_handler
+        self.listener = None
+        self.dropped_count = 0
+        self.receiver = None
+        self.receive_socket, self.forward_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def start(self) -> None:
+        self.listener = logging.handlers.QueueListener(self.queue, self.file_handler, respect_handler_level=True)
+        self.listener.start()
+
+    def start_receiver(self) -> None:
+        self.receiver = threading.Thread(target=self.receive, name="log-receiver", daemon=True)
+        self.receiver.start()
+
+    def receive(self) -> None:
+        # Records of forked processes join records of this process, until socket is shut down
+        while True:
+            record_bytes = self.receive_socket.recv(LOG_DATAGRAM_MAX_SIZE)
+            if not record_bytes:
+                return
+            try:
+                record = logging.makeLogRecord(pickle.loads(record_bytes))
+            except Exception:
+                # Truncated record (larger than LOG_DATAGRAM_MAX_SIZE)
+                self.dropped_count += 1
+                continue
+            self.emit(record)
+
+    def stop_receiver(self) -> None:
+        # Receive records forwarded so far, then let receiver thread finish
+        if self.receiver is not None:
+            self.receive_socket.shutdown(socket.SHUT_RD)
+            self.receiver.join(LOG_FORWARD_TIMEOUT)
+            self.receiver = None
+
+    def stop_listener(self) -> None:
+        # Write queued records and wait for writer thread to finish
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.file_handler.flush()
+
+    def stop(self) -> None:
+        # Take records forwarded by child processes, write queued records,
+        # then report records dropped on full queue
+        self.stop_receiver()
+        self.stop_listener()
+        if self.dropped_count > 0:
+            self.file_handler.handle(logging.makeLogRecord({
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"{self.dropped_count} log records dropped (full log queue or oversized forwarded record)"
+            }))
+            self.dropped_count = 0
+        self.file_handler.flush()
+
+    def before_fork(self) -> None:
+        """
+        Hold log file lock across fork, so that no record is half written into
+        buffer child inherits. Fork waits for at most the one record writer is
+        writing, queued records are neither drained nor flushed
+        """
+        self.file_handler.acquire()
+
+    def after_fork_in_parent(self) -> None:
+        self.file_handler.release()
+
+    def restart_in_child(self) -> None:
+        """
+        Writer thread does not survive fork, forked process starts its own
+        writer forwarding records to parent's writer (lock of inherited log
+        file handler is reinitialized by logging itself)
+        """
+        formatter = self.file_handler.formatter
+        self.file_handler.close()
+        if self.receive_socket is not None:
+            self.receive_socket.close()
+            self.receive_socket = None
+        self.receiver = None
+        self.forward_socket.settimeout(LOG_FORWARD_TIMEOUT)
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.file_handler = ParentForwardingHandler(self.forward_socket, formatter)
+        self.dropped_count = 0
+        self.start()
+
+    def register_exit_in_child(self) -> None:
+        # multiprocessing children leave through os._exit, skipping atexit
+        multiprocessing.util.Finalize(self, self.stop, exitpriority=0)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only exception traceback is rendered on calling thread, its frames
+        # do not outlive the call
+        if record.exc_info:
+            record.exc_text = self.file_handler.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.listener is None:
+            self.file_handler.handle(record)
+        else:
+            super().emit(record)
+
+
 # Define log file path
 LOG_FILE_NAME = get_log_file_name()
 os.makedirs(APP_LOG_DIR, exist_ok=True)
 LOG_FILE_PATH = os.path.join(APP_LOG_DIR, LOG_FILE_NAME)
 
+# Create log handler, queue-backed unless async logging is disabled
+logging_config = get_logging_config()
+log_handler = get_file_handler(LOG_FILE_PATH, logging_config)
+if logging_config.get(LOGGING_ASYNC_KEY, True):
+    log_handler = AsyncQueueHandler(
+        log_queue=queue.Queue(maxsize=logging_config.get(LOGGING_QUEUE_SIZE_KEY) or 0),
+        file_handler=log_handler
+    )
+    log_handler.start()
+    log_handler.start_receiver()
+    atexit.register(log_handler.stop)
+    os.register_at_fork(
+        before=log_handler.before_fork,
+        after_in_parent=log_handler.after_fork_in_parent,
+        after_in_child=log_handler.restart_in_child
+    )
+    multiprocessing.util.register_after_fork(log_handler, AsyncQueueHandler.register_exit_in_child)
+
 # Define logging basic configuration
 logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    filemode='w',
-    format='[%(asctime)s]^;%(levelname)s^;%(lineno)d^;%(filename)s^;%(funcName)s()^;%(message)s',
+    handlers=[log_handler],
     level=logging.INFO
 )
-
-
-# Function to return log dataframe
-def get_log_dataframe(file_path):
-    data = []
-    with open(file_path) as log_file:
-        for line in log_file.readlines():
-            data.append(line.split("^;"))
-
-    log_df = pd.DataFrame(data)
-    columns = ["timestamp", "log Level", "line number", "file name", "function name", "message"]
-    log_df.columns = columns
-
-    log_df["log_message"] = log_df['timestamp'].astype(str) + ":$" + log_df["message"]
-
-    return log_df[["log_message"]]
@@ -0,0 +1,240 @@
+# Importing required packages
+import os
+import re
+import sys
+import json
+import logging
+from datetime import datetime
+import numpy as np
+
+from housing.exception import HousingException
+
+# Sidecar index of a log file: header followed by one entry per log record, header is
+# written after entries so entries past its entry count are leftovers of an interrupted update
+LOG_INDEX_FILE_EXTENSION = ".idx"
+LOG_INDEX_MAGIC = b"HLOGIDX2"
+LOG_INDEX_HEADER_DTYPE = np.dtype([("magic", "S8"), ("inode", "<u8"), ("indexed_size", "<u8"),
+                                   ("entry_count", "<u8")])
+LOG_INDEX_ENTRY_DTYPE = np.dtype([("offset", "<u8"), ("timestamp", "<f8"), ("level", "u1")])
+
+# Records start with "[<asctime>]^;<levelname>^;" (text) or '{"timestamp": "<asctime>", "level": "<levelname>"'
+# (json), other lines continue previous record; matched with leading newline, which is much faster to
+# search for than a multiline "^"
+RECORD_START = re.compile(
+    rb'\n(?:\[|\{"timestamp": ")(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d{3})(?:\]\^;|", "level": ")([A-Z]+)'
+)
+TEXT_RECORD_FIELDS = ["timestamp", "level", "line_number", "file_name", "function_name", "message"]
+
+# Bytes read at a time while indexing
+LOG_INDEX_READ_SIZE = 1024 * 1024
+
+
+def get_log_files(log_dir: str) -> list:
+    """
+    Log files of log directory (rotated backups included), newest first
+    """
+    try:
+        if not os.path.isdir(log_dir):
+            return []
+        log_files = [os.path.join(log_dir, file_name) for file_name in os.listdir(log_dir)
+                     if not file_name.endswith(LOG_INDEX_FILE_EXTENSION)]
+        return sorted(log_files, key=os.path.getmtime, reverse=True)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def parse_record(record_bytes: bytes) -> dict:
+    text = record_bytes.decode(errors="replace").rstrip("\n")
+    if text.startswith("{"):
+        return json.loads(text)
+    record = dict(zip(TEXT_RECORD_FIELDS, text.split("^;", len(TEXT_RECORD_FIELDS) - 1)))
+    record["timestamp"] = record["timestamp"].strip("[]")
+    return record
+
+
+class LogReader:
+    """
+    Read records of one log file (text or json record format) without scanning it.
+    A sidecar "<log file>.idx" keeps byte offset, timestamp and level of every
+    record; it is extended incrementally as log file grows and rebuilt when log
+    file was rotated or truncated. Tail, pages and level/time filters seek
+    straight to the records they return
+    """
+
+    def __init__(self, log_file_path: str):
+        try:
+            self.log_file_path = log_file_path
+            self.index_file_path = f"{log_file_path}{LOG_INDEX_FILE_EXTENSION}"
+            self.entries = np.empty(0, dtype=LOG_INDEX_ENTRY_DTYPE)
+            self.indexed_size = 0
+            self.entry_count = 0
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def update_index(self) -> np.ndarray:
+        """
+        Index records appended since last update, only complete lines are indexed.
+        Entries are appended after last committed entry and header is written last,
+        an update interrupted in between leaves index at its previous state
+        return: index entries memory-mapped from index file
+        """
+        try:
+            index_fd = os.open(self.index_file_path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(index_fd, "r+b") as index_file:
+                try:
+                    import fcntl
+                    fcntl.flock(index_file, fcntl.LOCK_EX)
+                except ImportError:
+                    pass
+
+                # Continue existing index unless log file was replaced or truncated
+                log_stat = os.stat(self.log_file_path)
+                header = None
+                index_size = os.fstat(index_file.fileno()).st_size
+                if index_size >= LOG_INDEX_HEADER_DTYPE.itemsize:
+                    index_file.seek(0)
+                    header = np.frombuffer(index_file.read(LOG_INDEX_HEADER_DTYPE.itemsize),
+                                           dtype=LOG_INDEX_HEADER_DTYPE)[0]
+                    entry_bytes = index_size - LOG_INDEX_HEADER_DTYPE.itemsize
+                    if header["magic"] != LOG_INDEX_MAGIC or header["inode"] != log_stat.st_ino \
+                            or header["indexed_size"] > log_stat.st_size \
+                            or entry_bytes < header["entry_count"] * LOG_INDEX_ENTRY_DTYPE.itemsize:
+                        header = None
+                indexed_size = 0 if header is None else int(header["indexed_size"])
+                entry_count = 0 if header is None else int(header["entry_count"])
+
+                if log_stat.st_size > indexed_size:
+                    new_entries, indexed_size = self.index_log_file(indexed_size)
+                    # Drop entries of an interrupted update, they are indexed again
+                    index_file.truncate(LOG_INDEX_HEADER_DTYPE.itemsize
+                                        + entry_count * LOG_INDEX_ENTRY_DTYPE.itemsize)
+                    if header is None:
+                        # Invalid header until entries are written
+                        index_file.seek(0)
+                        index_file.write(np.zeros(1, dtype=LOG_INDEX_HEADER_DTYPE).tobytes())
+                    index_file.seek(0, os.SEEK_END)
+                    index_file.write(new_entries.tobytes())
+                    index_file.flush()
+                    entry_count += len(new_entries)
+                    index_file.seek(0)
+                    index_file.write(np.array([(LOG_INDEX_MAGIC, log_stat.st_ino, indexed_size, entry_count)],
+                                              dtype=LOG_INDEX_HEADER_DTYPE).tobytes())
+                    index_file.flush()
+                self.indexed_size = indexed_size
+                self.entry_count = entry_count
+
+            if entry_count <= 0:
+                self.entries = np.empty(0, dtype=LOG_INDEX_ENTRY_DTYPE)
+            else:
+                self.entries = np.memmap(self.index_file_path, dtype=LOG_INDEX_ENTRY_DTYPE, mode="r",
+                                         offset=LOG_INDEX_HEADER_DTYPE.itemsize, shape=(entry_count,))
+            return self.entries
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def index_log_file(self, start_offset: int) -> tuple:
+        """
+        Find record starts block by block with one multiline regex scan
+        return: tuple (entries of records starting after start_offset, end of last complete line)
+        """
+        entries = []
+        seconds = {}
+        levels = {}
+        offset = start_offset
+        remainder = b""
+        with open(self.log_file_path, "rb") as log_file:
+            log_file.seek(start_offset)
+            while True:
+                data = log_file.read(LOG_INDEX_READ_SIZE)
+                if not data:
+                    break
+                data = remainder + data
+                end = data.rfind(b"\n") + 1
+                data, remainder = data[:end], data[end:]
+                # Block starts at a line start, newline in front makes its first line match too;
+                # match of a record starts at its preceding newline, one byte before it in block
+                for match in RECORD_START.finditer(b"\n" + data):
+                    # Consecutive records mostly share their second and level
+                    second_key, millisecond, level_name = match.group(1, 2, 3)
+                    if second_key not in seconds:
+                        if len(seconds) > 1024:
+                            seconds.clear()
+                        seconds[second_key] = datetime.fromisoformat(second_key.decode()).timestamp()
+                    if level_name not in levels:
+                        level_number = logging.getLevelName(level_name.decode())
+                        levels[level_name] = level_number if isinstance(level_number, int) else 0
+                    entries.append((offset + match.start(),
+                                    seconds[second_key] + int(millisecond) / 1000,
+                                    levels[level_name]))
+                offset += len(data)
+        return np.array(entries, dtype=LOG_INDEX_ENTRY_DTYPE), offset
+
+    def get_record_count(self) -> int:
+        return len(self.update_index())
+
+    def read_records(self, positions) -> list:
+        """
+        Read records at index positions, contiguous runs are read with one seek
+        positions: sorted index positions
+        return: list of record dicts
+        """
+        try:
+            positions = np.asarray(positions, dtype=np.int64)
+            records = []
+            if len(positions) == 0:
+                return records
+            with open(self.log_file_path, "rb") as log_file:
+                # Split positions into runs of consecutive records
+                run_starts = np.flatnonzero(np.diff(positions) != 1) + 1
+                for run in np.split(positions, run_starts):
+                    start_offset = int(self.entries["offset"][run[0]])
+                    end_offset = int(self.entries["offset"][run[-1] + 1]) if run[-1] + 1 < len(self.entries) \
+                        else self.indexed_size
+                    log_file.seek(start_offset)
+                    data = log_file.read(end_offset - start_offset)
+                    record_offsets = [int(offset) - start_offset for offset in self.entries["offset"][run]]
+                    for record_start, record_end in zip(record_offsets, record_offsets[1:] + [len(data)]):
+                        records.append(parse_record(data[record_start:record_end]))
+            return records
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def tail(self, n: int = 100) -> list:
+        """
+        Last n records, oldest first
+        """
+        entry_count = len(self.update_index())
+        return self.read_records(range(max(0, entry_count - n), entry_count))
+
+    def get_page(self, offset: int = 0, limit: int = 100) -> list:
+        """
+        Records offset to offset + limit, counted from start of log file
+        """
+        entry_count = len(self.update_index())
+        return self.read_records(range(min(offset, entry_count), min(offset + limit, entry_count)))
+
+    def search(self, level: str = None, start_time: datetime = None, end_time: datetime = None,
+               offset: int = 0, limit: int = 100) -> list:
+        """
+        Records at or above level, logged between start_time (inclusive) and
+        end_time (exclusive); time range is located by binary search on index
+        offset, limit: page of matching records
+        """
+        level_number = None
+        if level is not None:
+            level_number = logging.getLevelName(level.upper())
+            if not isinstance(level_number, int):
+                raise ValueError(f"level: [{level}] is not a logging level")
+        try:
+            entries = self.update_index()
+            first, last = 0, len(entries)
+            if start_time is not None:
+                first = int(np.searchsorted(entries["timestamp"], start_time.timestamp(), side="left"))
+            if end_time is not None:
+                last = int(np.searchsorted(entries["timestamp"], end_time.timestamp(), side="left"))
+            positions = np.arange(first, max(first, last))
+            if level_number is not None:
+                positions = positions[entries["level"][first:max(first, last)] >= level_number]
+            return self.read_records(positions[offset:offset + limit])
+        except Exception as e:
+            raise HousingException(e, sys) from e
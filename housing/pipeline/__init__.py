@@ -2,7 +2,6 @@
 import os
 import sys
 import uuid
-import pandas as pd
 from threading import Thread
 from collections import namedtuple
 
@@ -10,15 +9,23 @@ from housing.constant import *
 from housing.logger import logging
 from housing.exception import HousingException
 from housing.configuration import Configuration
+from housing.entity.experiment_store import ExperimentStore
+from housing.pipeline.stage_graph import StageGraph
 
 from housing.component.data_ingestion import DataIngestion
-from housing.entity.artifact_entity import DataIngestionArtifact
+from housing.component.data_validation import DataValidation
+from housing.component.data_transformation import DataTransformation
+from housing.component.model_trainer import ModelTrainer
+from housing.component.model_evaluation import ModelEvaluation
+from housing.component.model_pusher import ModelPusher
+from housing.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact, \
+    DataTransformationArtifact, ModelTrainerArtifact, ModelEvaluationArtifact, ModelPusherArtifact
 
 # Define experiment
 Experiment = namedtuple(
     'Experiment',
     ['experiment_id', 'initialization_timestamp', 'artifact_timestamp', 'running_status', 'start_time',
-     'stop_time', 'execution_time', 'message', 'experiment_filepath', 'accuracy', 'is_model_accepted']
+     'stop_time', 'execution_time', 'message', 'experiment_file_path', 'accuracy', 'is_model_accepted']
 )
 
 
@@ -26,10 +33,11 @@ class Pipeline(Thread):
     # Create experiment
     experiment: Experiment = Experiment(*([None] * 11))
 
-    # Create experiment file path variable
+    # Create experiment file path and experiment store variables
     experiment_file_path = None
+    experiment_store: ExperimentStore = None
 
-    def __int__(self, config: Configuration) -> None:
+    def __init__(self, config: Configuration) -> None:
         try:
             # Create artifact directory
             os.makedirs(config.training_pipeline_config.artifact_dir, exist_ok=True)
@@ -40,16 +48,95 @@ class Pipeline(Thread):
                 EXPERIMENT_DIR_NAME,
                 EXPERIMENT_FILE_NAME
             )
+
+            # Open experiment store, importing experiments of former experiment.csv once
+            Pipeline.experiment_store = ExperimentStore(
+                db_file_path=Pipeline.experiment_file_path,
+                legacy_csv_file_path=os.path.join(os.path.dirname(Pipeline.experiment_file_path),
+                                                  EXPERIMENT_LEGACY_FILE_NAME)
+            )
             super().__init__(daemon=False, name="pipeline")
             self.config = config
         except Exception as e:
             raise HousingException(e, sys) from e
 
-    def start_data_ingestion(self) -> DataIngestionArtifact:
+    def start_data_ingestion(self, stage_graph: StageGraph = None) -> DataIngestionArtifact:
         try:
             # Initialize data ingestion
-            data_ingestion = DataIngestion(data_ingestion_config=self.config.get_data_ingestion_config())
-            return data_ingestion.initiate_data_ingestion()
+            data_ingestion = DataIngestion(data_ingestion_config=self.config.get_data_ingestion_configuration())
+            if stage_graph is None:
+                return data_ingestion.initiate_data_ingestion()
+
+            # Download dataset first, archive content is part of data ingestion fingerprint
+            tgz_file_path = data_ingestion.download_housing_data()
+            return stage_graph.run_stage(
+                stage_name=STAGE_DATA_INGESTION,
+                start_stage=lambda: data_ingestion.initiate_data_ingestion(tgz_file_path=tgz_file_path),
+                artifact_class=DataIngestionArtifact,
+                config=(self.config.config_info[DATA_INGESTION_CONFIG_KEY],),
+                file_paths=(tgz_file_path,)
+            )
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
+        try:
+            # Initialize data validation
+            data_validation = DataValidation(
+                data_validation_config=self.config.get_data_validation_configuration(),
+                data_ingestion_artifact=data_ingestion_artifact
+            )
+            return data_validation.initiate_data_validation()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact,
+                                  data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
+        try:
+            # Initialize data transformation
+            data_transformation = DataTransformation(
+                data_transformation_config=self.config.get_data_transformation_configuration(),
+                data_ingestion_artifact=data_ingestion_artifact,
+                data_validation_artifact=data_validation_artifact
+            )
+            return data_transformation.initiate_data_transformation()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
+        try:
+            # Initialize model trainer
+            model_trainer = ModelTrainer(
+                model_trainer_config=self.config.get_model_trainer_configuration(),
+                data_transformation_artifact=data_transformation_artifact
+            )
+            return model_trainer.initiate_model_trainer()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def start_model_evaluation(self, data_ingestion_artifact: DataIngestionArtifact,
+                               data_validation_artifact: DataValidationArtifact,
+                               model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
+        try:
+            # Initialize model evaluation
+            model_evaluation = ModelEvaluation(
+                model_evaluation_config=self.config.get_model_evaluation_configuration(),
+                data_ingestion_artifact=data_ingestion_artifact,
+                data_validation_artifact=data_validation_artifact,
+                model_trainer_artifact=model_trainer_artifact
+            )
+            return model_evaluation.initiate_model_evaluation()
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact) -> ModelPusherArtifact:
+        try:
+            # Initialize model pusher
+            model_pusher = ModelPusher(
+                model_pusher_config=self.config.get_model_pusher_configuration(),
+                model_evaluation_artifact=model_evaluation_artifact
+            )
+            return model_pusher.initiate_model_pusher()
         except Exception as e:
             raise HousingException(e, sys) from e
 
@@ -92,8 +179,58 @@ class Pipeline(Thread):
             # Save experiment
             self.save_experiment()
 
+            # Create stage graph, stages whose inputs and configuration are unchanged
+            # reuse artifacts of an earlier run
+            stage_graph = StageGraph(stage_cache_dir=self.config.training_pipeline_config.stage_cache_dir)
+            schema_file_path = self.config.get_data_validation_configuration().schema_file_path
+
             # Starting data ingestion
-            data_ingestion_artifact = self.start_data_ingestion()
+            data_ingestion_artifact = self.start_data_ingestion(stage_graph=stage_graph)
+
+            # Starting data validation
+            data_validation_artifact = stage_graph.run_stage(
+                stage_name=STAGE_DATA_VALIDATION,
+                start_stage=self.start_data_validation,
+                artifact_class=DataValidationArtifact,
+                dependencies=(STAGE_DATA_INGESTION,),
+                config=(self.config.config_info[DATA_VALIDATION_CONFIG_KEY],),
+                file_paths=(schema_file_path,)
+            )
+
+            # Starting data transformation
+            data_transformation_artifact = stage_graph.run_stage(
+                stage_name=STAGE_DATA_TRANSFORMATION,
+                start_stage=self.start_data_transformation,
+                artifact_class=DataTransformationArtifact,
+                dependencies=(STAGE_DATA_INGESTION, STAGE_DATA_VALIDATION),
+                config=(self.config.config_info[DATA_TRANSFORMATION_CONFIG_KEY],),
+                file_paths=(schema_file_path,)
+            )
+
+            # Starting model trainer
+            model_trainer_artifact = stage_graph.run_stage(
+                stage_name=STAGE_MODEL_TRAINER,
+                start_stage=self.start_model_trainer,
+                artifact_class=ModelTrainerArtifact,
+                dependencies=(STAGE_DATA_TRANSFORMATION,),
+                config=(self.config.config_info[MODEL_TRAINER_CONFIG_KEY],),
+                file_paths=(self.config.get_model_trainer_configuration().model_config_file_path,)
+            )
+            if stage_graph.reused_stages:
+                logging.info(f"stages reused from earlier run: {stage_graph.reused_stages}")
+
+            # Starting model evaluation, never reused as it compares with current production model
+            model_evaluation_artifact = self.start_model_evaluation(
+                data_ingestion_artifact=data_ingestion_artifact,
+                data_validation_artifact=data_validation_artifact,
+                model_trainer_artifact=model_trainer_artifact
+            )
+
+            # Starting model pusher, only accepted model is published
+            if model_evaluation_artifact.is_model_accepted:
+                self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            else:
+                logging.info("trained model is not accepted, skipping model pusher")
 
             # Get experiment stop time
             stop_time = datetime.now()
@@ -102,15 +239,15 @@ class Pipeline(Thread):
             Pipeline.experiment = Experiment(
                 experiment_id=Pipeline.experiment.experiment_id,
                 initialization_timestamp=self.config.timestamp,
-                artifact_time_stamp=self.config.timestamp,
+                artifact_timestamp=self.config.timestamp,
                 running_status=False,
                 start_time=Pipeline.experiment.start_time,
                 stop_time=stop_time,
                 execution_time=stop_time - Pipeline.experiment.start_time,
                 message='pipeline has been completed',
                 experiment_file_path=Pipeline.experiment_file_path,
-                is_model_accepted=None,
-                accuracy=None
+                is_model_accepted=model_evaluation_artifact.is_model_accepted,
+                accuracy=model_evaluation_artifact.accuracy
             )
 
             # Logging information to log file
@@ -125,25 +262,16 @@ class Pipeline(Thread):
         try:
             if Pipeline.experiment.experiment_id is not None:
                 # Get experiment as dictionary
-                experiment = Pipeline.experiment
-                experiment_dict = experiment._asdict()
-                experiment_dict: dict = {key: [value] for key, value in experiment_dict.items()}
+                experiment_dict = Pipeline.experiment._asdict()
 
                 # Update experiment dictionary
                 experiment_dict.update({
-                    "created_time_stamp": [datetime.now()],
-                    "experiment_file_path": [os.path.basename(Pipeline.experiment.experiment_file_path)]
+                    "created_time_stamp": datetime.now(),
+                    "experiment_file_path": os.path.basename(Pipeline.experiment.experiment_file_path)
                 })
 
-                # Create experiment report
-                experiment_report = pd.DataFrame(experiment_dict)
-
-                # Create directory to store experiment details if not exists
-                os.makedirs(os.path.dirname(Pipeline.experiment_file_path), exist_ok=True)
-                if os.path.exists(Pipeline.experiment_file_path):
-                    experiment_report.to_csv(Pipeline.experiment_file_path, index=False, header=False, mode="a")
-                else:
-                    experiment_report.to_csv(Pipeline.experiment_file_path, mode="w", index=False, header=True)
+                # Insert experiment, or update it with its ending configuration
+                Pipeline.experiment_store.save_experiment(experiment_dict)
             else:
                 print('experiment is not started')
         except Exception as e:
@@ -0,0 +1,139 @@
+# Importing required packages
+import os
+import sys
+import hashlib
+
+from housing.logger import logging
+from housing.exception import HousingException
+from housing.entity.search_cache import get_fingerprint
+from housing.util import read_yaml_file, write_yaml_file, artifact_file_exists
+
+# Bytes read at a time while hashing input files
+FILE_FINGERPRINT_READ_SIZE = 1024 * 1024
+
+
+def get_file_fingerprint(file_path: str) -> str:
+    """
+    Fingerprint of file content, of every file (and its relative path) for a directory
+    file_path: str
+    """
+    try:
+        file_hash = hashlib.blake2b(digest_size=16)
+        if os.path.isdir(file_path):
+            file_paths = sorted(os.path.join(dir_path, file_name)
+                                for dir_path, _, file_names in os.walk(file_path) for file_name in file_names)
+        else:
+            file_paths = [file_path]
+        for content_file_path in file_paths:
+            file_hash.update(os.path.relpath(content_file_path, file_path).encode())
+            with open(content_file_path, "rb") as content_file:
+                for block in iter(lambda: content_file.read(FILE_FINGERPRINT_READ_SIZE), b""):
+                    file_hash.update(block)
+        return file_hash.hexdigest()
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def to_yaml_value(value):
+    # numpy scalars (metrics of model trainer) as plain python values
+    return value.item() if hasattr(value, "item") else value
+
+
+class StageGraph:
+    """
+    Run pipeline stages memoized by fingerprint. Fingerprint of a stage covers
+    its name, its configuration sections, content of files it reads (schema,
+    model grid, dataset archive) and fingerprints of the stages it depends on,
+    so a change reruns that stage and everything downstream of it only.
+    Artifact of a finished stage is recorded as:
+        - <stage cache dir>
+            - <stage name>
+                - <fingerprint>.yaml ----- artifact fields
+    and reused while every file path of it (and every part of csv part lists) still exists
+    """
+
+    def __init__(self, stage_cache_dir: str = None) -> None:
+        try:
+            # Memoization is disabled without stage cache directory
+            self.stage_cache_dir = stage_cache_dir
+            self.fingerprints = {}
+            self.artifacts = {}
+            self.reused_stages = []
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_stage_fingerprint(self, stage_name: str, dependencies: tuple = (), config: tuple = (),
+                              file_paths: tuple = ()) -> str:
+        try:
+            return get_fingerprint(
+                stage_name,
+                [[dependency, self.fingerprints[dependency]] for dependency in dependencies],
+                list(config),
+                [get_file_fingerprint(file_path) for file_path in file_paths]
+            )
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_record_file_path(self, stage_name: str, fingerprint: str) -> str:
+        return os.path.join(self.stage_cache_dir, stage_name, f"{fingerprint}.yaml")
+
+    def load_artifact(self, stage_name: str, fingerprint: str, artifact_class):
+        """
+        return: artifact recorded for fingerprint, None when there is none or
+        one of its files is gone
+        """
+        try:
+            record_file_path = self.get_record_file_path(stage_name, fingerprint)
+            if not os.path.exists(record_file_path):
+                return None
+            record = read_yaml_file(file_path=record_file_path) or {}
+            if set(record) != set(artifact_class._fields):
+                return None
+            for field, value in record.items():
+                if field.endswith("_path") and value is not None and not artifact_file_exists(value):
+                    logging.info(f"{stage_name} artifact file: [{value}] no longer exists, stage will rerun")
+                    return None
+            return artifact_class(**record)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def save_artifact(self, stage_name: str, fingerprint: str, artifact) -> None:
+        try:
+            record_file_path = self.get_record_file_path(stage_name, fingerprint)
+            temp_record_file_path = f"{record_file_path}.{os.getpid()}.tmp"
+            write_yaml_file(file_path=temp_record_file_path,
+                            data={field: to_yaml_value(value) for field, value in artifact._asdict().items()})
+            os.replace(temp_record_file_path, record_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def run_stage(self, stage_name: str, start_stage, artifact_class, dependencies: tuple = (),
+                  config: tuple = (), file_paths: tuple = ()):
+        """
+        Reuse artifact of an earlier run with same fingerprint, otherwise run stage
+        start_stage: function of dependency artifacts (in order of dependencies) returning stage artifact
+        dependencies: names of stages already run on this graph
+        config: configuration sections stage reads
+        file_paths: files (or directories) stage reads
+        """
+        try:
+            fingerprint = self.get_stage_fingerprint(stage_name, dependencies, config, file_paths)
+            artifact = None
+            if self.stage_cache_dir is not None:
+                artifact = self.load_artifact(stage_name, fingerprint, artifact_class)
+
+            if artifact is not None:
+                # Logging information to log file
+                logging.info(f"{stage_name} is unchanged (fingerprint: [{fingerprint}]), "
+                             f"reusing artifact: {artifact}")
+                self.reused_stages.append(stage_name)
+            else:
+                artifact = start_stage(*[self.artifacts[dependency] for dependency in dependencies])
+                if self.stage_cache_dir is not None:
+                    self.save_artifact(stage_name, fingerprint, artifact)
+
+            self.fingerprints[stage_name] = fingerprint
+            self.artifacts[stage_name] = artifact
+            return artifact
+        except Exception as e:
+            raise HousingException(e, sys) from e
@@ -1,13 +1,25 @@
 # Importing required packages
+# yaml, joblib, numpy and pandas stay eager, serving needs them (config, model loading,
+# request frames); dill and pyarrow are imported where training artifacts use them
 import sys
 import yaml
-import dill
+import shutil
+import joblib
+import threading
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
 
 from housing.constant import *
 from housing.exception import HousingException
 
+# Compiled schema dtype maps keyed by schema file path, modification time and float dtype
+COMPILED_SCHEMA_CACHE = {}
+
+# Loaded model objects keyed by file path, modification time and size, least recently used first
+MODEL_LOAD_CACHE = OrderedDict()
+MODEL_LOAD_CACHE_LOCK = threading.Lock()
+
 
 def write_yaml_file(file_path: str, data: dict = None) -> None:
     """
@@ -51,13 +63,16 @@ def save_numpy_array_data(file_path: str, array: np.array) -> None:
         raise HousingException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: str = None) -> np.array:
     """
     load numpy array data from file
     file_path: str location of file to load
+    mmap_mode: str "r" to memory-map file instead of reading it (pages shared between processes)
     return: numpy array data loaded
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, 'rb') as file_obj:
             return np.load(file_obj)
     except Exception as e:
@@ -72,6 +87,7 @@ def save_object(file_path: str, obj) -> None:
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
+        import dill
         with open(file_path, "wb") as file_obj:
             dill.dump(obj, file_obj)
     except Exception as e:
@@ -83,26 +99,566 @@ def load_object(file_path: str):
     file_path: str
     """
     try:
+        import dill
         with open(file_path, "rb") as file_obj:
             return dill.load(file_obj)
     except Exception as e:
         raise HousingException(e, sys) from e
 
 
-def load_data(file_path: str, schema_file_path: str) -> pd.DataFrame:
+def save_model_object(file_path: str, obj) -> None:
+    """
+    Save model object with numpy buffers stored uncompressed and aligned, so that
+    load_model_object can memory-map them instead of reading them into memory.
+    File is swapped in atomically, readers never see partially written model
+    file_path: str
+    obj: model object
+    """
     try:
-        dataset_schema = read_yaml_file(schema_file_path)
-        schema = dataset_schema[DATASET_SCHEMA_COLUMNS_KEY]
-        dataframe = pd.read_csv(file_path)
-        error_message = ""
-        for column in dataframe.columns:
-            if column in list(schema.keys()):
-                dataframe[column].astype(schema[column])
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+        joblib.dump(obj, temp_file_path, compress=0)
+        os.replace(temp_file_path, file_path)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def load_model_object(file_path: str, mmap_mode: str = "r", use_cache: bool = True):
+    """
+    Load model object saved by save_model_object with numpy buffers memory-mapped,
+    pages are shared by every process loading the same file.
+    Loaded objects are cached per process by file path and modification time,
+    least recently used ones are evicted beyond MODEL_LOAD_CACHE_MAX_BYTES
+    (size on disk). Files saved by save_object (dill) are still readable
+    file_path: str
+    mmap_mode: str "r" to memory-map numpy buffers, None to read them
+    use_cache: bool
+    """
+    try:
+        file_stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size, mmap_mode)
+        if use_cache:
+            with MODEL_LOAD_CACHE_LOCK:
+                if cache_key in MODEL_LOAD_CACHE:
+                    MODEL_LOAD_CACHE.move_to_end(cache_key)
+                    return MODEL_LOAD_CACHE[cache_key]
+
+        try:
+            obj = joblib.load(file_path, mmap_mode=mmap_mode)
+        except Exception:
+            obj = load_object(file_path)
+
+        if use_cache:
+            with MODEL_LOAD_CACHE_LOCK:
+                # Older versions of the same file are never asked for again
+                for stale_key in [key for key in MODEL_LOAD_CACHE if key[0] == cache_key[0]]:
+                    del MODEL_LOAD_CACHE[stale_key]
+                MODEL_LOAD_CACHE[cache_key] = obj
+                while len(MODEL_LOAD_CACHE) > 1 and \
+                        sum(key[2] for key in MODEL_LOAD_CACHE) > MODEL_LOAD_CACHE_MAX_BYTES:
+                    MODEL_LOAD_CACHE.popitem(last=False)
+        return obj
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def set_current_model_version(model_export_dir: str, model_version: str, model_file_name: str) -> None:
+    """
+    Point current model version pointer file at a published version directory,
+    pointer is swapped in atomically
+    model_export_dir: str
+    model_version: str name of version directory
+    model_file_name: str
+    """
+    try:
+        pointer_file_path = os.path.join(model_export_dir, MODEL_PUSHER_CURRENT_VERSION_FILE_NAME)
+        temp_pointer_file_path = f"{pointer_file_path}.{os.getpid()}.tmp"
+        write_yaml_file(file_path=temp_pointer_file_path, data={
+            MODEL_VERSION_KEY: model_version,
+            MODEL_PATH_KEY: os.path.join(model_version, model_file_name)
+        })
+        os.replace(temp_pointer_file_path, pointer_file_path)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_current_model_version(model_export_dir: str):
+    """
+    Current model version and absolute model path from pointer file,
+    None when no model has been published yet
+    model_export_dir: str
+    return: tuple model version, model path
+    """
+    try:
+        pointer_file_path = os.path.join(model_export_dir, MODEL_PUSHER_CURRENT_VERSION_FILE_NAME)
+        if not os.path.exists(pointer_file_path):
+            return None
+        pointer = read_yaml_file(pointer_file_path)
+        return pointer[MODEL_VERSION_KEY], os.path.join(model_export_dir, pointer[MODEL_PATH_KEY])
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_latest_model_path(model_export_dir: str, model_file_name: str):
+    """
+    Model file of current model version, or of latest (by timestamp directory
+    name) exported version when there is no version pointer,
+    None when no model has been exported yet
+    model_export_dir: str
+    model_file_name: str
+    """
+    try:
+        current_model_version = get_current_model_version(model_export_dir)
+        if current_model_version is not None:
+            return current_model_version[1]
+        if not os.path.isdir(model_export_dir):
+            return None
+        for version in sorted(os.listdir(model_export_dir), reverse=True):
+            model_path = os.path.join(model_export_dir, version, model_file_name)
+            if os.path.isfile(model_path):
+                return model_path
+        return None
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def get_artifact_file_name(file_name: str, artifact_format: str = ARTIFACT_FORMAT_CSV) -> str:
+    """
+    Replace file extension according to artifact format
+    ("npy" artifacts are directories and have no extension)
+    file_name: str
+    artifact_format: str one of csv, parquet, feather, npy
+    """
+    if artifact_format not in ARTIFACT_FORMAT_EXTENSIONS:
+        raise Exception(f"artifact format: [{artifact_format}] is not one of {list(ARTIFACT_FORMAT_EXTENSIONS)}")
+    return f"{os.path.splitext(file_name)[0]}{ARTIFACT_FORMAT_EXTENSIONS[artifact_format]}"
+
+
+def get_artifact_format(file_path: str) -> str:
+    """
+    Detect artifact format from file path
+    file_path: str
+    """
+    if os.path.isdir(file_path):
+        return ARTIFACT_FORMAT_NPY
+    extension = os.path.splitext(file_path)[1]
+    for artifact_format, format_extension in ARTIFACT_FORMAT_EXTENSIONS.items():
+        if format_extension and extension == format_extension:
+            return artifact_format
+    return ARTIFACT_FORMAT_CSV
+
+
+class DataFrameWriter:
+    """
+    Write dataframe chunks one after another into a single artifact
+    - csv: appended as text
+    - parquet: one row group per chunk
+    - feather: uncompressed arrow record batches so that file can be memory-mapped
+    - npy: directory with one typed ".npy" file per column (plus "columns.yaml" for order),
+      string columns are stored as fixed width unicode with missing values as ""
+    """
+
+    def __init__(self, file_path: str, artifact_format: str = ARTIFACT_FORMAT_CSV) -> None:
+        try:
+            self.file_path = file_path
+            self.artifact_format = artifact_format
+            self.writer = None
+            self.schema = None
+            self.columns = None
+            self.parts = []
+            self.chunk_count = 0
+            if artifact_format not in ARTIFACT_FORMAT_EXTENSIONS:
+                raise Exception(f"artifact format: [{artifact_format}] is not one of {list(ARTIFACT_FORMAT_EXTENSIONS)}")
+            if artifact_format == ARTIFACT_FORMAT_NPY:
+                os.makedirs(file_path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        try:
+            if self.artifact_format == ARTIFACT_FORMAT_CSV:
+                dataframe.to_csv(self.file_path, mode="w" if self.chunk_count == 0 else "a",
+                                 header=self.chunk_count == 0, index=False)
+            elif self.artifact_format in (ARTIFACT_FORMAT_PARQUET, ARTIFACT_FORMAT_FEATHER):
+                import pyarrow as pa
+                # Later chunks reuse schema of first chunk so types stay consistent
+                table = pa.Table.from_pandas(dataframe, schema=self.schema, preserve_index=False)
+                if self.writer is None:
+                    self.schema = table.schema
+                    if self.artifact_format == ARTIFACT_FORMAT_PARQUET:
+                        import pyarrow.parquet as pq
+                        self.writer = pq.ParquetWriter(self.file_path, table.schema)
+                    else:
+                        self.writer = pa.ipc.new_file(self.file_path, table.schema)
+                self.writer.write_table(table)
             else:
+                # Write every chunk as its own set of column files, joined on close
+                part_dir = os.path.join(self.file_path, NPY_PARTS_DIR_NAME, str(len(self.parts)))
+                os.makedirs(part_dir, exist_ok=True)
+                for column in dataframe.columns:
+                    if pd.api.types.is_numeric_dtype(dataframe[column]):
+                        column_array = dataframe[column].to_numpy()
+                    else:
+                        column_array = dataframe[column].fillna("").to_numpy(dtype=str)
+                    np.save(os.path.join(part_dir, f"{column}.npy"), column_array)
+                self.parts.append(part_dir)
+                self.columns = list(dataframe.columns)
+            self.chunk_count += 1
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def close(self) -> None:
+        try:
+            if self.artifact_format in (ARTIFACT_FORMAT_PARQUET, ARTIFACT_FORMAT_FEATHER):
+                if self.writer is not None:
+                    self.writer.close()
+            elif self.artifact_format == ARTIFACT_FORMAT_NPY and self.columns is not None:
+                for column in self.columns:
+                    # Read parts memory-mapped so only one chunk is resident at a time
+                    column_parts = [np.load(os.path.join(part_dir, f"{column}.npy"), mmap_mode="r")
+                                    for part_dir in self.parts]
+                    column_array = np.lib.format.open_memmap(
+                        os.path.join(self.file_path, f"{column}.npy"),
+                        mode="w+",
+                        dtype=np.result_type(*column_parts),
+                        shape=(sum(len(column_part) for column_part in column_parts),)
+                    )
+                    row_offset = 0
+                    for column_part in column_parts:
+                        column_array[row_offset:row_offset + len(column_part)] = column_part
+                        row_offset += len(column_part)
+                    column_array.flush()
+                    del column_array, column_parts
+                write_yaml_file(os.path.join(self.file_path, NPY_COLUMNS_FILE_NAME), {"columns": self.columns})
+                shutil.rmtree(os.path.join(self.file_path, NPY_PARTS_DIR_NAME))
+            self.writer = None
+            self.columns = None
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+
+def get_csv_parts_file_path(file_path: str) -> str:
+    """
+    Path of csv part list belonging to csv artifact
+    file_path: str
+    """
+    return f"{os.path.splitext(file_path)[0]}{CSV_PARTS_FILE_EXTENSION}"
+
+
+def read_csv_parts(parts_file_path: str) -> list:
+    """
+    Paths of csv part files listed in part list, in row order; raises when
+    one of them is missing, a dataset must not silently lose rows
+    parts_file_path: str
+    """
+    try:
+        parts_dir = os.path.dirname(parts_file_path)
+        part_file_paths = [os.path.normpath(os.path.join(parts_dir, part_file_path))
+                           for part_file_path in read_yaml_file(parts_file_path)["parts"]]
+        missing_file_paths = [file_path for file_path in part_file_paths if not os.path.exists(file_path)]
+        if len(missing_file_paths) > 0:
+            raise FileNotFoundError(f"part files: {missing_file_paths} of [{parts_file_path}] are missing")
+        return part_file_paths
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def artifact_file_exists(file_path: str) -> bool:
+    """
+    Whether artifact exists, for csv part lists every listed part file as well
+    file_path: str
+    """
+    if not os.path.exists(file_path):
+        return False
+    if file_path.endswith(CSV_PARTS_FILE_EXTENSION):
+        parts_dir = os.path.dirname(file_path)
+        return all(os.path.exists(os.path.join(parts_dir, part_file_path))
+                   for part_file_path in read_yaml_file(file_path)["parts"])
+    return True
+
+
+def write_csv_parts(parts_file_path: str, part_file_paths: list) -> None:
+    """
+    Write csv part list, parts are stored relative to it so that artifact
+    directory can be moved
+    parts_file_path: str
+    part_file_paths: list
+    """
+    try:
+        parts_dir = os.path.dirname(parts_file_path)
+        write_yaml_file(parts_file_path, {
+            "parts": [os.path.relpath(part_file_path, parts_dir) for part_file_path in part_file_paths]
+        })
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def save_data_frame(file_path: str, dataframe: pd.DataFrame, artifact_format: str = ARTIFACT_FORMAT_CSV) -> None:
+    """
+    Save dataframe in given artifact format
+    file_path: str
+    dataframe: pd.DataFrame
+    artifact_format: str one of csv, parquet, feather, npy
+    """
+    try:
+        with DataFrameWriter(file_path=file_path, artifact_format=artifact_format) as data_frame_writer:
+            data_frame_writer.write(dataframe)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def load_data_frame(file_path: str, columns: list = None, dtype: dict = None) -> pd.DataFrame:
+    """
+    Load dataframe from artifact of any supported format
+    feather and npy artifacts are memory-mapped, numeric columns share
+    pages with the file instead of being copied into private memory;
+    csv part lists (incremental ingestion) are read part after part
+    file_path: str
+    columns: list columns to load, all when None
+    dtype: dict column dtypes used while parsing csv files
+    """
+    try:
+        if file_path.endswith(CSV_PARTS_FILE_EXTENSION):
+            return pd.concat([pd.read_csv(part_file_path, usecols=columns, dtype=dtype)
+                              for part_file_path in read_csv_parts(file_path)], ignore_index=True)
+        artifact_format = get_artifact_format(file_path)
+        if artifact_format == ARTIFACT_FORMAT_PARQUET:
+            return pd.read_parquet(file_path, columns=columns, memory_map=True)
+        if artifact_format == ARTIFACT_FORMAT_FEATHER:
+            import pyarrow.feather as feather
+            table = feather.read_table(file_path, columns=columns, memory_map=True)
+            return table.to_pandas(split_blocks=True)
+        if artifact_format == ARTIFACT_FORMAT_NPY:
+            if columns is None:
+                columns = read_yaml_file(os.path.join(file_path, NPY_COLUMNS_FILE_NAME))["columns"]
+            return pd.DataFrame(
+                {column: np.load(os.path.join(file_path, f"{column}.npy"), mmap_mode="r") for column in columns},
+                copy=False
+            )
+        return pd.read_csv(file_path, usecols=columns, dtype=dtype)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def compile_schema(schema_file_path: str, float_dtype=np.float32) -> dict:
+    """
+    Build pandas dtype map from schema file, cached until the file changes
+    - "float" columns are read as float_dtype (float32 by default)
+    - "category" columns are read as categorical with "domain_value" categories when listed
+    schema_file_path: str
+    float_dtype: numpy dtype for "float" columns
+    return: dict column name -> dtype
+    """
+    try:
+        cache_key = (
+            os.path.abspath(schema_file_path),
+            os.stat(schema_file_path).st_mtime_ns,
+            np.dtype(float_dtype).str
+        )
+        if cache_key not in COMPILED_SCHEMA_CACHE:
+            dataset_schema = read_yaml_file(schema_file_path)
+            domain_value = dataset_schema.get(DATASET_SCHEMA_DOMAIN_VALUE_KEY) or {}
+            dtypes = {}
+            for column, column_type in dataset_schema[DATASET_SCHEMA_COLUMNS_KEY].items():
+                if column_type == "float":
+                    dtypes[column] = np.dtype(float_dtype)
+                elif column_type == "category":
+                    dtypes[column] = pd.CategoricalDtype(domain_value.get(column))
+                else:
+                    dtypes[column] = column_type
+            COMPILED_SCHEMA_CACHE[cache_key] = dtypes
+        return COMPILED_SCHEMA_CACHE[cache_key]
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def load_data(file_path: str, schema_file_path: str, columns: list = None, float_dtype=np.float32) -> pd.DataFrame:
+    """
+    Load dataset typed according to schema file
+    csv files are parsed straight into schema dtypes, other formats are
+    cast only where stored dtype differs from schema dtype. Numeric columns
+    of memory-mapped artifacts (feather, npy) keep their stored numeric dtype,
+    casting them would copy the column out of the mapped file
+    file_path: str
+    schema_file_path: str
+    columns: list columns to load, all when None
+    float_dtype: numpy dtype for "float" columns
+    """
+    try:
+        schema = compile_schema(schema_file_path, float_dtype=float_dtype)
+        error_message = ""
+        for column in columns or []:
+            if column not in schema:
                 error_message = f"{error_message} \nColumn: [{column}] is not in the schema."
         if len(error_message) > 0:
             raise Exception(error_message)
-        return dataframe
+
+        dataframe = load_data_frame(file_path, columns=columns, dtype=schema)
+        return cast_to_schema(dataframe, schema, is_memory_mapped=is_memory_mapped_artifact(file_path))
 
     except Exception as e:
         raise HousingException(e,sys) from e
+
+
+def is_memory_mapped_artifact(file_path: str) -> bool:
+    return get_artifact_format(file_path) in (ARTIFACT_FORMAT_FEATHER, ARTIFACT_FORMAT_NPY)
+
+
+def cast_to_schema(dataframe: pd.DataFrame, schema: dict, is_memory_mapped: bool = False) -> pd.DataFrame:
+    """
+    Cast columns whose dtype differs from compiled schema dtype, numeric columns
+    of memory-mapped artifacts keep their stored numeric dtype
+    dataframe: pd.DataFrame
+    schema: dict compiled schema (see compile_schema)
+    is_memory_mapped: bool
+    """
+    error_message = ""
+    for column in dataframe.columns:
+        if column in schema:
+            if is_memory_mapped and pd.api.types.is_numeric_dtype(dataframe[column].dtype) \
+                    and pd.api.types.is_numeric_dtype(schema[column]):
+                continue
+            if dataframe[column].dtype != schema[column]:
+                dataframe[column] = dataframe[column].astype(schema[column])
+        else:
+            error_message = f"{error_message} \nColumn: [{column}] is not in the schema."
+    if len(error_message) > 0:
+        raise Exception(error_message)
+    return dataframe
+
+
+def load_split_data(base_file_path: str, index_file_path: str, schema_file_path: str,
+                    columns: list = None) -> pd.DataFrame:
+    """
+    Load rows of base table listed in index file
+    contiguous row index is served as slice of (memory-mapped) base table
+    without copying rows, any other row index gathers the listed rows
+    base_file_path: str
+    index_file_path: str
+    schema_file_path: str
+    columns: list columns to load, all when None
+    """
+    try:
+        dataframe = load_data(base_file_path, schema_file_path, columns=columns)
+        return take_rows(dataframe, load_numpy_array_data(index_file_path))
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def take_rows(dataframe: pd.DataFrame, row_index: np.ndarray) -> pd.DataFrame:
+    """
+    Select rows by position, as a slice (no copy) when positions are contiguous
+    dataframe: pd.DataFrame
+    row_index: np.ndarray row positions
+    """
+    try:
+        if len(row_index) > 0 and row_index[-1] - row_index[0] + 1 == len(row_index) \
+                and np.all(np.diff(row_index) == 1):
+            return dataframe.iloc[row_index[0]:row_index[-1] + 1]
+        return dataframe.take(row_index)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def load_ingested_data(data_ingestion_artifact, schema_file_path: str, is_train: bool = True,
+                       columns: list = None) -> pd.DataFrame:
+    """
+    Load ingested train or test dataset typed according to schema file,
+    for both "files" and "index" split layouts
+    data_ingestion_artifact: DataIngestionArtifact
+    schema_file_path: str
+    is_train: bool
+    columns: list columns to load, all when None
+    """
+    try:
+        if data_ingestion_artifact.base_file_path is not None:
+            index_file_path = data_ingestion_artifact.train_index_file_path if is_train \
+                else data_ingestion_artifact.test_index_file_path
+            return load_split_data(data_ingestion_artifact.base_file_path, index_file_path, schema_file_path,
+                                   columns=columns)
+        file_path = data_ingestion_artifact.train_file_path if is_train else data_ingestion_artifact.test_file_path
+        return load_data(file_path, schema_file_path, columns=columns)
+    except Exception as e:
+        raise HousingException(e, sys) from e
+
+
+def iter_data_frame_chunks(file_path: str, chunk_size: int, columns: list = None, dtype: dict = None):
+    """
+    Stream artifact of any supported format as dataframes of at most chunk_size rows,
+    only one chunk is read into memory at a time (feather and npy chunks are
+    slices of the memory-mapped file)
+    file_path: str
+    chunk_size: int
+    columns: list columns to load, all when None
+    dtype: dict column dtypes used while parsing csv files
+    """
+    if file_path.endswith(CSV_PARTS_FILE_EXTENSION):
+        for part_file_path in read_csv_parts(file_path):
+            yield from iter_data_frame_chunks(part_file_path, chunk_size, columns=columns, dtype=dtype)
+        return
+    artifact_format = get_artifact_format(file_path)
+    if artifact_format == ARTIFACT_FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield record_batch.to_pandas()
+    elif artifact_format == ARTIFACT_FORMAT_FEATHER:
+        import pyarrow.feather as feather
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        for start in range(0, table.num_rows, chunk_size):
+            yield table.slice(start, chunk_size).to_pandas(split_blocks=True)
+    elif artifact_format == ARTIFACT_FORMAT_NPY:
+        dataframe = load_data_frame(file_path, columns=columns)
+        for start in range(0, len(dataframe), chunk_size):
+            yield dataframe.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(file_path, usecols=columns, dtype=dtype, chunksize=chunk_size)
+
+
+def iter_ingested_data(data_ingestion_artifact, schema_file_path: str, is_train: bool = True,
+                       columns: list = None, chunk_size: int = MODEL_EVALUATION_DEFAULT_BATCH_SIZE):
+    """
+    Stream ingested train or test dataset in chunks typed according to schema file,
+    for both "files" and "index" split layouts; with index layout base table is
+    streamed and rows of the index are kept, in base table order
+    data_ingestion_artifact: DataIngestionArtifact
+    schema_file_path: str
+    is_train: bool
+    columns: list columns to load, all when None
+    chunk_size: int
+    """
+    try:
+        schema = compile_schema(schema_file_path)
+        row_index = None
+        if data_ingestion_artifact.base_file_path is not None:
+            file_path = data_ingestion_artifact.base_file_path
+            index_file_path = data_ingestion_artifact.train_index_file_path if is_train \
+                else data_ingestion_artifact.test_index_file_path
+            row_index = load_numpy_array_data(index_file_path, mmap_mode="r")
+            if np.any(np.diff(row_index) < 0):
+                row_index = np.sort(row_index)
+        else:
+            file_path = data_ingestion_artifact.train_file_path if is_train \
+                else data_ingestion_artifact.test_file_path
+        is_memory_mapped = is_memory_mapped_artifact(file_path)
+
+        row_offset = 0
+        for chunk in iter_data_frame_chunks(file_path, chunk_size, columns=columns, dtype=schema):
+            if row_index is not None:
+                # Rows of index falling into this chunk of base table
+                first, last = np.searchsorted(row_index, [row_offset, row_offset + len(chunk)])
+                chunk_row_index = np.asarray(row_index[first:last]) - row_offset
+                row_offset += len(chunk)
+                if len(chunk_row_index) == 0:
+                    continue
+                chunk = take_rows(chunk, chunk_row_index)
+            yield cast_to_schema(chunk, schema, is_memory_mapped=is_memory_mapped)
+    except Exception as e:
+        raise HousingException(e, sys) from e
@@ -0,0 +1,226 @@
+# Importing required packages
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+from six.moves import urllib
+
+from housing.logger import logging
+from housing.util import read_yaml_file, write_yaml_file
+from housing.exception import HousingException
+
+# Define cache layout
+DOWNLOAD_CACHE_MANIFEST_FILE_NAME = "manifest.yaml"
+DOWNLOAD_CACHE_OBJECTS_DIR_NAME = "objects"
+
+# Linux ioctl request number to clone file extents (copy-on-write copy)
+FICLONE = 0x40049409
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def get_local_source_path(source: str):
+    """
+    Return local file path for "file://" urls, local files and local
+    directories (first ".tgz" file inside), None for remote urls
+    source: str
+    """
+    parsed_url = urllib.parse.urlparse(source)
+    if parsed_url.scheme == "file":
+        source = urllib.request.url2pathname(parsed_url.path)
+    elif parsed_url.scheme in ("http", "https", "ftp"):
+        return None
+
+    if os.path.isdir(source):
+        archive_file_names = sorted(name for name in os.listdir(source) if name.endswith(".tgz"))
+        if len(archive_file_names) == 0:
+            raise Exception(f"no .tgz file found in directory: [{source}]")
+        source = os.path.join(source, archive_file_names[0])
+    return source
+
+
+def link_file(source_path: str, destination_path: str) -> str:
+    """
+    Place source file at destination without copying data when possible,
+    trying hard link, then reflink, then falling back to a plain copy
+    return: str link method used
+    """
+    if os.path.lexists(destination_path):
+        os.remove(destination_path)
+
+    try:
+        os.link(source_path, destination_path)
+        return "hardlink"
+    except OSError:
+        pass
+
+    return clone_file(source_path, destination_path)
+
+
+def clone_file(source_path: str, destination_path: str) -> str:
+    """
+    Copy file so that destination can be modified independently of source,
+    sharing extents through a reflink when the file system supports it
+    return: str copy method used
+    """
+    try:
+        import fcntl
+        with open(source_path, "rb") as source_file, open(destination_path, "wb") as destination_file:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        return "reflink"
+    except (ImportError, OSError):
+        shutil.copyfile(source_path, destination_path)
+        return "copy"
+
+
+class DownloadCache:
+    """
+    Content-addressed cache for downloaded archives shared across runs
+    cache_dir
+        - objects
+            - <sha256> ----- archive content
+        - manifest.yaml ----- url -> sha256, size and validators
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        try:
+            self.cache_dir = cache_dir
+            self.objects_dir = os.path.join(cache_dir, DOWNLOAD_CACHE_OBJECTS_DIR_NAME)
+            self.manifest_file_path = os.path.join(cache_dir, DOWNLOAD_CACHE_MANIFEST_FILE_NAME)
+            os.makedirs(self.objects_dir, exist_ok=True)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def read_manifest(self) -> dict:
+        try:
+            if not os.path.exists(self.manifest_file_path):
+                return {}
+            return read_yaml_file(file_path=self.manifest_file_path) or {}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def update_manifest(self, url: str, entry: dict) -> None:
+        try:
+            # Re-read manifest so entries written by other runs are kept
+            manifest = self.read_manifest()
+            manifest[url] = entry
+
+            # Write to temporary file and swap it in atomically
+            temp_manifest_file_path = f"{self.manifest_file_path}.{os.getpid()}.tmp"
+            write_yaml_file(file_path=temp_manifest_file_path, data=manifest)
+            os.replace(temp_manifest_file_path, self.manifest_file_path)
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def get_object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256)
+
+    def is_valid_entry(self, entry: dict) -> bool:
+        if not entry:
+            return False
+        object_path = self.get_object_path(entry["sha256"])
+        return os.path.exists(object_path) and os.path.getsize(object_path) == entry["size"]
+
+    def store_stream(self, stream) -> dict:
+        """
+        Copy stream into the object store while hashing it in the same pass
+        return: dict sha256 and size of stored content
+        """
+        try:
+            sha256 = hashlib.sha256()
+            size = 0
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, delete=False) as temp_file:
+                try:
+                    for block in iter(lambda: stream.read(COPY_BUFFER_SIZE), b""):
+                        sha256.update(block)
+                        temp_file.write(block)
+                        size += len(block)
+                except BaseException:
+                    # Do not leave partial download behind in cache directory
+                    temp_file.close()
+                    os.remove(temp_file.name)
+                    raise
+
+            object_path = self.get_object_path(sha256.hexdigest())
+            if os.path.exists(object_path):
+                os.remove(temp_file.name)
+            else:
+                os.replace(temp_file.name, object_path)
+            return {"sha256": sha256.hexdigest(), "size": size}
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def fetch_local(self, url: str, source_path: str, entry: dict) -> dict:
+        try:
+            source_stat = os.stat(source_path)
+
+            # Reuse cached object while source size and mtime are unchanged
+            if (self.is_valid_entry(entry) and entry.get("size") == source_stat.st_size
+                    and entry.get("mtime") == source_stat.st_mtime):
+                logging.info("download cache hit for: [%s]", url)
+                return entry
+
+            logging.info("download cache miss for: [%s], copying from: [%s]", url, source_path)
+            with open(source_path, "rb") as source_file:
+                entry = self.store_stream(source_file)
+            entry["mtime"] = source_stat.st_mtime
+            return entry
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def fetch_remote(self, url: str, entry: dict) -> dict:
+        try:
+            request = urllib.request.Request(url)
+
+            # Revalidate cached object with conditional request headers
+            if self.is_valid_entry(entry):
+                if entry.get("etag"):
+                    request.add_header("If-None-Match", entry["etag"])
+                if entry.get("last_modified"):
+                    request.add_header("If-Modified-Since", entry["last_modified"])
+
+            try:
+                with urllib.request.urlopen(request) as response:
+                    logging.info("download cache miss for: [%s], downloading", url)
+                    new_entry = self.store_stream(response)
+                    new_entry["etag"] = response.headers.get("ETag")
+                    new_entry["last_modified"] = response.headers.get("Last-Modified")
+                    return new_entry
+            except urllib.error.HTTPError as http_error:
+                if http_error.code == 304:
+                    logging.info("download cache hit for: [%s] (not modified)", url)
+                    return entry
+                raise
+        except Exception as e:
+            raise HousingException(e, sys) from e
+
+    def fetch(self, url: str, destination_path: str) -> str:
+        """
+        Place archive for url at destination path, downloading it only
+        when the cached copy is missing or stale
+        url: str remote url, "file://" url or local path
+        destination_path: str
+        return: str destination path
+        """
+        try:
+            entry = self.read_manifest().get(url)
+
+            source_path = get_local_source_path(url)
+            if source_path is not None:
+                new_entry = self.fetch_local(url=url, source_path=source_path, entry=entry)
+            else:
+                new_entry = self.fetch_remote(url=url, entry=entry)
+
+            if new_entry != entry:
+                self.update_manifest(url=url, entry=new_entry)
+
+            # Link cached object into artifact directory
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            link_method = link_file(self.get_object_path(new_entry["sha256"]), destination_path)
+
+            # Logging information to log file
+            logging.info("archive [%s] placed at: [%s] by %s", new_entry['sha256'], destination_path, link_method)
+            return destination_path
+        except Exception as e:
+            raise HousingException(e, sys) from e
@@ -0,0 +1,71 @@
+# Importing required packages
+import os
+import tarfile
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing.constant import ARTIFACT_FORMAT_CSV, SPLIT_LAYOUT_FILES
+from housing.entity.config_entity import DataIngestionConfig
+
+OCEAN_PROXIMITY_VALUES = ["<1H OCEAN", "INLAND", "ISLAND", "NEAR BAY", "NEAR OCEAN"]
+
+
+def make_housing_frame(row_count: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Random dataset with the columns of config/schema.yaml, every income stratum populated
+    """
+    random_state = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "longitude": random_state.uniform(-124, -114, row_count).round(2),
+        "latitude": random_state.uniform(32, 42, row_count).round(2),
+        "housing_median_age": random_state.randint(1, 52, row_count).astype(float),
+        "total_rooms": random_state.randint(2, 10000, row_count).astype(float),
+        "total_bedrooms": random_state.randint(1, 2000, row_count).astype(float),
+        "population": random_state.randint(3, 5000, row_count).astype(float),
+        "households": random_state.randint(1, 2000, row_count).astype(float),
+        "median_income": random_state.uniform(0.5, 10, row_count).round(4),
+        "median_house_value": random_state.uniform(15000, 500000, row_count).round(0),
+        "ocean_proximity": random_state.choice(OCEAN_PROXIMITY_VALUES, row_count)
+    })
+
+
+def write_housing_archive(tgz_file_path: str, frames: dict) -> str:
+    """
+    Write frames as csv members (member name -> frame) of a ".tgz" archive
+    """
+    source_dir = f"{tgz_file_path}.src"
+    with tarfile.open(tgz_file_path, "w:gz") as tgz_file_obj:
+        for member_name, frame in frames.items():
+            file_path = os.path.join(source_dir, member_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            frame.to_csv(file_path, index=False)
+            tgz_file_obj.add(file_path, arcname=member_name)
+    return tgz_file_path
+
+
+@pytest.fixture
+def make_ingestion_config(tmp_path):
+    """
+    Build DataIngestionConfig of one run below tmp_path, fields can be overridden
+    """
+    def make_config(timestamp: str = "2022-01-01-00-00-00", **overrides) -> DataIngestionConfig:
+        run_dir = os.path.join(tmp_path, "artifact", "data_ingestion", timestamp)
+        config = dict(
+            dataset_download_url=None,
+            tgz_download_dir=os.path.join(run_dir, "tgz_data"),
+            raw_data_dir=os.path.join(run_dir, "raw_data"),
+            ingested_train_dir=os.path.join(run_dir, "ingested_data", "train"),
+            ingested_test_dir=os.path.join(run_dir, "ingested_data", "test"),
+            chunk_size=None,
+            download_cache_dir=None,
+            extract_raw_data=False,
+            artifact_format=ARTIFACT_FORMAT_CSV,
+            ingestion_workers=2,
+            incremental=False,
+            row_key_columns=None,
+            split_layout=SPLIT_LAYOUT_FILES
+        )
+        config.update(overrides)
+        return DataIngestionConfig(**config)
+    return make_config
@@ -0,0 +1,98 @@
+# Importing required packages
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+
+from housing.exception import HousingException
+from housing.util import save_model_object
+from housing.entity.config_entity import BatchPredictionConfig
+from housing.component.batch_prediction import BatchPrediction
+from tests.conftest import make_housing_frame
+
+SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "schema.yaml")
+
+
+def make_batch_prediction(tmp_path, max_workers: int, chunk_size: int = 37) -> BatchPrediction:
+    """
+    Batch prediction with a model predicting twice the median income of a row
+    """
+    train_frame = make_housing_frame(200)
+    model = Pipeline([
+        ("select", ColumnTransformer([("income", "passthrough", ["median_income"])])),
+        ("regressor", LinearRegression())
+    ]).fit(train_frame, train_frame["median_income"] * 2)
+    model_file_path = os.path.join(tmp_path, "model", "model.pkl")
+    save_model_object(model_file_path, model)
+    return BatchPrediction(BatchPredictionConfig(
+        model_file_path=model_file_path,
+        schema_file_path=SCHEMA_FILE_PATH,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        prediction_column="prediction"
+    ))
+
+
+def write_batch_file(frame: pd.DataFrame, file_path: str) -> str:
+    if file_path.endswith(".csv"):
+        frame.to_csv(file_path, index=False)
+    elif file_path.endswith(".ndjson"):
+        frame.to_json(file_path, orient="records", lines=True)
+    else:
+        frame.to_parquet(file_path, index=False)
+    return file_path
+
+
+def read_batch_file(file_path: str) -> pd.DataFrame:
+    if file_path.endswith(".csv"):
+        return pd.read_csv(file_path)
+    if file_path.endswith(".ndjson"):
+        return pd.read_json(file_path, lines=True)
+    return pd.read_parquet(file_path)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("extension", [".csv", ".ndjson", ".parquet"])
+def test_output_keeps_input_order(tmp_path, max_workers, extension):
+    input_frame = make_housing_frame(500, seed=1).drop(columns=["median_house_value"])
+    # Columns outside of schema are passed through
+    input_frame["row_id"] = np.arange(500)
+    input_file_path = write_batch_file(input_frame, os.path.join(tmp_path, f"input{extension}"))
+    output_file_path = os.path.join(tmp_path, "output", f"scored{extension}")
+
+    batch_prediction_artifact = make_batch_prediction(tmp_path, max_workers).initiate_batch_prediction(
+        input_file_path=input_file_path, output_file_path=output_file_path)
+
+    assert batch_prediction_artifact.row_count == 500
+    assert batch_prediction_artifact.chunk_count == int(np.ceil(500 / 37))
+    output_frame = read_batch_file(output_file_path)
+    assert list(output_frame.columns) == list(input_frame.columns) + ["prediction"]
+    np.testing.assert_array_equal(output_frame["row_id"], np.arange(500))
+    np.testing.assert_allclose(output_frame["prediction"], input_frame["median_income"] * 2, rtol=1e-5)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_failure_leaves_no_partial_output(tmp_path, max_workers):
+    input_frame = make_housing_frame(500, seed=1).drop(columns=["median_house_value"]).astype({"median_income": object})
+    # Unparsable value in a late chunk, earlier chunks are already scored and written by then
+    input_frame.loc[450, "median_income"] = "not a number"
+    input_file_path = write_batch_file(input_frame, os.path.join(tmp_path, "input.csv"))
+    output_dir = os.path.join(tmp_path, "output")
+    output_file_path = os.path.join(output_dir, "scored.csv")
+
+    # Output of an earlier run is kept as it was
+    os.makedirs(output_dir)
+    with open(output_file_path, "w") as output_file:
+        output_file.write("earlier run\n")
+
+    with pytest.raises(HousingException):
+        make_batch_prediction(tmp_path, max_workers).initiate_batch_prediction(
+            input_file_path=input_file_path, output_file_path=output_file_path)
+
+    assert os.listdir(output_dir) == ["scored.csv"]
+    with open(output_file_path) as output_file:
+        assert output_file.read() == "earlier run\n"
@@ -0,0 +1,149 @@
+# Importing required packages
+import io
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.model_selection import StratifiedShuffleSplit
+
+from housing.constant import DATA_INGESTION_TEST_SIZE, DATA_INGESTION_RANDOM_STATE
+from housing.util import load_data_frame, read_csv_parts
+from housing.component.data_ingestion import DataIngestion, get_income_strata, get_income_category
+from tests.conftest import make_housing_frame, write_housing_archive
+
+
+def run_ingestion(data_ingestion_config, tgz_file_path: str) -> tuple:
+    """
+    Ingest archive, return train and test frames
+    """
+    data_ingestion_artifact = DataIngestion(data_ingestion_config).initiate_data_ingestion(tgz_file_path)
+    return (pd.read_csv(data_ingestion_artifact.train_file_path),
+            pd.read_csv(data_ingestion_artifact.test_file_path))
+
+
+@pytest.fixture
+def housing_frame():
+    return make_housing_frame(3000)
+
+
+@pytest.fixture
+def housing_archive(tmp_path, housing_frame):
+    return write_housing_archive(os.path.join(tmp_path, "housing.tgz"), {"housing.csv": housing_frame})
+
+
+def test_in_memory_split_matches_stratified_shuffle_split(make_ingestion_config, housing_archive, housing_frame):
+    train, test = run_ingestion(make_ingestion_config(), housing_archive)
+    stratified_split = StratifiedShuffleSplit(n_splits=1, test_size=DATA_INGESTION_TEST_SIZE,
+                                              random_state=DATA_INGESTION_RANDOM_STATE)
+    income_category = get_income_category(housing_frame["median_income"])
+    train_index, test_index = next(stratified_split.split(housing_frame, income_category))
+    expected_train = pd.read_csv(io.StringIO(housing_frame.iloc[train_index].to_csv(index=False)))
+    expected_test = pd.read_csv(io.StringIO(housing_frame.iloc[test_index].to_csv(index=False)))
+    pd.testing.assert_frame_equal(train, expected_train)
+    pd.testing.assert_frame_equal(test, expected_test)
+
+
+def test_streamed_split_is_independent_of_chunk_size(make_ingestion_config, housing_archive):
+    first_train, first_test = run_ingestion(make_ingestion_config("100", chunk_size=100), housing_archive)
+    for chunk_size in (250, 1000):
+        streamed_train, streamed_test = run_ingestion(make_ingestion_config(str(chunk_size), chunk_size=chunk_size),
+                                                      housing_archive)
+        pd.testing.assert_frame_equal(streamed_train, first_train)
+        pd.testing.assert_frame_equal(streamed_test, first_test)
+
+
+def test_split_keeps_stratum_shares(make_ingestion_config, housing_archive, housing_frame):
+    train, test = run_ingestion(make_ingestion_config(), housing_archive)
+    assert len(train) + len(test) == len(housing_frame)
+    assert len(test) == int(np.ceil(DATA_INGESTION_TEST_SIZE * len(housing_frame)))
+
+    strata = get_income_strata(housing_frame["median_income"])
+    test_strata = get_income_strata(test["median_income"])
+    for class_code in np.unique(strata):
+        expected_count = DATA_INGESTION_TEST_SIZE * np.sum(strata == class_code)
+        assert abs(np.sum(test_strata == class_code) - expected_count) <= 1
+
+
+@pytest.fixture
+def shard_archive(tmp_path, housing_frame):
+    shard_frames = [housing_frame.iloc[row_index] for row_index in np.array_split(np.arange(len(housing_frame)), 4)]
+    return write_housing_archive(os.path.join(tmp_path, "shards.tgz"), {
+        f"housing/part_{shard_number}.csv": shard_frame for shard_number, shard_frame in enumerate(shard_frames)
+    })
+
+
+def test_sharded_split_equals_single_file_split(make_ingestion_config, housing_archive, shard_archive):
+    single_train, single_test = run_ingestion(make_ingestion_config("single", chunk_size=500), housing_archive)
+    shard_train, shard_test = run_ingestion(make_ingestion_config("shards"), shard_archive)
+    pd.testing.assert_frame_equal(shard_train, single_train)
+    pd.testing.assert_frame_equal(shard_test, single_test)
+
+
+def test_sharded_split_from_extracted_subdirectory(make_ingestion_config, shard_archive):
+    archive_train, archive_test = run_ingestion(make_ingestion_config("archive"), shard_archive)
+    raw_train, raw_test = run_ingestion(make_ingestion_config("raw", extract_raw_data=True, chunk_size=500),
+                                        shard_archive)
+    pd.testing.assert_frame_equal(raw_train, archive_train)
+    pd.testing.assert_frame_equal(raw_test, archive_test)
+
+
+def read_file_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as file_obj:
+        return file_obj.read()
+
+
+def test_incremental_split_keeps_old_rows_and_writes_only_delta(tmp_path, make_ingestion_config, housing_frame):
+    first_archive = write_housing_archive(os.path.join(tmp_path, "first.tgz"),
+                                          {"housing.csv": housing_frame.iloc[:2000]})
+    second_archive = write_housing_archive(os.path.join(tmp_path, "second.tgz"),
+                                           {"housing.csv": housing_frame.sample(frac=1, random_state=1)})
+
+    first_config = make_ingestion_config("2022-01-01-00-00-00", incremental=True, chunk_size=700)
+    first_artifact = DataIngestion(first_config).initiate_data_ingestion(first_archive)
+    first_train = pd.read_csv(first_artifact.train_file_path.replace(".parts", ".csv"))
+    first_test = pd.read_csv(first_artifact.test_file_path.replace(".parts", ".csv"))
+    first_part_bytes = read_file_bytes(first_artifact.train_file_path.replace(".parts", ".csv"))
+
+    second_config = make_ingestion_config("2022-01-02-00-00-00", incremental=True, chunk_size=700)
+    second_artifact = DataIngestion(second_config).initiate_data_ingestion(second_archive)
+    second_train = load_data_frame(second_artifact.train_file_path)
+    second_test = load_data_frame(second_artifact.test_file_path)
+
+    # Earlier part is linked, not rewritten, and later run writes only new rows
+    assert read_file_bytes(first_artifact.train_file_path.replace(".parts", ".csv")) == first_part_bytes
+    assert len(read_csv_parts(second_artifact.train_file_path)) == 2
+    assert os.path.samefile(read_csv_parts(second_artifact.train_file_path)[0],
+                            first_artifact.train_file_path.replace(".parts", ".csv"))
+    second_part_rows = sum(len(pd.read_csv(read_csv_parts(file_path)[-1]))
+                           for file_path in (second_artifact.train_file_path, second_artifact.test_file_path))
+    assert second_part_rows == len(housing_frame) - 2000
+
+    # Old rows never change sides, every source row is ingested once
+    pd.testing.assert_frame_equal(second_train.iloc[:len(first_train)], first_train)
+    pd.testing.assert_frame_equal(second_test.iloc[:len(first_test)], first_test)
+    assert len(second_train) + len(second_test) == len(housing_frame)
+    assert not pd.concat([second_train, second_test]).duplicated().any()
+
+    # Rerun on same source adds nothing
+    third_config = make_ingestion_config("2022-01-03-00-00-00", incremental=True, chunk_size=700)
+    third_artifact = DataIngestion(third_config).initiate_data_ingestion(second_archive)
+    pd.testing.assert_frame_equal(load_data_frame(third_artifact.test_file_path), second_test)
+    assert len(load_data_frame(third_artifact.train_file_path)) == len(second_train)
+
+    # Every run is self-contained, earlier runs can be pruned
+    for config in (first_config, second_config):
+        shutil.rmtree(os.path.dirname(os.path.dirname(config.ingested_train_dir)))
+    pd.testing.assert_frame_equal(load_data_frame(third_artifact.test_file_path), second_test)
+    fourth_config = make_ingestion_config("2022-01-04-00-00-00", incremental=True, chunk_size=700)
+    fourth_artifact = DataIngestion(fourth_config).initiate_data_ingestion(second_archive)
+    pd.testing.assert_frame_equal(load_data_frame(fourth_artifact.train_file_path), second_train)
+
+
+def test_missing_part_file_fails_loudly(tmp_path, make_ingestion_config, housing_archive):
+    config = make_ingestion_config(incremental=True)
+    artifact = DataIngestion(config).initiate_data_ingestion(housing_archive)
+    os.remove(read_csv_parts(artifact.test_file_path)[0])
+    with pytest.raises(Exception, match="missing"):
+        load_data_frame(artifact.test_file_path)
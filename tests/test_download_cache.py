@@ -0,0 +1,34 @@
+# Importing required packages
+import io
+import os
+import pytest
+
+from housing.exception import HousingException
+from housing.util.download_cache import DownloadCache
+
+
+class FailingStream(io.BytesIO):
+    """
+    Stream failing after its first block, like a dropped connection
+    """
+
+    def read(self, size=-1):
+        if self.tell() > 0:
+            raise ConnectionResetError("connection dropped")
+        return super().read(size)
+
+
+def test_failed_download_leaves_no_temp_file(tmp_path):
+    download_cache = DownloadCache(cache_dir=str(tmp_path))
+    cache_files = set(os.listdir(tmp_path))
+    with pytest.raises(HousingException):
+        download_cache.store_stream(FailingStream(b"x" * (2 * 1024 * 1024)))
+    assert set(os.listdir(tmp_path)) == cache_files
+
+
+def test_stored_content_is_addressed_by_hash(tmp_path):
+    download_cache = DownloadCache(cache_dir=str(tmp_path))
+    entry = download_cache.store_stream(io.BytesIO(b"housing"))
+    assert entry["size"] == len(b"housing")
+    with open(download_cache.get_object_path(entry["sha256"]), "rb") as object_file:
+        assert object_file.read() == b"housing"
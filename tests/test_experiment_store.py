@@ -0,0 +1,93 @@
+# Importing required packages
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from housing.entity.experiment_store import ExperimentStore
+
+
+def make_experiment(position: int, **overrides) -> dict:
+    experiment = {
+        "experiment_id": f"experiment-{position}",
+        "initialization_timestamp": f"2022-01-0{position + 1}-00-00-00",
+        "artifact_timestamp": f"2022-01-0{position + 1}-00-00-00",
+        "running_status": True,
+        "start_time": datetime(2022, 1, position + 1),
+        "stop_time": None,
+        "execution_time": None,
+        "message": "pipeline has been started",
+        "experiment_file_path": "experiment.db",
+        "accuracy": None,
+        "is_model_accepted": None,
+        "created_time_stamp": datetime(2022, 1, position + 1)
+    }
+    experiment.update(overrides)
+    return experiment
+
+
+def test_upsert_updates_row_of_same_experiment(tmp_path):
+    experiment_store = ExperimentStore(os.path.join(tmp_path, "experiment", "experiment.db"))
+    experiment_store.save_experiment(make_experiment(0))
+    experiment_store.save_experiment({
+        "experiment_id": "experiment-0",
+        "running_status": False,
+        "stop_time": datetime(2022, 1, 1, 0, 5),
+        "execution_time": timedelta(minutes=5),
+        "message": "pipeline has been completed",
+        "accuracy": 0.8,
+        "is_model_accepted": True
+    })
+
+    assert experiment_store.get_experiment_count() == 1
+    experiment = experiment_store.get_experiment("experiment-0")
+    assert experiment["running_status"] == 0
+    assert experiment["is_model_accepted"] == 1
+    assert experiment["execution_time"] == 300
+    assert experiment["stop_time"] == "2022-01-01 00:05:00"
+    # Columns not given keep their value
+    assert experiment["start_time"] == "2022-01-01 00:00:00"
+    assert experiment["artifact_timestamp"] == "2022-01-01-00-00-00"
+    assert experiment_store.get_experiment("experiment-1") is None
+
+
+def test_pages_are_latest_first_and_filtered(tmp_path):
+    experiment_store = ExperimentStore(os.path.join(tmp_path, "experiment.db"))
+    for position in [2, 0, 4, 1, 3]:
+        experiment_store.save_experiment(make_experiment(position, running_status=False,
+                                                         is_model_accepted=position % 2 == 0))
+
+    page = experiment_store.get_experiments(offset=1, limit=2)
+    assert [experiment["experiment_id"] for experiment in page] == ["experiment-3", "experiment-2"]
+    accepted = experiment_store.get_experiments(is_model_accepted=True)
+    assert [experiment["experiment_id"] for experiment in accepted] == \
+        ["experiment-4", "experiment-2", "experiment-0"]
+    assert experiment_store.get_experiment_count(is_model_accepted=False) == 2
+
+
+def test_legacy_csv_is_imported_once(tmp_path):
+    # Former experiment.csv got one row at start and one at end of every run
+    legacy_csv_file_path = os.path.join(tmp_path, "experiment.csv")
+    pd.DataFrame([
+        make_experiment(0),
+        make_experiment(0, running_status=False, stop_time=datetime(2022, 1, 1, 0, 0, 4),
+                        execution_time=timedelta(seconds=4, microseconds=163183),
+                        message="pipeline has been completed", accuracy=0.75, is_model_accepted=False),
+        make_experiment(1)
+    ]).to_csv(legacy_csv_file_path, index=False)
+
+    db_file_path = os.path.join(tmp_path, "experiment.db")
+    experiment_store = ExperimentStore(db_file_path, legacy_csv_file_path=legacy_csv_file_path)
+    assert experiment_store.get_experiment_count() == 2
+    experiment = experiment_store.get_experiment("experiment-0")
+    assert experiment["running_status"] == 0
+    assert experiment["is_model_accepted"] == 0
+    assert abs(experiment["execution_time"] - 4.163183) < 1e-9
+    assert experiment["accuracy"] == 0.75
+    assert experiment_store.get_experiment("experiment-1")["running_status"] == 1
+    assert experiment_store.get_experiment("experiment-1")["accuracy"] is None
+
+    # Store with experiments does not import again
+    experiment_store.save_experiment({"experiment_id": "experiment-1", "running_status": False})
+    experiment_store = ExperimentStore(db_file_path, legacy_csv_file_path=legacy_csv_file_path)
+    assert experiment_store.get_experiment("experiment-1")["running_status"] == 0
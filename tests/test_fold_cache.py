@@ -0,0 +1,90 @@
+# Importing required packages
+import os
+import pickle
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import GridSearchCV
+
+from housing.util import save_numpy_array_data
+from housing.entity.fold_cache import CrossValidationFoldCache, CachedFoldEstimator, FOLD_CACHE_INDEX_FILE_NAME
+
+PARAM_GRID = {"alpha": [0.1, 1.0, 10.0]}
+
+
+def make_train_file(tmp_path, row_count: int = 90) -> str:
+    random_state = np.random.RandomState(0)
+    input_feature = random_state.normal(size=(row_count, 4))
+    target_feature = input_feature @ np.array([1.0, -2.0, 0.5, 3.0]) + random_state.normal(size=row_count)
+    train_file_path = os.path.join(tmp_path, "transformed", "train.npy")
+    save_numpy_array_data(train_file_path, np.column_stack([input_feature, target_feature]))
+    return train_file_path
+
+
+def test_fold_matrices_hold_rows_of_their_fold(tmp_path):
+    train_file_path = make_train_file(tmp_path)
+    train_array = np.load(train_file_path)
+    fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3,
+                                          cache_dir=os.path.join(tmp_path, "fold_cache")).build()
+
+    assert len(fold_cache.splits) == 3
+    for train_ids, valid_ids in fold_cache.splits:
+        for row_ids in (train_ids, valid_ids):
+            matrix = fold_cache.get_matrix(row_ids.reshape(-1, 1))
+            assert isinstance(matrix, np.memmap)
+            np.testing.assert_array_equal(matrix, train_array[row_ids, :-1])
+
+    # Rows which are not a cached fold are gathered from train data
+    row_ids = np.array([5, 1, 7])
+    np.testing.assert_array_equal(fold_cache.get_matrix(row_ids.reshape(-1, 1)), train_array[row_ids, :-1])
+
+
+def test_search_on_cached_folds_matches_plain_search(tmp_path):
+    train_file_path = make_train_file(tmp_path)
+    train_array = np.load(train_file_path)
+    fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3,
+                                          cache_dir=os.path.join(tmp_path, "fold_cache")).build()
+
+    plain_search = GridSearchCV(Ridge(), PARAM_GRID, cv=3).fit(train_array[:, :-1], train_array[:, -1])
+    cached_search = GridSearchCV(
+        CachedFoldEstimator(estimator=Ridge(), fold_cache=fold_cache),
+        {f"estimator__{name}": values for name, values in PARAM_GRID.items()},
+        cv=fold_cache.splits
+    ).fit(np.arange(len(train_array)).reshape(-1, 1), train_array[:, -1])
+
+    np.testing.assert_allclose(cached_search.cv_results_["mean_test_score"],
+                               plain_search.cv_results_["mean_test_score"])
+    assert cached_search.best_params_ == {"estimator__alpha": plain_search.best_params_["alpha"]}
+    np.testing.assert_allclose(cached_search.predict(np.arange(len(train_array)).reshape(-1, 1)),
+                               plain_search.predict(train_array[:, :-1]))
+
+
+def test_built_cache_is_reused_and_partial_cache_rebuilt(tmp_path):
+    train_file_path = make_train_file(tmp_path)
+    cache_dir = os.path.join(tmp_path, "fold_cache")
+    fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3, cache_dir=cache_dir).build()
+    fold_file_path = os.path.join(fold_cache.cache_dir, "fold_0_train.npy")
+    modified_time = os.stat(fold_file_path).st_mtime_ns
+
+    reused_fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3, cache_dir=cache_dir).build()
+    assert reused_fold_cache.matrix_file_names == fold_cache.matrix_file_names
+    assert os.stat(fold_file_path).st_mtime_ns == modified_time
+
+    # Without index (interrupted build) folds are written again
+    os.remove(os.path.join(fold_cache.cache_dir, FOLD_CACHE_INDEX_FILE_NAME))
+    os.remove(fold_file_path)
+    rebuilt_fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3, cache_dir=cache_dir).build()
+    assert rebuilt_fold_cache.matrix_file_names == fold_cache.matrix_file_names
+    assert os.path.exists(fold_file_path)
+
+
+def test_memory_maps_are_not_pickled(tmp_path):
+    train_file_path = make_train_file(tmp_path)
+    fold_cache = CrossValidationFoldCache(train_file_path=train_file_path, cv=3,
+                                          cache_dir=os.path.join(tmp_path, "fold_cache")).build()
+    train_ids = fold_cache.splits[0][0]
+    fold_cache.get_matrix(train_ids)
+
+    unpickled_fold_cache = pickle.loads(pickle.dumps(fold_cache))
+    assert unpickled_fold_cache._matrices == {}
+    np.testing.assert_array_equal(unpickled_fold_cache.get_matrix(train_ids), fold_cache.get_matrix(train_ids))
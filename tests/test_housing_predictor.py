@@ -0,0 +1,94 @@
+# Importing required packages
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from housing.constant import MODEL_PUSHER_CURRENT_VERSION_FILE_NAME
+from housing.exception import HousingException
+from housing.util import save_model_object, set_current_model_version
+from housing.entity.housing_predictor import HousingPredictor, ModelNotPublishedError
+
+MODEL_FILE_NAME = "model.pkl"
+REQUEST_FRAME = pd.DataFrame({"feature": [1.0, 2.0]})
+
+
+def publish_model(model_dir: str, model_version: str, prediction: float, save_model: bool = True) -> None:
+    """
+    Export model predicting a constant and point version pointer at it, like model pusher
+    """
+    pointer_file_path = os.path.join(model_dir, MODEL_PUSHER_CURRENT_VERSION_FILE_NAME)
+    previous_mtime_ns = os.stat(pointer_file_path).st_mtime_ns if os.path.exists(pointer_file_path) else None
+    if save_model:
+        model = DummyRegressor(strategy="constant", constant=prediction).fit(REQUEST_FRAME, [prediction] * 2)
+        save_model_object(os.path.join(model_dir, model_version, MODEL_FILE_NAME), model)
+    set_current_model_version(model_dir, model_version, MODEL_FILE_NAME)
+
+    # Coarse file system timestamps may not tell two quick publications apart
+    if os.stat(pointer_file_path).st_mtime_ns == previous_mtime_ns:
+        os.utime(pointer_file_path, ns=(previous_mtime_ns + 1, previous_mtime_ns + 1))
+
+
+def test_no_published_model(tmp_path):
+    housing_predictor = HousingPredictor(model_dir=str(tmp_path), reload_interval=60)
+    assert housing_predictor.reload() is False
+    with pytest.raises(ModelNotPublishedError):
+        housing_predictor.predict(REQUEST_FRAME)
+
+
+def test_reload_swaps_in_new_version_after_pointer_changes(tmp_path):
+    model_dir = str(tmp_path)
+    housing_predictor = HousingPredictor(model_dir=model_dir, reload_interval=60)
+    publish_model(model_dir, "20220101000000", 1.0)
+
+    assert housing_predictor.reload() is True
+    assert housing_predictor.reload() is False
+    np.testing.assert_array_equal(housing_predictor.predict(REQUEST_FRAME), [1.0, 1.0])
+
+    publish_model(model_dir, "20220102000000", 2.0)
+    assert housing_predictor.reload() is True
+    np.testing.assert_array_equal(housing_predictor.predict(REQUEST_FRAME), [2.0, 2.0])
+    assert housing_predictor.get_status()["model_version"] == "20220102000000"
+
+
+def test_in_flight_request_keeps_its_version(tmp_path):
+    model_dir = str(tmp_path)
+    housing_predictor = HousingPredictor(model_dir=model_dir, reload_interval=60)
+    publish_model(model_dir, "20220101000000", 1.0)
+    housing_predictor.reload()
+
+    with housing_predictor.acquire() as served_model:
+        publish_model(model_dir, "20220102000000", 2.0)
+        housing_predictor.reload()
+        np.testing.assert_array_equal(served_model.model.predict(REQUEST_FRAME), [1.0, 1.0])
+        np.testing.assert_array_equal(housing_predictor.predict(REQUEST_FRAME), [2.0, 2.0])
+        assert housing_predictor.get_status()["draining_versions"] == {"20220101000000": 1}
+
+    # Retired version is released once its last request completes
+    assert housing_predictor.get_status()["draining_versions"] == {}
+
+
+def test_watcher_picks_up_new_version_and_survives_failed_load(tmp_path):
+    model_dir = str(tmp_path)
+    publish_model(model_dir, "20220101000000", 1.0)
+    housing_predictor = HousingPredictor(model_dir=model_dir, reload_interval=0.05)
+    try:
+        assert housing_predictor.get_model_version() == "20220101000000"
+
+        # Pointer at a version whose model file is missing, current version keeps serving
+        publish_model(model_dir, "20220102000000", 2.0, save_model=False)
+        with pytest.raises(HousingException):
+            HousingPredictor(model_dir=model_dir).reload()
+        time.sleep(0.2)
+        np.testing.assert_array_equal(housing_predictor.predict(REQUEST_FRAME), [1.0, 1.0])
+
+        publish_model(model_dir, "20220103000000", 3.0)
+        deadline = time.monotonic() + 10
+        while housing_predictor.get_model_version() != "20220103000000" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        np.testing.assert_array_equal(housing_predictor.predict(REQUEST_FRAME), [3.0, 3.0])
+    finally:
+        housing_predictor.stop_event.set()
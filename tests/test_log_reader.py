@@ -0,0 +1,91 @@
+# Importing required packages
+import os
+from datetime import datetime
+
+import numpy as np
+
+from housing.logger.log_reader import LogReader, LOG_INDEX_ENTRY_DTYPE, LOG_INDEX_HEADER_DTYPE
+
+
+def format_record(position: int, level: str = "INFO") -> str:
+    return f"[2022-01-01 00:00:{position % 60:02d},{position % 1000:03d}]^;{level}^;{position}^;" \
+           f"pipeline.py^;run()^;record {position}\n"
+
+
+def write_records(log_file_path: str, positions, mode: str = "a", level: str = "INFO") -> None:
+    with open(log_file_path, mode) as log_file:
+        for position in positions:
+            log_file.write(format_record(position, level))
+
+
+def get_messages(records: list) -> list:
+    return [record["message"] for record in records]
+
+
+def test_index_is_extended_incrementally(tmp_path):
+    log_file_path = os.path.join(tmp_path, "app.log")
+    write_records(log_file_path, range(5), mode="w")
+    log_reader = LogReader(log_file_path)
+    assert log_reader.get_record_count() == 5
+
+    # Continuation line belongs to previous record, incomplete last line is not indexed yet
+    with open(log_file_path, "a") as log_file:
+        log_file.write(format_record(5) + "Traceback line\n" + format_record(6)[:20])
+    assert log_reader.get_record_count() == 6
+    assert log_reader.tail(1)[0]["message"] == "record 5\nTraceback line"
+
+    with open(log_file_path, "a") as log_file:
+        log_file.write(format_record(6)[20:])
+    write_records(log_file_path, range(7, 10))
+    assert log_reader.get_record_count() == 10
+    assert get_messages(log_reader.get_page(offset=6, limit=2)) == ["record 6", "record 7"]
+    assert os.path.getsize(log_reader.index_file_path) == \
+        LOG_INDEX_HEADER_DTYPE.itemsize + 10 * LOG_INDEX_ENTRY_DTYPE.itemsize
+
+    # Fresh reader picks up existing index
+    assert get_messages(LogReader(log_file_path).tail(3)) == ["record 7", "record 8", "record 9"]
+
+
+def test_index_is_rebuilt_after_rotation_and_truncation(tmp_path):
+    log_file_path = os.path.join(tmp_path, "app.log")
+    write_records(log_file_path, range(10), mode="w")
+    log_reader = LogReader(log_file_path)
+    assert log_reader.get_record_count() == 10
+
+    # Rotation replaces log file with a new (smaller) one
+    os.rename(log_file_path, f"{log_file_path}.1")
+    write_records(log_file_path, range(100, 103), mode="w")
+    assert get_messages(log_reader.tail(10)) == ["record 100", "record 101", "record 102"]
+
+    # Truncation in place keeps inode but shrinks file
+    write_records(log_file_path, range(200, 202), mode="w")
+    assert get_messages(log_reader.tail(10)) == ["record 200", "record 201"]
+
+
+def test_interrupted_update_leaves_no_duplicate_entries(tmp_path):
+    log_file_path = os.path.join(tmp_path, "app.log")
+    write_records(log_file_path, range(5), mode="w")
+    LogReader(log_file_path).update_index()
+
+    # Crash after appending entries but before writing header
+    write_records(log_file_path, range(5, 8))
+    crashed_entries = LogReader(log_file_path).index_log_file(0)[0][5:]
+    with open(f"{log_file_path}.idx", "ab") as index_file:
+        index_file.write(crashed_entries.tobytes())
+
+    write_records(log_file_path, range(8, 10))
+    entries = LogReader(log_file_path).update_index()
+    assert len(entries) == 10
+    assert np.all(np.diff(entries["offset"].astype(np.int64)) > 0)
+    assert get_messages(LogReader(log_file_path).get_page(0, 20)) == [f"record {position}" for position in range(10)]
+
+
+def test_search_by_level_and_time(tmp_path):
+    log_file_path = os.path.join(tmp_path, "app.log")
+    write_records(log_file_path, range(10), mode="w")
+    write_records(log_file_path, range(10, 12), level="ERROR")
+    log_reader = LogReader(log_file_path)
+
+    assert get_messages(log_reader.search(level="error")) == ["record 10", "record 11"]
+    records = log_reader.search(start_time=datetime(2022, 1, 1, 0, 0, 3), end_time=datetime(2022, 1, 1, 0, 0, 5))
+    assert get_messages(records) == ["record 3", "record 4"]
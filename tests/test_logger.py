@@ -0,0 +1,49 @@
+# Importing required packages
+import os
+import sys
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Parent and process pool workers log, exception tracebacks included
+LOGGING_SCRIPT = """
+import os
+import sys
+sys.path.insert(0, sys.argv[1])
+from concurrent.futures import ProcessPoolExecutor
+from housing.logger import logging
+
+
+def work(task_number):
+    for record_number in range(50):
+        logging.info("task %s record %s", task_number, record_number)
+    try:
+        raise ValueError(f"failure of task {task_number}")
+    except ValueError:
+        logging.exception("task %s failed", task_number)
+    return os.getpid()
+
+
+if __name__ == "__main__":
+    logging.info("parent started")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        worker_pids = set(executor.map(work, range(4)))
+    logging.info("parent completed")
+"""
+
+
+def test_forked_workers_log_into_parent_log_file(tmp_path):
+    script_file_path = os.path.join(tmp_path, "run.py")
+    with open(script_file_path, "w") as script_file:
+        script_file.write(LOGGING_SCRIPT)
+    subprocess.run([sys.executable, script_file_path, ROOT_DIR], cwd=tmp_path, check=True, timeout=120)
+
+    log_file_names = os.listdir(os.path.join(tmp_path, "app_logs"))
+    assert len(log_file_names) == 1
+    with open(os.path.join(tmp_path, "app_logs", log_file_names[0])) as log_file:
+        log_text = log_file.read()
+    for task_number in range(4):
+        assert sum(f"task {task_number} record " in line for line in log_text.splitlines()) == 50
+        assert f"ValueError: failure of task {task_number}" in log_text
+    assert log_text.index("parent started") < log_text.index("task 0 record 0")
+    assert "parent completed" in log_text
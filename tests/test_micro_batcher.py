@@ -0,0 +1,64 @@
+# Importing required packages
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from housing.entity.housing_predictor import HousingPredictor, ModelNotPublishedError
+from housing.entity.micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    def __init__(self) -> None:
+        self.batch_sizes = []
+
+    def predict(self, dataframe):
+        self.batch_sizes.append(len(dataframe))
+        return dataframe["value"].to_numpy() * 2
+
+
+class StaticPredictor:
+    def __init__(self, model) -> None:
+        self.model = model
+
+    @contextmanager
+    def acquire(self):
+        class ServedModel:
+            model_version = "v1"
+            model = self.model
+        yield ServedModel
+
+    def get_model_version(self):
+        return "v1"
+
+
+def test_batches_never_exceed_max_batch_size():
+    model = RecordingModel()
+    micro_batcher = MicroBatcher(StaticPredictor(model), ["value"], max_batch_size=10, max_batch_wait_ms=50)
+    request_sizes = [3, 4, 6, 2, 5, 7, 1, 9]
+    results = {}
+
+    def send(position, row_count):
+        rows = [(float(position),)] * row_count
+        results[position] = micro_batcher.predict(rows)[1]
+
+    threads = [threading.Thread(target=send, args=(position, row_count))
+               for position, row_count in enumerate(request_sizes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(model.batch_sizes) <= 10
+    assert sum(model.batch_sizes) == sum(request_sizes)
+    for position, row_count in enumerate(request_sizes):
+        np.testing.assert_array_equal(results[position], np.full(row_count, 2.0 * position))
+
+
+def test_predictor_without_published_model(tmp_path):
+    housing_predictor = HousingPredictor(model_dir=str(tmp_path), reload_interval=60)
+    assert housing_predictor.get_model_version() is None
+    with pytest.raises(ModelNotPublishedError):
+        with housing_predictor.acquire():
+            pass
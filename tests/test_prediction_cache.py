@@ -0,0 +1,112 @@
+# Importing required packages
+from contextlib import contextmanager
+from functools import partial
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from housing.entity import prediction_cache as prediction_cache_module
+from housing.entity.micro_batcher import MicroBatcher
+from housing.entity.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class VersionedPredictor:
+    """
+    Predictor serving "value" times version number, version can be swapped by tests
+    """
+
+    def __init__(self) -> None:
+        self.model_version = "1"
+        self.predicted_rows = 0
+
+    @contextmanager
+    def acquire(self):
+        yield SimpleNamespace(model_version=self.model_version,
+                              model=SimpleNamespace(predict=partial(self.predict, float(self.model_version))))
+
+    def predict(self, factor: float, dataframe):
+        self.predicted_rows += len(dataframe)
+        return dataframe["value"].to_numpy() * factor
+
+    def get_model_version(self):
+        return self.model_version
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(prediction_cache_module, "time", fake_clock)
+    return fake_clock
+
+
+def test_entries_expire_after_ttl(clock):
+    prediction_cache = PredictionCache(ttl_seconds=10)
+    prediction_cache.put_many([(1.0,), (2.0,)], [10.0, 20.0], "v1")
+
+    clock.now += 10
+    assert prediction_cache.get_many([(1.0,), (2.0,)], "v1") == [10.0, 20.0]
+
+    clock.now += 0.5
+    assert prediction_cache.get_many([(1.0,), (2.0,)], "v1") == [None, None]
+    assert prediction_cache.get_stats()["expirations"] == 2
+    assert prediction_cache.get_stats()["size"] == 0
+
+
+def test_model_version_change_invalidates_cache(clock):
+    prediction_cache = PredictionCache(ttl_seconds=300)
+    prediction_cache.put_many([(1.0,)], [10.0], "v1")
+    assert prediction_cache.get_many([(1.0,)], "v1") == [10.0]
+
+    assert prediction_cache.get_many([(1.0,)], "v2") == [None]
+    stats = prediction_cache.get_stats()
+    assert stats["invalidations"] == 1
+    assert stats["model_version"] == "v2"
+
+    # Late write of the old version drops entries of the new one, never serves stale ones
+    prediction_cache.put_many([(2.0,)], [40.0], "v2")
+    prediction_cache.put_many([(1.0,)], [10.0], "v1")
+    assert prediction_cache.get_many([(1.0,), (2.0,)], "v2") == [None, None]
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    prediction_cache = PredictionCache(max_size=2)
+    prediction_cache.put_many([(1.0,), (2.0,)], [10.0, 20.0], "v1")
+    prediction_cache.get_many([(1.0,)], "v1")
+    prediction_cache.put_many([(3.0,)], [30.0], "v1")
+
+    assert prediction_cache.get_many([(1.0,), (2.0,), (3.0,)], "v1") == [10.0, None, 30.0]
+    assert prediction_cache.get_stats()["evictions"] == 1
+
+
+def test_keys_round_floats_and_match_missing_values():
+    prediction_cache = PredictionCache(float_decimals=2)
+    assert prediction_cache.get_key((1.234, "INLAND")) == prediction_cache.get_key((1.2349, "INLAND"))
+    assert prediction_cache.get_key((float("nan"), "INLAND")) == prediction_cache.get_key((float("nan"), "INLAND"))
+    assert PredictionCache().get_key((1.234,)) != PredictionCache().get_key((1.2349,))
+
+
+def test_micro_batcher_never_serves_predictions_of_previous_version():
+    housing_predictor = VersionedPredictor()
+    micro_batcher = MicroBatcher(housing_predictor, ["value"], max_batch_wait_ms=1,
+                                 prediction_cache=PredictionCache(ttl_seconds=300))
+    rows = [(1.0,), (2.0,)]
+
+    assert micro_batcher.predict(rows)[0] == "1"
+    model_version, predictions = micro_batcher.predict(rows)
+    assert housing_predictor.predicted_rows == 2
+    np.testing.assert_array_equal(predictions, [1.0, 2.0])
+
+    housing_predictor.model_version = "3"
+    model_version, predictions = micro_batcher.predict(rows)
+    assert model_version == "3"
+    assert housing_predictor.predicted_rows == 4
+    np.testing.assert_array_equal(predictions, [3.0, 6.0])
@@ -0,0 +1,116 @@
+# Importing required packages
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+
+from housing.util import save_numpy_array_data
+from housing.entity.model_factory import InitializedModelDetail, CpuAllocation, run_memoized_search
+from housing.entity.search_cache import SearchResultCache, get_data_fingerprint, get_estimator_fingerprint
+
+GRID_SEARCH_CONFIG = {
+    "module": "sklearn.model_selection",
+    "class": "GridSearchCV",
+    "params": {"cv": 3}
+}
+CANDIDATES = [{"alpha": 0.1}, {"alpha": 1.0}, {"alpha": 10.0}]
+
+
+class CountingRidge(Ridge):
+    """
+    Ridge counting its fits, searches run in process (search n_jobs 1),
+    with "n_jobs" and "verbose" parameters like most scikit-learn ensembles
+    """
+    fit_count = 0
+
+    def __init__(self, alpha=1.0, fit_intercept=True, n_jobs=None, verbose=0):
+        super().__init__(alpha=alpha, fit_intercept=fit_intercept)
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+
+    def fit(self, X, y, sample_weight=None):
+        CountingRidge.fit_count += 1
+        return super().fit(X, y, sample_weight=sample_weight)
+
+
+def make_train_array(row_count: int = 60, seed: int = 0) -> np.ndarray:
+    random_state = np.random.RandomState(seed)
+    input_feature = random_state.normal(size=(row_count, 3))
+    target_feature = input_feature @ np.array([1.0, -2.0, 0.5]) + random_state.normal(scale=0.1, size=row_count)
+    return np.column_stack([input_feature, target_feature])
+
+
+@pytest.fixture
+def run_search(tmp_path):
+    """
+    Run memoized search below one search cache, return number of fits it made
+    """
+    search_cache = SearchResultCache(os.path.join(tmp_path, "search_cache"))
+
+    def run(train_array: np.ndarray = None, data_fingerprint: str = "data", model=None, cv: int = 3):
+        CountingRidge.fit_count = 0
+        grid_searched_best_model = run_memoized_search(
+            initialized_model=InitializedModelDetail(model_serial_number="module_0", model=model or CountingRidge(),
+                                                     param_grid_search={}, model_name="CountingRidge"),
+            grid_search_config={**GRID_SEARCH_CONFIG, "params": {"cv": cv}},
+            candidates=CANDIDATES,
+            train_array=make_train_array() if train_array is None else train_array,
+            cpu_allocation=CpuAllocation(search_n_jobs=1, estimator_n_jobs=1),
+            search_cache=search_cache,
+            data_fingerprint=data_fingerprint
+        )
+        return CountingRidge.fit_count, grid_searched_best_model
+
+    return run
+
+
+def test_cached_scores_are_reused_when_fingerprints_match(run_search):
+    first_fit_count, first_best_model = run_search()
+    second_fit_count, second_best_model = run_search()
+
+    # 3 candidates x 3 folds plus refit, then refit only (models are not stored)
+    assert first_fit_count == len(CANDIDATES) * 3 + 1
+    assert second_fit_count == 1
+    assert second_best_model.best_parameters == first_best_model.best_parameters
+    assert second_best_model.best_score == first_best_model.best_score
+
+
+@pytest.mark.parametrize("changed_search", [
+    {"data_fingerprint": "other data"},
+    {"model": CountingRidge(fit_intercept=False)},
+    {"cv": 4}
+], ids=["data", "estimator_params", "cv"])
+def test_any_changed_fingerprint_refits(run_search, changed_search):
+    run_search()
+    fit_count, _ = run_search(**changed_search)
+    assert fit_count == len(CANDIDATES) * changed_search.get("cv", 3) + 1
+
+
+def test_n_jobs_and_verbose_are_ignored(run_search):
+    run_search(model=CountingRidge(n_jobs=1, verbose=0))
+    fit_count, _ = run_search(model=CountingRidge(n_jobs=4, verbose=2))
+    assert fit_count == 1
+
+    # Also for parameters of nested estimators
+    assert get_estimator_fingerprint(Pipeline([("model", CountingRidge(n_jobs=1))])) == \
+        get_estimator_fingerprint(Pipeline([("model", CountingRidge(n_jobs=4, verbose=2))]))
+    assert get_estimator_fingerprint(Pipeline([("model", CountingRidge(n_jobs=1))])) != \
+        get_estimator_fingerprint(Pipeline([("model", CountingRidge(n_jobs=1, alpha=2.0))]))
+
+
+def test_data_fingerprint_follows_content(tmp_path):
+    train_array = make_train_array()
+    changed_array = train_array.copy()
+    changed_array[-1, -1] += 1.0
+
+    file_paths = {}
+    for name, array in {"train": train_array, "copy": train_array.copy(), "changed": changed_array,
+                        "float32": train_array.astype(np.float32)}.items():
+        file_paths[name] = os.path.join(tmp_path, f"{name}.npy")
+        save_numpy_array_data(file_paths[name], array)
+
+    assert get_data_fingerprint(file_paths["train"]) == get_data_fingerprint(file_paths["copy"])
+    assert get_data_fingerprint(file_paths["train"]) != get_data_fingerprint(file_paths["changed"])
+    assert get_data_fingerprint(file_paths["train"]) != get_data_fingerprint(file_paths["float32"])
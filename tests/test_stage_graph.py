@@ -0,0 +1,125 @@
+# Importing required packages
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from housing.util import write_csv_parts
+from housing.pipeline.stage_graph import StageGraph
+
+IngestionArtifact = namedtuple("IngestionArtifact", ["data_file_path", "row_count"])
+TrainerArtifact = namedtuple("TrainerArtifact", ["model_file_path", "score"])
+
+
+class Stages:
+    """
+    Two stage pipeline (ingestion -> trainer) recording which stages ran
+    """
+
+    def __init__(self, tmp_path) -> None:
+        self.tmp_path = str(tmp_path)
+        self.stage_cache_dir = os.path.join(self.tmp_path, "stage_cache")
+        self.schema_file_path = os.path.join(self.tmp_path, "schema.yaml")
+        with open(self.schema_file_path, "w") as schema_file:
+            schema_file.write("columns: [a, b]\n")
+        self.run_count = 0
+        self.started_stages = []
+
+    def start_ingestion(self) -> IngestionArtifact:
+        self.started_stages.append("ingestion")
+        data_file_path = os.path.join(self.tmp_path, f"data_{self.run_count}.csv")
+        with open(data_file_path, "w") as data_file:
+            data_file.write("a,b\n1,2\n")
+        return IngestionArtifact(data_file_path=data_file_path, row_count=np.int64(1))
+
+    def start_trainer(self, ingestion_artifact: IngestionArtifact) -> TrainerArtifact:
+        self.started_stages.append("trainer")
+        model_file_path = os.path.join(self.tmp_path, f"model_{self.run_count}.pkl")
+        with open(model_file_path, "wb") as model_file:
+            model_file.write(b"model")
+        return TrainerArtifact(model_file_path=model_file_path, score=np.float64(0.5))
+
+    def run(self, ingestion_config=("ratio", 0.2), trainer_config=("n_estimators", 10)) -> tuple:
+        self.run_count += 1
+        self.started_stages = []
+        stage_graph = StageGraph(self.stage_cache_dir)
+        ingestion_artifact = stage_graph.run_stage("ingestion", self.start_ingestion, IngestionArtifact,
+                                                   config=(ingestion_config,), file_paths=(self.schema_file_path,))
+        trainer_artifact = stage_graph.run_stage("trainer", self.start_trainer, TrainerArtifact,
+                                                 dependencies=("ingestion",), config=(trainer_config,))
+        return ingestion_artifact, trainer_artifact
+
+
+def test_unchanged_stages_are_reused(tmp_path):
+    stages = Stages(tmp_path)
+    first_artifacts = stages.run()
+    assert stages.started_stages == ["ingestion", "trainer"]
+
+    second_artifacts = stages.run()
+    assert stages.started_stages == []
+    # numpy scalars are recorded as plain values
+    assert second_artifacts == first_artifacts
+    assert type(second_artifacts[1].score) is float
+
+
+def test_config_change_reruns_stage_and_downstream_only(tmp_path):
+    stages = Stages(tmp_path)
+    stages.run()
+
+    stages.run(trainer_config=("n_estimators", 20))
+    assert stages.started_stages == ["trainer"]
+
+    stages.run(ingestion_config=("ratio", 0.3), trainer_config=("n_estimators", 20))
+    assert stages.started_stages == ["ingestion", "trainer"]
+
+
+def test_input_file_change_reruns_stage_and_downstream(tmp_path):
+    stages = Stages(tmp_path)
+    stages.run()
+
+    with open(stages.schema_file_path, "a") as schema_file:
+        schema_file.write("target: c\n")
+    stages.run()
+    assert stages.started_stages == ["ingestion", "trainer"]
+
+
+def test_missing_artifact_file_reruns_stage(tmp_path):
+    stages = Stages(tmp_path)
+    _, trainer_artifact = stages.run()
+
+    os.remove(trainer_artifact.model_file_path)
+    _, trainer_artifact = stages.run()
+    assert stages.started_stages == ["trainer"]
+    assert os.path.exists(trainer_artifact.model_file_path)
+
+
+def test_without_stage_cache_dir_every_stage_runs(tmp_path):
+    stages = Stages(tmp_path)
+    for _ in range(2):
+        stage_graph = StageGraph()
+        stages.started_stages = []
+        stage_graph.run_stage("ingestion", stages.start_ingestion, IngestionArtifact)
+        assert stages.started_stages == ["ingestion"]
+    assert not os.path.exists(stages.stage_cache_dir)
+
+
+def test_missing_csv_part_reruns_stage(tmp_path):
+    stages = Stages(tmp_path)
+    part_file_path = os.path.join(tmp_path, "part_0.csv")
+    with open(part_file_path, "w") as part_file:
+        part_file.write("a,b\n1,2\n")
+    parts_file_path = os.path.join(tmp_path, "data.parts")
+    write_csv_parts(parts_file_path, [part_file_path])
+
+    def start_ingestion():
+        stages.started_stages.append("ingestion")
+        return IngestionArtifact(data_file_path=parts_file_path, row_count=1)
+
+    for _ in range(2):
+        StageGraph(stages.stage_cache_dir).run_stage("ingestion", start_ingestion, IngestionArtifact)
+    assert stages.started_stages == ["ingestion"]
+
+    # Part list is still there, but a part it lists is gone
+    os.remove(part_file_path)
+    StageGraph(stages.stage_cache_dir).run_stage("ingestion", start_ingestion, IngestionArtifact)
+    assert stages.started_stages == ["ingestion", "ingestion"]
@@ -0,0 +1,81 @@
+# Importing required packages
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from housing.constant import ARTIFACT_FORMAT_CSV, ARTIFACT_FORMAT_PARQUET, ARTIFACT_FORMAT_FEATHER, \
+    ARTIFACT_FORMAT_NPY
+from housing.util import save_data_frame, load_data, get_artifact_file_name, save_numpy_array_data, \
+    load_ingested_data, iter_ingested_data
+from housing.entity.artifact_entity import DataIngestionArtifact
+from tests.conftest import make_housing_frame
+
+SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "schema.yaml")
+
+
+def get_numeric_base(array: np.ndarray) -> np.ndarray:
+    while array.base is not None and isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+@pytest.mark.parametrize("artifact_format", [ARTIFACT_FORMAT_FEATHER, ARTIFACT_FORMAT_NPY])
+def test_memory_mapped_numeric_columns_are_not_copied(tmp_path, artifact_format):
+    file_path = os.path.join(tmp_path, get_artifact_file_name("housing.csv", artifact_format))
+    save_data_frame(file_path, make_housing_frame(100), artifact_format)
+
+    dataframe = load_data(file_path, SCHEMA_FILE_PATH)
+    median_income = dataframe["median_income"].to_numpy()
+    assert median_income.dtype == np.float64
+    assert not median_income.flags.owndata
+    if artifact_format == ARTIFACT_FORMAT_NPY:
+        assert isinstance(get_numeric_base(median_income), np.memmap)
+    assert isinstance(dataframe["ocean_proximity"].dtype, pd.CategoricalDtype)
+
+
+def test_csv_is_parsed_into_schema_dtypes(tmp_path):
+    file_path = os.path.join(tmp_path, "housing.csv")
+    save_data_frame(file_path, make_housing_frame(100), ARTIFACT_FORMAT_CSV)
+
+    dataframe = load_data(file_path, SCHEMA_FILE_PATH)
+    assert dataframe["median_income"].dtype == np.float32
+    assert isinstance(dataframe["ocean_proximity"].dtype, pd.CategoricalDtype)
+
+
+def concat_chunks(chunks) -> pd.DataFrame:
+    chunks = list(chunks)
+    assert all(len(chunk) <= 128 for chunk in chunks)
+    return pd.concat(chunks, ignore_index=True)
+
+
+@pytest.mark.parametrize("artifact_format", [ARTIFACT_FORMAT_CSV, ARTIFACT_FORMAT_PARQUET, ARTIFACT_FORMAT_FEATHER,
+                                             ARTIFACT_FORMAT_NPY])
+def test_streamed_test_set_equals_loaded_test_set(tmp_path, artifact_format):
+    test_file_path = os.path.join(tmp_path, get_artifact_file_name("test.csv", artifact_format))
+    save_data_frame(test_file_path, make_housing_frame(1000), artifact_format)
+    artifact = DataIngestionArtifact(train_file_path=None, test_file_path=test_file_path, is_ingested=True,
+                                     message="", base_file_path=None, train_index_file_path=None,
+                                     test_index_file_path=None)
+    columns = ["median_income", "ocean_proximity", "median_house_value"]
+
+    loaded = load_ingested_data(artifact, SCHEMA_FILE_PATH, is_train=False, columns=columns)
+    streamed = concat_chunks(iter_ingested_data(artifact, SCHEMA_FILE_PATH, is_train=False, columns=columns,
+                                                chunk_size=128))
+    pd.testing.assert_frame_equal(streamed, loaded.reset_index(drop=True))
+
+
+def test_streamed_index_layout_keeps_only_indexed_rows(tmp_path):
+    base_file_path = os.path.join(tmp_path, get_artifact_file_name("housing.csv", ARTIFACT_FORMAT_FEATHER))
+    save_data_frame(base_file_path, make_housing_frame(1000), ARTIFACT_FORMAT_FEATHER)
+    test_index = np.random.default_rng(0).choice(1000, size=200, replace=False)
+    test_index_file_path = os.path.join(tmp_path, "test_index.npy")
+    save_numpy_array_data(test_index_file_path, test_index)
+    artifact = DataIngestionArtifact(train_file_path=None, test_file_path=None, is_ingested=True, message="",
+                                     base_file_path=base_file_path, train_index_file_path=None,
+                                     test_index_file_path=test_index_file_path)
+
+    loaded = load_ingested_data(artifact, SCHEMA_FILE_PATH, is_train=False)
+    streamed = concat_chunks(iter_ingested_data(artifact, SCHEMA_FILE_PATH, is_train=False, chunk_size=128))
+    # Streamed rows come in base table order
+    pd.testing.assert_frame_equal(streamed, loaded.iloc[np.argsort(test_index)].reset_index(drop=True))